@@ -0,0 +1,121 @@
+"""
+Report shapes and benchmark cases.
+
+A shape is a realistic kind of report: its headers, a generator of deterministic
+rows and the styling options it is written with. A case writes `rows` rows of a
+shape with one excelstyler API and saves the result to `path`.
+"""
+import datetime
+
+from openpyxl import Workbook
+
+from excelstyler import StreamingReport, shamsi_date
+from excelstyler.chart import add_chart
+from excelstyler.headers import create_header_freez
+from excelstyler.values import create_value, create_values
+from excelstyler.xmlwriter import XmlReport
+
+_WAREHOUSES = ['انبار مرکزی تهران', 'انبار شماره ۲ اصفهان', 'سردخانه مشهد', 'انبار تبریز', 'انبار شیراز']
+_PRODUCTS = ['مرغ گرم', 'مرغ منجمد', 'ران مرغ', 'سینه مرغ', 'بال مرغ', 'جوجه کباب']
+_FIRST_DAY = datetime.date(2023, 3, 21)
+
+
+def _narrow_rows(rows):
+    for i in range(rows):
+        yield [f'Item {i}', i, i * 1.25, f'Warehouse {i % 50}', i % 7]
+
+
+def _wide_rows(rows):
+    for i in range(rows):
+        row = []
+        for column in range(40):
+            kind = column % 4
+            if kind == 0:
+                row.append(f'Value {i}-{column}')
+            elif kind == 1:
+                row.append(i * column)
+            elif kind == 2:
+                row.append(i * 0.5 + column)
+            else:
+                row.append(0 if i % 3 == 0 else column)
+        yield row
+
+
+def _persian_rows(rows):
+    for i in range(rows):
+        day = _FIRST_DAY + datetime.timedelta(days=i % 730)
+        yield [_WAREHOUSES[i % len(_WAREHOUSES)], _PRODUCTS[i % len(_PRODUCTS)], shamsi_date(day), day,
+               1000 + i % 9000, (i % 500) * 12.5]
+
+
+_NARROW_HEADERS = ['Name', 'Quantity', 'Amount', 'Warehouse', 'Grade']
+
+SHAPES = {
+    'narrow': (_NARROW_HEADERS, _narrow_rows, {}),
+    'wide': ([f'Column {column}' for column in range(1, 41)], _wide_rows, {}),
+    'banded': (_NARROW_HEADERS, _narrow_rows, {'banding': True}),
+    'bordered': (_NARROW_HEADERS, _narrow_rows, {'border_style': 'thin'}),
+    'persian': (['انبار', 'محصول', 'تاریخ', 'تاریخ میلادی', 'وزن', 'مبلغ'], _persian_rows,
+                {'border_style': 'thin', 'banding': True}),
+}
+
+
+def _create_value(shape, rows, path):
+    headers, make_rows, options = SHAPES[shape]
+    workbook = Workbook()
+    worksheet = workbook.active
+    create_header_freez(worksheet, headers, 1, 1, 2, color='green', border_style=options.get('border_style'))
+    banding = options.get('banding', False)
+    for i, row in enumerate(make_rows(rows), 2):
+        create_value(worksheet, row, i, 1, border_style=options.get('border_style'), m=i if banding else None)
+    workbook.save(path)
+
+
+def _create_values(shape, rows, path):
+    headers, make_rows, options = SHAPES[shape]
+    workbook = Workbook()
+    worksheet = workbook.active
+    create_header_freez(worksheet, headers, 1, 1, 2, color='green', border_style=options.get('border_style'))
+    create_values(worksheet, make_rows(rows), 2, **options)
+    workbook.save(path)
+
+
+def _report(report_class):
+    def case(shape, rows, path):
+        headers, make_rows, options = SHAPES[shape]
+        report = report_class('Report', right_to_left=shape == 'persian')
+        report.create_header_freez(headers, color='green', border_style=options.get('border_style'))
+        report.create_values(make_rows(rows), **options)
+        report.save(path)
+    return case
+
+
+def _shamsi_date(shape, rows, path):
+    # Converts one date per row, as a report with a date column does.
+    for i in range(rows):
+        shamsi_date(_FIRST_DAY + datetime.timedelta(days=i % 3650))
+
+
+def _chart(downsample=None):
+    def case(shape, rows, path):
+        headers, make_rows, options = SHAPES[shape]
+        workbook = Workbook()
+        worksheet = workbook.active
+        create_header_freez(worksheet, headers, 1, 1, 2, color='green')
+        create_values(worksheet, make_rows(rows), 2, **options)
+        add_chart(worksheet, 'line', [2, 3], 1, 2, rows + 1, 'H2', 'Quantity', 'Item', 'Quantity',
+                  downsample=downsample)
+        workbook.save(path)
+    return case
+
+
+# name: (function, shapes it runs on, whether it writes a file)
+CASES = {
+    'create_value': (_create_value, list(SHAPES), True),
+    'create_values': (_create_values, list(SHAPES), True),
+    'streaming': (_report(StreamingReport), list(SHAPES), True),
+    'xml': (_report(XmlReport), list(SHAPES), True),
+    'shamsi_date': (_shamsi_date, ['persian'], False),
+    'chart': (_chart(), ['narrow'], True),
+    'chart_lttb': (_chart('lttb'), ['narrow'], True),
+}
@@ -0,0 +1,110 @@
+"""
+Import-time benchmark: cold-start cost of the common excelstyler imports.
+
+Each statement runs in a fresh interpreter with `python -X importtime`; the
+cumulative time of its top-level imports, less the interpreter's own start-up
+imports, is reported as the median over the runs, together with whether
+openpyxl and jdatetime were loaded.
+
+Usage:
+------
+python benchmarks/importtime.py                 # report
+python benchmarks/importtime.py --check         # exit code 1 if a light import loads openpyxl
+python benchmarks/importtime.py --save base.json / --compare base.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# statement: heavy modules it is allowed to load
+STATEMENTS = {
+    'import excelstyler': (),
+    'from excelstyler.to_locale_string import to_locale_str': (),
+    'from excelstyler import shamsi_date': ('jdatetime',),
+    'from excelstyler import StreamingReport': ('openpyxl', 'jdatetime'),
+    'from excelstyler import create_header, create_value': ('openpyxl', 'jdatetime'),
+}
+HEAVY_MODULES = ('openpyxl', 'jdatetime')
+
+
+def measure(statement, runs=5):
+    """
+    Return (median import time in ms, heavy modules loaded) for `statement`.
+
+    The time of the imports made by the interpreter itself at start-up is not included.
+    """
+    startup = _median_ms('pass', runs)[0]
+    milliseconds, loaded = _median_ms(statement, runs)
+    return max(milliseconds - startup, 0.0), loaded
+
+
+def _median_ms(statement, runs):
+    check = f'{statement}\nimport sys\nprint(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    times = []
+    loaded = ()
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', check],
+                                   check=True, capture_output=True, text=True)
+        times.append(_top_level_ms(completed.stderr))
+        loaded = tuple(module for module in completed.stdout.strip().split(',') if module)
+    return statistics.median(times), loaded
+
+
+def _top_level_ms(report):
+    """
+    Sum the cumulative times of the top-level imports of a `-X importtime` report.
+    """
+    total = 0
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level.
+        if cumulative.strip().isdigit() and not name.startswith('  ', 1):
+            total += int(cumulative)
+    return total / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the import time of excelstyler.')
+    parser.add_argument('--runs', type=int, default=5, help='interpreters started per statement')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if a statement loads a heavy module it does not need')
+    parser.add_argument('--save', metavar='FILE', help='write the results to FILE as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results with a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown reported as a regression')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    results = {}
+    failures = []
+    for statement, allowed in STATEMENTS.items():
+        milliseconds, loaded = measure(statement, args.runs)
+        results[statement] = {'ms': milliseconds, 'loaded': list(loaded)}
+        line = f'{statement:<56} {milliseconds:>8.1f} ms  loads: {", ".join(loaded) or "-"}'
+        unexpected = [module for module in loaded if module not in allowed]
+        if unexpected:
+            failures.append(f'{statement} loads {", ".join(unexpected)}')
+        if baseline is not None and baseline.get(statement, {}).get('ms'):
+            change = (milliseconds - baseline[statement]['ms']) / baseline[statement]['ms']
+            line += f'  {change:+.1%}'
+            if change > args.threshold:
+                line += '  REGRESSION'
+                failures.append(f'{statement} is {change:.0%} slower')
+        print(line, flush=True)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if failures and (args.check or baseline is not None):
+        print('\n' + '\n'.join(failures))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
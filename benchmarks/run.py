@@ -0,0 +1,191 @@
+"""
+Benchmark runner: rows/sec, peak memory and output file size per case, shape and row count.
+
+Every measurement runs in a fresh Python process, so peak memory is not inflated
+by earlier cases and import caches do not carry over.
+
+Usage:
+------
+python benchmarks/run.py                                  # all cases and shapes at 10k rows
+python benchmarks/run.py --rows 10000 100000 1000000 --cases streaming xml
+python benchmarks/run.py --save baseline.json             # record a baseline
+python benchmarks/run.py --compare baseline.json          # compare with it; exit code 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(case, shape, rows, memory='rss'):
+    """
+    Run one case in this process and return its numbers.
+
+    Returns:
+    --------
+    dict
+        'rows_per_sec', 'seconds', 'peak_mb' (peak RSS, or tracemalloc peak with
+        memory='tracemalloc') and 'file_bytes' (0 for cases that write no file).
+    """
+    sys.path.insert(0, _HERE)
+    from cases import CASES
+
+    function, _, writes_file = CASES[case]
+    if memory == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start()
+    handle, path = tempfile.mkstemp(suffix='.xlsx', prefix='excelstyler-bench-')
+    os.close(handle)
+    try:
+        start = time.perf_counter()
+        function(shape, rows, path)
+        seconds = time.perf_counter() - start
+        file_bytes = os.path.getsize(path) if writes_file else 0
+    finally:
+        os.remove(path)
+    if memory == 'tracemalloc':
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        peak *= 1 if sys.platform == 'darwin' else 1024
+    return {
+        'rows_per_sec': rows / seconds if seconds else 0.0,
+        'seconds': seconds,
+        'peak_mb': peak / (1 << 20),
+        'file_bytes': file_bytes,
+    }
+
+
+def run(cases, shapes, row_counts, repeat=1, memory='rss'):
+    """
+    Measure every applicable (case, shape, rows) combination in a subprocess.
+
+    With `repeat` > 1 the best throughput and the highest peak memory are kept.
+    """
+    sys.path.insert(0, _HERE)
+    from cases import CASES
+
+    results = {}
+    for rows in row_counts:
+        for case in cases:
+            for shape in shapes:
+                if shape not in CASES[case][1]:
+                    continue
+                key = f'{case}/{shape}/{rows}'
+                best = None
+                for _ in range(repeat):
+                    output = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), '--worker', case, shape, str(rows), memory],
+                        check=True, capture_output=True, text=True
+                    ).stdout
+                    result = json.loads(output.splitlines()[-1])
+                    if best is None:
+                        best = result
+                    else:
+                        best['peak_mb'] = max(best['peak_mb'], result['peak_mb'])
+                        if result['rows_per_sec'] > best['rows_per_sec']:
+                            best.update(rows_per_sec=result['rows_per_sec'], seconds=result['seconds'])
+                results[key] = best
+                print(_format_row(key, best), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compare `results` with a baseline and return the list of regressions.
+
+    A regression is a throughput more than `threshold` below the baseline, or a
+    peak memory or file size more than `threshold` above it.
+    """
+    regressions = []
+    print()
+    print(f'{"case/shape/rows":<34} {"rows/sec":>12} {"peak MB":>10} {"file size":>10}')
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f'{key:<34} {"(not in baseline)":>34}')
+            continue
+        speed = _change(result['rows_per_sec'], base['rows_per_sec'])
+        memory = _change(result['peak_mb'], base['peak_mb'])
+        size = _change(result['file_bytes'], base['file_bytes'])
+        flags = []
+        if speed < -threshold:
+            flags.append('slower')
+        if memory > threshold:
+            flags.append('more memory')
+        if size > threshold:
+            flags.append('larger file')
+        if flags:
+            regressions.append((key, flags))
+        print(f'{key:<34} {speed:>+12.1%} {memory:>+10.1%} {size:>+10.1%}'
+              + (f'  REGRESSION: {", ".join(flags)}' if flags else ''))
+    return regressions
+
+
+def _change(value, base):
+    return (value - base) / base if base else 0.0
+
+
+def _format_row(key, result):
+    return (f'{key:<34} {result["rows_per_sec"]:>12,.0f} rows/s {result["peak_mb"]:>8.1f} MB '
+            f'{result["file_bytes"] / 1024:>10,.0f} KB')
+
+
+def _environment():
+    import openpyxl
+    return {
+        'python': platform.python_version(),
+        'openpyxl': openpyxl.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def main(argv=None):
+    sys.path.insert(0, _HERE)
+    from cases import CASES, SHAPES
+
+    parser = argparse.ArgumentParser(description='Benchmark excelstyler report writing.')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--rows', nargs='+', type=int, default=[10000])
+    parser.add_argument('--repeat', type=int, default=1, help='runs per measurement; the best is kept')
+    parser.add_argument('--memory', choices=['rss', 'tracemalloc'], default='rss' if os.name == 'posix' else 'tracemalloc',
+                        help='peak RSS of the process (default) or the tracemalloc peak (slower, Python allocations only)')
+    parser.add_argument('--save', metavar='FILE', help='write the results to FILE as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results with a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change reported as a regression')
+    parser.add_argument('--worker', nargs=4, metavar=('CASE', 'SHAPE', 'ROWS', 'MEMORY'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        case, shape, rows, memory = args.worker
+        print(json.dumps(measure(case, shape, int(rows), memory)))
+        return 0
+
+    results = run(args.cases, args.shapes, args.rows, args.repeat, args.memory)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': _environment(), 'memory': args.memory, 'results': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('memory', 'rss') != args.memory:
+            print(f'warning: baseline memory was measured with {baseline.get("memory")}', file=sys.stderr)
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,39 @@
-from .styles import *
-from .utils import shamsi_date
-from .headers import create_header
-from .values import create_value
+import importlib
+
+# Public names and the submodule defining them. Submodules are imported on first
+# access (PEP 562), so `import excelstyler` does not load openpyxl or jdatetime.
+_LAZY_NAMES = {
+    "shamsi_date": "utils",
+    "shamsi_dates": "utils",
+    "create_header": "headers",
+    "create_value": "values",
+    "StreamingReport": "streaming",
+    "SheetLayout": "layout",
+    "from_dataframe": "dataframe",
+}
+# Names of `excelstyler.styles`, which used to be star-imported here.
+for _name in (
+    "PatternFill", "Alignment", "Font", "blue_fill", "Alignment_CELL", "red_font", "GREEN_CELL", "RED_CELL",
+    "YELLOW_CELL", "ORANGE_CELL", "BLUE_CELL", "LIGHT_GREEN_CELL", "VERY_LIGHT_GREEN_CELL", "GRAY_CELL",
+    "CREAM_CELL", "LIGHT_CREAM_CELL", "VERY_LIGHT_CREAM_CELL", "color_dict",
+):
+    _LAZY_NAMES[_name] = "styles"
+del _name
+
+_SUBMODULES = {
+    "aio", "append", "buffered", "chart", "conditional", "dataframe", "export", "headers", "helpers", "instrument",
+    "layout", "parallel", "registry", "schema", "streaming", "styles", "tables", "template", "to_locale_string",
+    "utils", "values", "xmlwriter",
+}
 
 __all__ = [
     "shamsi_date",
+    "shamsi_dates",
     "create_header",
     "create_value",
+    "StreamingReport",
+    "SheetLayout",
+    "from_dataframe",
     "GREEN_CELL",
     "RED_CELL",
     "YELLOW_CELL",
@@ -15,3 +42,20 @@ __all__ = [
     "LIGHT_GREEN_CELL",
     "VERY_LIGHT_GREEN_CELL"
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_NAMES.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache it, so later lookups do not go through __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES) | _SUBMODULES)
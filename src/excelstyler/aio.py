@@ -0,0 +1,312 @@
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .conditional import add_value_rules
+from .export import _row_values
+from .streaming import EXCEL_MAX_ROWS, _Pipe, _save
+from .xmlwriter import _report_class
+
+# Threads of the executor shared by the reports that are not given one.
+_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_shared_executor = None
+
+
+class AsyncReport:
+    """
+    Build a styled report from async code, writing rows as they arrive.
+
+    Every call is forwarded to a `StreamingReport` (or `XmlReport`) running in an
+    executor, so the styling and the compression never block the event loop. Rows
+    can come from an `async for` source, such as an asyncpg cursor: they are
+    collected in batches, and each batch is written while the next one is being
+    fetched, so the database and the xlsx writer work at the same time.
+
+    Parameters:
+    -----------
+    title : str, optional
+        Title of the worksheet.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    executor : concurrent.futures.Executor, optional
+        Where the report is built. Defaults to a thread pool of at most 4 threads
+        shared by all reports, which bounds the CPU used by concurrent exports.
+        `iter_bytes` writes the file on a thread of its own instead, since it waits
+        for the consumer.
+    batch_size : int, optional
+        Number of rows handed to the executor at a time (default: 1000). At most two
+        batches are held in memory.
+    backend : str, optional
+        'openpyxl' to write through `StreamingReport` (default) or 'xml' for `XmlReport`.
+    max_rows, index_title : optional
+        Rows per sheet and title of the index sheet; see `StreamingReport`.
+
+    Notes:
+    ------
+    - Await every call before making the next one; a report is built by one task.
+    - The report is written in the executor's threads, so the rows must not be tied
+      to the event loop thread once fetched.
+    - Like `StreamingReport`, the report can be saved once.
+
+    Example:
+    --------
+    report = AsyncReport('Sales', right_to_left=True)
+    await report.create_header_freez(['Name', 'Amount'], color='green')
+    async with connection.transaction():
+        await report.create_values(connection.cursor('SELECT name, amount FROM sales'), banding=True)
+    await report.save('sales.xlsx')
+    """
+
+    def __init__(self, title=None, right_to_left=False, executor=None, batch_size=1000, backend='openpyxl',
+                 max_rows=EXCEL_MAX_ROWS, index_title='Index'):
+        if batch_size is None or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.report = _report_class(backend)(title, right_to_left=right_to_left, max_rows=max_rows,
+                                             index_title=index_title)
+        self.executor = executor
+        self.batch_size = batch_size
+
+    @property
+    def row(self):
+        """
+        Index of the last row written.
+        """
+        return self.report.row
+
+    async def create_header(self, data, **kwargs):
+        """
+        Append a styled header row; see `StreamingReport.create_header`.
+        """
+        await self._run(self.report.create_header, data, **kwargs)
+
+    async def create_header_freez(self, data, **kwargs):
+        """
+        Append a frozen, filtered header row; see `StreamingReport.create_header_freez`.
+        """
+        await self._run(self.report.create_header_freez, data, **kwargs)
+
+    async def create_value(self, data, **kwargs):
+        """
+        Append a row of values; see `StreamingReport.create_value`.
+        """
+        await self._run(self.report.create_value, data, **kwargs)
+
+    async def excel_description(self, description, **kwargs):
+        """
+        Append a description row; see `StreamingReport.excel_description`.
+        """
+        await self._run(self.report.excel_description, description, **kwargs)
+
+    async def create_values(self, rows, start_col=1, border_style=None, banding=False, height=None, color=None,
+                            width=None, different_cell=None, different_value=None, item_num=None, item_color=None,
+                            m_color=None, conditional=False):
+        """
+        Append the rows of an async iterable (or a plain iterable) batch by batch.
+
+        The styling options are those of `StreamingReport.create_values`. With
+        `conditional=True` the banding and highlighting rules are added once per sheet,
+        for all the batches.
+        """
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        # Each sheet gets the conditional rules of its rows, also when a batch continues on a new sheet.
+        write = partial(self.report._write_values, start_col=start_col, border_style=border_style, banding=banding,
+                        height=height, color=color, width=width, different_cell=different_cell,
+                        different_value=different_value, item_num=item_num, item_color=item_color,
+                        m_color=m_color, conditional=conditional)
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        block = None
+        pending = None
+        try:
+            async for batch in _batches(rows, self.batch_size):
+                if pending is not None:
+                    block = await pending
+                pending = loop.run_in_executor(executor, partial(write, batch, block=block))
+        finally:
+            if pending is not None:
+                block = await pending
+        if conditional and block is not None and block[0] <= self.report.row:
+            await self._run(add_value_rules, self.report.worksheet, block[0], self.report.row, start_col,
+                            start_col + block[1] - 1, banding, different_cell, different_value, item_num,
+                            item_color, color, m_color)
+
+    async def save(self, filename):
+        """
+        Save the workbook to `filename` (a path or a writable file object) in the executor.
+        """
+        await self._run(self.report.save, filename)
+
+    async def iter_bytes(self, chunk_size=65536):
+        """
+        Save the workbook on a background thread and yield the xlsx file as chunks of bytes.
+
+        At most a few chunks are buffered: the writer waits while the consumer is
+        slow, and stops if the consumer goes away. The writer does not use the
+        executor, so slow downloads do not hold up the other reports. Suitable as
+        the body of a FastAPI/Starlette `StreamingResponse`.
+
+        Example:
+        --------
+        async for chunk in report.iter_bytes():
+            await response.write(chunk)
+        """
+        await self._run(self.report._finish)
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        pipe = _AsyncPipe(chunk_size, loop, ready)
+        saving = loop.create_future()
+        thread = threading.Thread(target=_save_and_notify, args=(self.report, pipe, saving),
+                                  name='excelstyler-save', daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    chunk = pipe.queue.get_nowait()
+                except queue.Empty:
+                    ready.clear()
+                    await ready.wait()
+                    continue
+                if chunk is None:
+                    break
+                yield chunk
+            if pipe.error is not None:
+                raise pipe.error
+        finally:
+            # Stops the writer if the consumer went away before the end of the file.
+            pipe.cancelled = True
+            await saving
+
+    def _executor(self):
+        global _shared_executor
+        if self.executor is not None:
+            return self.executor
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(_MAX_WORKERS, thread_name_prefix='excelstyler')
+        return _shared_executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), partial(func, *args, **kwargs))
+
+
+async def astream_xlsx(rows, headers=None, fields=None, title=None, right_to_left=False, header_color=None,
+                       border_style=None, banding=False, width=None, buffer_size=65536, conditional=False,
+                       executor=None, batch_size=1000, backend='openpyxl'):
+    """
+    Export an async iterable of rows as xlsx bytes, chunk by chunk.
+
+    The async counterpart of `stream_xlsx`: rows are fetched on the event loop,
+    written by an `AsyncReport` in the executor while the next batch is fetched, and
+    the finished file is yielded without blocking the loop.
+
+    Parameters:
+    -----------
+    rows : async iterable or iterable
+        The rows, e.g. an asyncpg cursor or an async generator.
+    fields : list of str, optional
+        Names of the values to take from each row, as keys (dicts, database records)
+        or attribute names. Without `fields` each row is used as a sequence of values.
+    executor, batch_size, backend :
+        See `AsyncReport`.
+    headers, title, right_to_left, header_color, border_style, banding, width, buffer_size, conditional :
+        See `stream_xlsx`.
+
+    Yields:
+    -------
+    bytes
+        Consecutive pieces of the xlsx file.
+
+    Example:
+    --------
+    from fastapi.responses import StreamingResponse
+    from excelstyler.aio import astream_xlsx
+    from excelstyler.export import XLSX_CONTENT_TYPE
+
+    @app.get('/employees.xlsx')
+    async def export_employees():
+        async def rows():
+            async with pool.acquire() as connection, connection.transaction():
+                async for record in connection.cursor('SELECT first_name, last_name FROM employees'):
+                    yield record
+
+        return StreamingResponse(
+            astream_xlsx(rows(), ['نام', 'نام خانوادگی'], fields=['first_name', 'last_name'],
+                         right_to_left=True, border_style='thin'),
+            media_type=XLSX_CONTENT_TYPE,
+            headers={'Content-Disposition': 'attachment; filename="employees.xlsx"'}
+        )
+    """
+    report = AsyncReport(title, right_to_left=right_to_left, executor=executor, batch_size=batch_size,
+                         backend=backend)
+    if fields is not None:
+        rows = _select(rows, fields)
+    if headers:
+        await report.create_header_freez(list(headers), width=width, color=header_color, border_style=border_style)
+    await report.create_values(rows, border_style=border_style, banding=banding, conditional=conditional)
+    async for chunk in report.iter_bytes(buffer_size):
+        yield chunk
+
+
+def _save_and_notify(report, pipe, saving):
+    """
+    Save `report` into `pipe` like `_save`, then resolve the future `saving` on its event loop.
+    """
+    try:
+        _save(report, pipe)
+    finally:
+        saving.get_loop().call_soon_threadsafe(_resolve, saving)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _AsyncPipe(_Pipe):
+    """
+    `_Pipe` that wakes an asyncio reader whenever something is queued.
+    """
+
+    def __init__(self, chunk_size, loop, ready):
+        super().__init__(chunk_size)
+        self.loop = loop
+        self.ready = ready
+
+    def _put(self, item):
+        super()._put(item)
+        self.loop.call_soon_threadsafe(self.ready.set)
+
+
+async def _aiter(rows):
+    """
+    Iterate an async iterable or a plain iterable asynchronously.
+    """
+    if hasattr(rows, '__aiter__'):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def _batches(rows, size):
+    """
+    Yield the rows in lists of `size` rows.
+    """
+    batch = []
+    async for row in _aiter(rows):
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _select(rows, fields):
+    async for item in _aiter(rows):
+        yield _row_values(item, fields)
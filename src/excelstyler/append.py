@@ -0,0 +1,291 @@
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+
+from openpyxl.packaging.manifest import Manifest
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.reader.excel import _find_workbook_part
+from openpyxl.reader.workbook import WorkbookParser
+from openpyxl.styles.stylesheet import apply_stylesheet, write_stylesheet
+from openpyxl.utils import get_column_letter, range_boundaries
+from openpyxl.xml.constants import ARC_CONTENT_TYPES, ARC_STYLE
+from openpyxl.xml.functions import fromstring, tostring
+
+from .instrument import timed
+from .tables import DEFAULT_TABLE_STYLE
+from .xmlwriter import XmlReport
+
+# Style tables of the workbook; styles.xml is only rewritten when one of them grew.
+_STYLE_TABLES = ('_cell_styles', '_fonts', '_fills', '_borders', '_number_formats', '_alignments', '_protections')
+_ROW_TAG = re.compile(rb'<row\b[^>]*?\sr="(\d+)"')
+_DIMENSION = re.compile(rb'(<dimension\b[^>]*?\sref=")([^"]*)"')
+# Ranges after the rows of a sheet that grow with the data: the auto-filter, conditional formats and validations.
+_SHEET_RANGES = re.compile(rb'(<(?:autoFilter|conditionalFormatting|dataValidation)\b[^>]*?\b(?:sq)?ref=")([^"]*)"')
+_TABLE_RANGES = re.compile(rb'(\bref=")([^"]*)"')
+_DEFINED_NAME = re.compile(rb'(<definedName\b([^>]*)>)([^<]*)</definedName>')
+_CHUNK_SIZE = 1 << 20
+
+
+class AppendReport(XmlReport):
+    """
+    Append styled rows to a worksheet of an existing xlsx file without loading it.
+
+    Loading a workbook in openpyxl to add a few rows costs time and memory in
+    proportion to the whole file. This report only reads the style table and the
+    position of the last row; the new rows are written as SpreadsheetML like
+    `XmlReport` does, with the same styling options. Saving copies the zip entries
+    of the file one by one, streaming the appended sheet and splicing the new rows
+    in before its end, so the existing rows are never parsed.
+
+    Parameters:
+    -----------
+    filename : str or path-like
+        The xlsx file to append to.
+    title : str, optional
+        Title of the worksheet to append to (default: the first worksheet).
+
+    Notes:
+    ------
+    - The sheet dimension and the auto-filter, conditional formats, data validations
+      and tables whose range ends at the last row of the sheet are extended to the
+      appended rows, so a banded or filtered report stays banded and filtered.
+    - New styles are added to the style table of the file; the styles of the
+      existing cells keep their indices. Strings are written inline.
+    - Only data rows can be appended: freeze panes, column widths, descriptions,
+      tables and conditional rules are taken from the existing sheet.
+    - `save()` without a filename replaces the file once the new one is complete.
+
+    Example:
+    --------
+    report = AppendReport('month_to_date.xlsx', 'Ledger')
+    report.create_values(rows_of_the_day, border_style='thin', banding=True)
+    report.save()
+    """
+
+    def __init__(self, filename, title=None):
+        self.filename = os.fspath(filename)
+        with zipfile.ZipFile(self.filename) as archive:
+            manifest = Manifest.from_tree(fromstring(archive.read(ARC_CONTENT_TYPES)))
+            self._workbook_path = _find_workbook_part(manifest).PartName[1:]
+            parser = WorkbookParser(archive, self._workbook_path)
+            parser.parse()
+            sheets = [(sheet.name, rel.Target) for sheet, rel in parser.find_sheets()
+                      if rel.Type.endswith('/worksheet')]
+            if title is None and sheets:
+                title = sheets[0][0]
+            paths = dict(sheets)
+            if title not in paths:
+                raise ValueError(f"Worksheet {title!r} does not exist")
+            self._sheet_path = paths[title]
+            self._sheet_index = [sheet.name for sheet in parser.sheets].index(title)
+            self._table_paths = set()
+            rels_path = get_rels_path(self._sheet_path)
+            if rels_path in archive.namelist():
+                self._table_paths = {rel.Target for rel in get_dependents(archive, rels_path)
+                                     if rel.Type.endswith('/table')}
+            with archive.open(self._sheet_path) as source:
+                last_row = _last_row(source)
+            super().__init__(title)
+            apply_stylesheet(archive, self.workbook)
+        self.workbook.epoch = parser.wb.epoch
+        self._style_sizes = [len(getattr(self.workbook, name)) for name in _STYLE_TABLES]
+        self._last_row = last_row
+        self.row = self._written = last_row
+        self._pending = None
+
+    @timed
+    def create_values(self, rows, start_col=1, border_style=None, banding=False, height=None, color=None, width=None,
+                      different_cell=None, different_value=None, item_num=None, item_color=None, m_color=None,
+                      conditional=False):
+        """
+        Append a block of rows; see `create_values` for the styling options.
+
+        Banding follows the sheet row index, so it continues the banding of the file.
+        """
+        if conditional:
+            raise ValueError("Conditional rules cannot be added when appending; the rules of the sheet that end "
+                             "at its last row are extended to the new rows")
+        super().create_values(rows, start_col, border_style, banding, height, color, width, different_cell,
+                              different_value, item_num, item_color, m_color)
+
+    def create_table(self, headers, rows, start_col=1, name=None, style=DEFAULT_TABLE_STYLE, banded_rows=True,
+                     banded_columns=False, number_format='#,###'):
+        """
+        Not supported: a table cannot be added to a sheet that is appended to.
+        """
+        raise ValueError("Tables cannot be added when appending; the tables of the sheet that end at its last row "
+                         "are extended to the new rows")
+
+    def excel_description(self, description, start_col=1, end_col=None, size=None, color=None, my_color=None,
+                          height=None):
+        """
+        Not supported: only data rows can be appended.
+        """
+        raise ValueError("Descriptions cannot be added when appending; only rows can be appended")
+
+    @timed
+    def save(self, filename=None):
+        """
+        Save the file with the appended rows to `filename` (default: the original file).
+
+        Parameters:
+        -----------
+        filename : str, path-like or file object, optional
+            Where to write the file. The original file is only replaced once the new
+            one has been written completely.
+        """
+        self._finish()
+        if filename is not None and not (isinstance(filename, (str, os.PathLike))
+                                         and os.path.abspath(filename) == os.path.abspath(self.filename)):
+            self._save_to(filename)
+            return
+        handle, path = tempfile.mkstemp(suffix='.xlsx', prefix='excelstyler-',
+                                        dir=os.path.dirname(os.path.abspath(self.filename)))
+        os.close(handle)
+        try:
+            self._save_to(path)
+            os.replace(path, self.filename)
+        except BaseException:
+            os.remove(path)
+            raise
+
+    def _save_to(self, file):
+        """
+        Copy the zip entries of the original file to `file`, with the appended sheet, its tables and the styles updated.
+        """
+        try:
+            styles = None
+            if [len(getattr(self.workbook, name)) for name in _STYLE_TABLES] != self._style_sizes:
+                styles = tostring(write_stylesheet(self.workbook))
+            with zipfile.ZipFile(self.filename) as source, \
+                    zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as package:
+                for info in source.infolist():
+                    entry = zipfile.ZipInfo(info.filename, info.date_time)
+                    entry.compress_type = info.compress_type
+                    entry.external_attr = info.external_attr
+                    if info.filename == self._sheet_path:
+                        size = info.file_size + os.fstat(self._rows_file.fileno()).st_size + _CHUNK_SIZE
+                        with source.open(info) as data, \
+                                package.open(entry, 'w', force_zip64=size > zipfile.ZIP64_LIMIT) as out:
+                            self._write_sheet(data, out)
+                    elif info.filename == self._workbook_path:
+                        package.writestr(entry, _DEFINED_NAME.sub(self._filter_name, source.read(info)))
+                    elif info.filename in self._table_paths:
+                        package.writestr(entry, _TABLE_RANGES.sub(self._extend, source.read(info)))
+                    elif info.filename == ARC_STYLE and styles is not None:
+                        package.writestr(entry, styles)
+                    else:
+                        with source.open(info) as data, \
+                                package.open(entry, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as out:
+                            shutil.copyfileobj(data, out, _CHUNK_SIZE)
+        finally:
+            self._rows_file.close()
+
+    def _write_sheet(self, source, out):
+        """
+        Copy the sheet XML from `source` to `out`, adding the new rows at the end of its sheet data.
+        """
+        head = b''
+        while b'<sheetData' not in head:
+            chunk = source.read(_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"{self._sheet_path} has no sheet data")
+            head += chunk
+        start = head.index(b'<sheetData')
+        end = head.find(b'>', start)
+        while end == -1:
+            chunk = source.read(_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"{self._sheet_path} has no sheet data")
+            head += chunk
+            end = head.find(b'>', start)
+        out.write(_DIMENSION.sub(self._dimension, head[:start], count=1))
+        out.write(b'<sheetData>')
+        rest = head[end + 1:]
+        if head[end - 1:end] != b'/':
+            # Copy the existing rows up to the end of the sheet data.
+            marker = b'</sheetData>'
+            while marker not in rest:
+                chunk = source.read(_CHUNK_SIZE)
+                if not chunk:
+                    raise ValueError(f"{self._sheet_path} has no end of sheet data")
+                keep = len(marker) - 1
+                out.write(rest[:-keep])
+                rest = rest[-keep:] + chunk
+            index = rest.index(marker)
+            out.write(rest[:index])
+            rest = rest[index + len(marker):]
+        self._rows_file.seek(0)
+        shutil.copyfileobj(self._rows_file.buffer, out, _CHUNK_SIZE)
+        out.write(b'</sheetData>')
+        tail = rest + source.read()
+        out.write(_SHEET_RANGES.sub(self._extend, tail))
+
+    def _dimension(self, match):
+        """
+        Return the `dimension` attribute of the sheet grown to the appended rows and columns.
+        """
+        min_col, min_row, max_col, _ = range_boundaries(match.group(2).decode())
+        max_col = max(max_col or 1, self.layout.max_column)
+        ref = f'{get_column_letter(min_col or 1)}{min_row or 1}:{get_column_letter(max_col)}{max(self.row, 1)}'
+        return match.group(1) + ref.encode() + b'"'
+
+    def _extend(self, match):
+        """
+        Return a range attribute with the ranges that end at the last row of the file moved to the new last row.
+        """
+        ranges = ' '.join(self._extended(ref) for ref in match.group(2).decode().split())
+        return match.group(1) + ranges.encode() + b'"'
+
+    def _filter_name(self, match):
+        """
+        Return a defined name of the workbook, extending the hidden auto-filter range of the appended sheet.
+        """
+        attributes = match.group(2)
+        if (b'"_xlnm._FilterDatabase"' not in attributes
+                or f'localSheetId="{self._sheet_index}"'.encode() not in attributes):
+            return match.group(0)
+        sheet, _, ref = match.group(3).decode().rpartition('!')
+        ref = self._extended(ref.replace('$', ''), absolute=True)
+        return match.group(1) + f'{sheet}!{ref}'.encode() + b'</definedName>'
+
+    def _extended(self, ref, absolute=False):
+        """
+        Return the cell range `ref` ending at the new last row if it ends at the last row of the file.
+        """
+        if ':' not in ref:
+            return ref
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        if max_row != self._last_row or min_row is None or min_row >= max_row:
+            return ref
+        first, last = get_column_letter(min_col), get_column_letter(max_col)
+        if absolute:
+            return f'${first}${min_row}:${last}${self.row}'
+        return f'{first}{min_row}:{last}{self.row}'
+
+    def _rollover(self):
+        raise ValueError("The worksheet is full; rows cannot be appended past its last row")
+
+    def _close_sheet(self):
+        if not self._rendered:
+            self._rendered = True
+            self._rows_file.flush()
+
+
+def _last_row(source):
+    """
+    Return the number of the last row of the sheet XML read from `source`, 0 for an empty sheet.
+    """
+    last = 0
+    carry = b''
+    while True:
+        chunk = source.read(_CHUNK_SIZE)
+        if not chunk:
+            return last
+        data = carry + chunk
+        for match in _ROW_TAG.finditer(data):
+            last = max(last, int(match.group(1)))
+        # A tag can be cut by the end of the chunk; keep it for the next one.
+        carry = data[data.rfind(b'<'):]
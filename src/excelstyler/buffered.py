@@ -0,0 +1,302 @@
+import contextlib
+import pickle
+import tempfile
+from collections import deque
+
+from openpyxl.utils import get_column_letter
+
+from .instrument import timed
+from .streaming import EXCEL_MAX_ROWS
+from .xmlwriter import XmlReport
+
+# Default memory budget of the rows held by a `BufferedReport`, in bytes.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Estimated bytes held per buffered row and per cell, on top of the characters of strings.
+_ROW_SIZE = 200
+_CELL_SIZE = 56
+
+
+class BufferedReport(XmlReport):
+    """
+    `XmlReport` that keeps the rows of the sheet until saving, within a memory budget.
+
+    Write-only reports cannot go back to a row once it is written, and a normal
+    workbook holds a `Cell` object for every value. This report holds the rows of the
+    current sheet in a compact buffer of values and resolved styles instead; when
+    the buffer grows past `memory_budget`, its oldest rows are packed (values and
+    style indices) into a temporary file. Saving replays the rows in order, so any
+    row written so far can still be written over: a title or header filled in after
+    the data, or totals in rows reserved at the top.
+
+    Parameters:
+    -----------
+    title : str, optional
+        Title of the worksheet.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    memory_budget : int, optional
+        Estimated bytes of rows kept in memory before the oldest half is moved to
+        disk (default: `DEFAULT_MEMORY_BUDGET`, 64 MiB).
+    max_rows : int, optional
+        Rows per sheet before continuing on a new sheet; see `StreamingReport`.
+    index_title : str or None, optional
+        Title of the index sheet added when the report spans several sheets.
+
+    Notes:
+    ------
+    - `create_header`, `create_value` and `excel_description` take `row=` to write
+      over a row of the current sheet instead of appending one; cells outside the
+      written ones keep their values. `reserve_rows()` appends empty rows for them.
+    - Rows written over after they moved to disk are kept in memory until saving,
+      so this is meant for a few rows such as titles, headers and totals.
+    - The sizes are estimates of the Python objects held per row; the values
+      themselves are kept as given.
+    - Once a sheet is full and the report continues on a new sheet, the rows of the
+      full sheet are saved and can no longer be written over. Header and reserved
+      rows written over are repeated as written on the continuation sheets started
+      afterwards.
+
+    Example:
+    --------
+    report = BufferedReport('Sales', memory_budget=16 * 1024 * 1024)
+    totals = report.reserve_rows()
+    report.create_header_freez(headers, color='green')
+    report.create_values(rows, border_style='thin', banding=True)
+    report.create_value(['Total', total_amount], border_style='double', row=totals)
+    report.save('sales.xlsx')
+    """
+
+    def __init__(self, title=None, right_to_left=False, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 max_rows=EXCEL_MAX_ROWS, index_title='Index'):
+        if memory_budget is None or memory_budget <= 0:
+            raise ValueError("memory_budget must be a positive number of bytes")
+        self.memory_budget = memory_budget
+        self._target = None
+        super().__init__(title, right_to_left, max_rows, index_title)
+
+    @timed
+    def create_header(self, data, start_col=1, height=None, width=None, color=None, text_color=None,
+                      border_style=None, row=None):
+        """
+        Append a styled header row, or write it over row `row`; see `create_header` for the styling options.
+        """
+        with self._at(row):
+            super().create_header(data, start_col, height, width, color, text_color, border_style)
+
+    @timed
+    def create_value(self, data, start_col=1, border_style=None, m=None, height=None, color=None, width=None,
+                     different_cell=None, different_value=None, item_num=None, item_color=None, m_color=None,
+                     row=None):
+        """
+        Append a row of values, or write them over row `row`; see `create_value` for the styling options.
+        """
+        with self._at(row):
+            super().create_value(data, start_col, border_style, m, height, color, width, different_cell,
+                                 different_value, item_num, item_color, m_color)
+
+    @timed
+    def excel_description(self, description, start_col=1, end_col=None, size=None, color=None, my_color=None,
+                          height=None, row=None):
+        """
+        Append a description row, or write it over row `row`; see `excel_description` for the styling options.
+        """
+        with self._at(row):
+            super().excel_description(description, start_col, end_col, size, color, my_color, height)
+        if row is not None and end_col is not None and end_col > start_col and self._is_header_row(row):
+            merged = self._header[2]
+            cell_range = f'{get_column_letter(start_col)}{row}:{get_column_letter(end_col)}{row}'
+            if cell_range not in merged:
+                merged.append(cell_range)
+
+    def reserve_rows(self, count=1):
+        """
+        Append `count` empty rows to be written later with `row=`.
+
+        Returns:
+        --------
+        int
+            The number of the first reserved row.
+        """
+        if count is None or count < 1:
+            raise ValueError("count must be a positive integer")
+        self._append([], [], 1, None)
+        first = self.row
+        for _ in range(count - 1):
+            self._append([], [], 1, None)
+        return first
+
+    @contextlib.contextmanager
+    def _at(self, row):
+        """
+        Direct the rows written inside the block over row `row` (None appends as usual).
+
+        The row index of the report points at `row` meanwhile, so the methods that
+        use it (e.g. the merged cells of a description) apply to that row.
+        """
+        if row is None:
+            yield
+            return
+        if not 1 <= row <= self.row:
+            raise ValueError(f"row must be between 1 and {self.row}, the last row of the sheet")
+        last_row = self.row
+        self._target = self.row = row
+        try:
+            yield
+        finally:
+            self._target = None
+            self.row = last_row
+
+    def _start_body(self):
+        if self._target is None:
+            super()._start_body()
+
+    def _append(self, values, styles, start_col, height):
+        if self._target is None:
+            super()._append(values, styles, start_col, height)
+            return
+        row = self._target
+        end_col = start_col + len(values) - 1
+        if end_col > self.layout.max_column:
+            self.layout.max_column = end_col
+        if self._is_header_row(row):
+            self._refresh_header(row, values, styles, start_col, height)
+        if self._pending is not None and row > self._written:
+            # A header row that is still held back.
+            index = row - self._written - 1
+            old_values, old_styles, old_start = self._pending[index]
+            new_start, new_values, new_styles = _overlay(old_start, old_values, old_styles, start_col, values, styles)
+            self._pending[index] = (new_values, new_styles, new_start)
+            if height is not None:
+                self.worksheet.row_dimensions[row].height = height
+        elif row > self._spilled:
+            entry = self._buffer[row - self._buffer[0][0]]
+            entry[2], entry[3], entry[4] = _overlay(entry[2], entry[3], entry[4], start_col, values, styles)
+            if height is not None:
+                entry[1] = height
+        else:
+            # The row is on disk; write it over when the rows are replayed.
+            old = self._overrides.get(row)
+            if old is None:
+                self._overrides[row] = [height, start_col, list(values), list(styles)]
+            else:
+                old[1], old[2], old[3] = _overlay(old[1], old[2], old[3], start_col, values, styles)
+                if height is not None:
+                    old[0] = height
+
+    def _is_header_row(self, row):
+        """
+        Return whether `row` is one of the header rows repeated at the top of continuation sheets.
+        """
+        return self._header is not None and row <= len(self._header[0])
+
+    def _refresh_header(self, row, values, styles, start_col, height):
+        """
+        Write a row over header row `row` in the rows repeated at the top of continuation sheets.
+        """
+        rows, heights, _ = self._header
+        old_values, old_styles, old_start = rows[row - 1]
+        new_start, new_values, new_styles = _overlay(old_start, old_values, old_styles, start_col, values, styles)
+        rows[row - 1] = (new_values, new_styles, new_start)
+        if height is not None:
+            heights[row] = height
+
+    def _write(self, values, styles, start_col):
+        row_idx = self._written + 1
+        height = self.worksheet.row_dimensions.pop(row_idx, None)
+        values = list(values)
+        size = _ROW_SIZE + _CELL_SIZE * len(values) + sum(len(value) for value in values if type(value) is str)
+        self._buffer.append([row_idx, height.height if height is not None else None, start_col, values,
+                             list(styles), size])
+        self._buffered += size
+        self._written = row_idx
+        if self._buffered > self.memory_budget:
+            self._spill()
+
+    def _spill(self):
+        """
+        Move the oldest buffered rows to the spill file until half of the budget is used.
+        """
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix='excelstyler-')
+        buffer = self._buffer
+        style_index = self._style_index
+        packed = []
+        while buffer and self._buffered > self.memory_budget // 2:
+            row_idx, height, start_col, values, styles, size = buffer.popleft()
+            packed.append((row_idx, height, start_col, values, [style_index(style) for style in styles]))
+            self._buffered -= size
+        pickle.dump(packed, self._spill_file, pickle.HIGHEST_PROTOCOL)
+        self._spilled = packed[-1][0]
+
+    def _style_index(self, style):
+        """
+        Return the index of `style` in the workbook's cell style table.
+        """
+        if style is None:
+            return 0
+        index = self._style_ids.get(id(style))
+        return self._style_id(style) if index is None else index
+
+    def _replay(self):
+        """
+        Render the rows of the sheet, from the spill file and then the buffer, with the rows written over.
+        """
+        render = self._render
+        overrides = self._overrides
+        if self._spill_file is not None:
+            cell_styles = self.workbook._cell_styles
+            spill_file = self._spill_file
+            spill_file.seek(0)
+            while True:
+                try:
+                    packed = pickle.load(spill_file)
+                except EOFError:
+                    break
+                for row_idx, height, start_col, values, indices in packed:
+                    styles = [cell_styles[index] if index else None for index in indices]
+                    override = overrides.pop(row_idx, None)
+                    if override is not None:
+                        start_col, values, styles = _overlay(start_col, values, styles, *override[1:])
+                        if override[0] is not None:
+                            height = override[0]
+                    if values or height is not None:
+                        render(row_idx, height, values, styles, start_col)
+            spill_file.close()
+            self._spill_file = None
+        for row_idx, height, start_col, values, styles, _ in self._buffer:
+            if values or height is not None:
+                render(row_idx, height, values, styles, start_col)
+        self._buffer.clear()
+        self._buffered = 0
+
+    def _close_sheet(self):
+        if not self._rendered:
+            self._replay()
+        super()._close_sheet()
+
+    def _open_sheet(self):
+        super()._open_sheet()
+        # [row, height, start column, values, styles, estimated size] of the rows kept in memory.
+        self._buffer = deque()
+        self._buffered = 0
+        self._spill_file = None
+        # Last row moved to the spill file, and the rows written over after being moved.
+        self._spilled = 0
+        self._overrides = {}
+
+
+def _overlay(start_col, values, styles, new_start, new_values, new_styles):
+    """
+    Return (start column, values, styles) of a row with the cells of another row written over it.
+    """
+    if not values:
+        return new_start, list(new_values), list(new_styles)
+    first = min(start_col, new_start)
+    width = max(start_col + len(values), new_start + len(new_values)) - first
+    merged_values = [None] * width
+    merged_styles = [None] * width
+    merged_values[start_col - first:start_col - first + len(values)] = values
+    merged_styles[start_col - first:start_col - first + len(styles)] = styles
+    merged_values[new_start - first:new_start - first + len(new_values)] = new_values
+    merged_styles[new_start - first:new_start - first + len(new_styles)] = new_styles
+    return first, merged_values, merged_styles
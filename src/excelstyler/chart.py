@@ -1,6 +1,12 @@
 from openpyxl.chart import LineChart, Reference, BarChart
+from openpyxl.chart.series import SeriesLabel
 
+from .instrument import timed
 
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+@timed
 def add_chart(
         worksheet,
         chart_type,
@@ -13,7 +19,11 @@ def add_chart(
         x_axis_title,
         y_axis_title,
         chart_width=25,  # width in cm
-        chart_height=15  # height in cm
+        chart_height=15,  # height in cm
+        downsample=None,
+        max_points=1000,
+        values=None,
+        titles=None
 ):
     """
     Add a chart to an Excel worksheet.
@@ -21,11 +31,12 @@ def add_chart(
     Parameters:
     -----------
     worksheet : openpyxl.Worksheet
-        The worksheet where the chart will be added.
+        The worksheet where the chart will be added (write-only worksheets, such as
+        `StreamingReport.worksheet`, work too).
     chart_type : str
         Type of chart: 'line' or 'bar'.
-    data_columns : int
-        Column number containing the data series.
+    data_columns : int or list of int
+        Column number(s) containing the data series; one series per column.
     category_column : int
         Column number containing the categories (X-axis labels).
     start_row : int
@@ -44,13 +55,29 @@ def add_chart(
         Width of the chart in centimeters (default: 25).
     chart_height : float, optional
         Height of the chart in centimeters (default: 15).
+    downsample : str, optional
+        Plot at most `max_points` points when the range is longer: 'lttb'
+        (largest-triangle-three-buckets, keeps the visual shape of a line) or
+        'minmax' (keeps the lowest and highest value of each bucket, so no peak is
+        lost). The kept rows are written to a hidden helper sheet and the chart
+        points at it; the data on `worksheet` is not changed.
+    max_points : int, optional
+        Maximum number of points plotted when downsampling (default: 1000).
+    values : dict, optional
+        The values of the rows `start_row..end_row` by column number, for
+        `category_column` and every data column. Needed to downsample a write-only
+        worksheet, whose cells cannot be read back.
+    titles : list of str, optional
+        Series titles, one per data column. By default they are read from the
+        header row above `start_row`.
 
     Notes:
     ------
-    - For line charts, the line color and width are set by default.
-    - `data_columns` should be a single column index (int).
+    - For line charts, the line color of the first series and the line width are set by default.
     - Supports basic line and bar charts.
     - Automatically sets categories and titles from the worksheet data.
+    - With several series, downsampling keeps the union of the points chosen for
+      each series, at most `max_points` in total.
 
     Example:
     --------
@@ -66,6 +93,10 @@ def add_chart(
         x_axis_title="Warehouses",
         y_axis_title="Weight (kg)"
     )
+
+    # 200k daily rows, two series, plotted from 1000 points
+    add_chart(worksheet, 'line', [2, 3], 1, 2, 200001, 'E2', 'Daily sales', 'Day', 'Amount',
+              downsample='lttb')
     """
 
     if chart_type == 'line':
@@ -75,6 +106,15 @@ def add_chart(
         chart = BarChart()
     else:
         raise ValueError("chart_type must be 'line' or 'bar'.")
+    columns = [data_columns] if isinstance(data_columns, int) else list(data_columns)
+    if not columns:
+        raise ValueError("data_columns must name at least one column")
+    if titles is not None and len(titles) != len(columns):
+        raise ValueError("titles must have one title per data column")
+    if downsample is not None and downsample not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample must be one of {', '.join(DOWNSAMPLE_METHODS)}")
+    if downsample is not None and max_points < 3:
+        raise ValueError("max_points must be at least 3")
 
     chart.title = chart_title
     chart.y_axis.title = y_axis_title
@@ -82,15 +122,193 @@ def add_chart(
     chart.width = chart_width
     chart.height = chart_height
 
-    categories = Reference(worksheet, min_col=category_column, min_row=start_row, max_row=end_row)
-    data = Reference(worksheet, min_col=data_columns, min_row=start_row - 1, max_row=end_row)
-    chart.add_data(data, titles_from_data=True)
+    if downsample is not None and end_row - start_row + 1 > max_points:
+        helper, last_row = _write_downsampled(worksheet, columns, category_column, start_row, end_row, downsample,
+                                              max_points, values, titles)
+        categories = Reference(helper, min_col=1, min_row=2, max_row=last_row)
+        for item in range(len(columns)):
+            chart.add_data(Reference(helper, min_col=item + 2, min_row=1, max_row=last_row), titles_from_data=True)
+    else:
+        categories = Reference(worksheet, min_col=category_column, min_row=start_row, max_row=end_row)
+        for item, column in enumerate(columns):
+            if titles is None:
+                chart.add_data(Reference(worksheet, min_col=column, min_row=start_row - 1, max_row=end_row),
+                               titles_from_data=True)
+            else:
+                chart.add_data(Reference(worksheet, min_col=column, min_row=start_row, max_row=end_row))
+                chart.series[-1].tx = SeriesLabel(v=str(titles[item]))
     chart.set_categories(categories)
 
     # Customize line style for line charts
-    for series in chart.series:
+    for item, series in enumerate(chart.series):
         if chart_type == 'line':
-            series.graphicalProperties.line.solidFill = "277358"  # default line color
+            if item == 0:
+                series.graphicalProperties.line.solidFill = "277358"  # default line color
             series.graphicalProperties.line.width = 30000
 
     worksheet.add_chart(chart, chart_position)
+
+
+def lttb_indices(values, max_points):
+    """
+    Return the indices of the points kept by largest-triangle-three-buckets downsampling.
+
+    The points are `(index, value)` pairs; values that are not numbers are skipped.
+    The first and last point are always kept, and in every bucket in between the
+    point forming the largest triangle with its neighbours is chosen.
+
+    Parameters:
+    -----------
+    values : sequence
+        The series.
+    max_points : int
+        Maximum number of points to keep (at least 3).
+
+    Returns:
+    --------
+    list of int
+        Sorted indices into `values`.
+    """
+    points = _points(values)
+    count = len(points)
+    if max_points >= count or max_points < 3:
+        return [index for index, _ in points]
+    every = (count - 2) / (max_points - 2)
+    kept = [points[0][0]]
+    previous = 0
+    for bucket in range(max_points - 2):
+        # The average of the next bucket is the third corner of the triangles.
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        if next_end <= next_start:
+            next_start = next_end - 1
+        following = points[next_start:next_end]
+        average_x = sum(x for x, _ in following) / len(following)
+        average_y = sum(y for _, y in following) / len(following)
+        previous_x, previous_y = points[previous]
+        best, best_area = None, -1.0
+        for position in range(int(bucket * every) + 1, int((bucket + 1) * every) + 1):
+            x, y = points[position]
+            area = abs((previous_x - average_x) * (y - previous_y) - (previous_x - x) * (average_y - previous_y))
+            if area > best_area:
+                best, best_area = position, area
+        if best is not None:
+            kept.append(points[best][0])
+            previous = best
+    kept.append(points[-1][0])
+    return kept
+
+
+def minmax_indices(values, max_points):
+    """
+    Return the indices of the lowest and highest value of each bucket of `values`.
+
+    The series is split into `(max_points - 2) // 2` buckets of consecutive points;
+    values that are not numbers are skipped. The first and last point are always kept.
+
+    Parameters:
+    -----------
+    values : sequence
+        The series.
+    max_points : int
+        Maximum number of points to keep, the first and last included (at least 2).
+
+    Returns:
+    --------
+    list of int
+        Sorted indices into `values`.
+    """
+    points = _points(values)
+    count = len(points)
+    if max_points >= count or max_points < 2:
+        return [index for index, _ in points]
+    buckets = (max_points - 2) // 2
+    kept = {points[0][0], points[-1][0]}
+    size = count / max(buckets, 1)
+    for bucket in range(buckets):
+        chunk = points[int(bucket * size):int((bucket + 1) * size)]
+        if chunk:
+            kept.add(min(chunk, key=_value)[0])
+            kept.add(max(chunk, key=_value)[0])
+    return sorted(kept)
+
+
+_SELECTORS = {'lttb': lttb_indices, 'minmax': minmax_indices}
+
+
+def _write_downsampled(worksheet, columns, category_column, start_row, end_row, method, max_points, values, titles):
+    """
+    Write the downsampled rows to a new hidden sheet; return it and its last row.
+    """
+    series = _series_values(worksheet, columns + [category_column], start_row, end_row, values)
+    # Each series gets an equal share of the points; the chart shows their union.
+    share = max(max_points // len(columns), 3)
+    select = _SELECTORS[method]
+    kept = sorted(set().union(*(select(series[column], share) for column in columns)))
+    if len(kept) > max_points:
+        # The minimum share of 3 points per series can add up past `max_points`; keep evenly spaced rows.
+        step = (len(kept) - 1) / (max_points - 1)
+        kept = [kept[round(position * step)] for position in range(max_points)]
+    if titles is None:
+        titles = _header_titles(worksheet, columns, start_row)
+
+    workbook = worksheet.parent
+    number = 1
+    while f'ChartData{number}' in workbook.sheetnames:
+        number += 1
+    helper = workbook.create_sheet(f'ChartData{number}')
+    helper.sheet_state = 'hidden'
+    helper.append([''] + [str(title) for title in titles])
+    categories = series[category_column]
+    data = [series[column] for column in columns]
+    for index in kept:
+        helper.append([categories[index]] + [column[index] for column in data])
+    return helper, len(kept) + 1
+
+
+def _series_values(worksheet, columns, start_row, end_row, values):
+    """
+    Return {column: list of values of rows start_row..end_row}.
+    """
+    length = end_row - start_row + 1
+    if values is not None:
+        missing = [column for column in columns if column not in values]
+        if missing:
+            raise ValueError(f"values has no data for column(s) {', '.join(map(str, missing))}")
+        series = {column: list(values[column]) for column in columns}
+        if any(len(column) != length for column in series.values()):
+            raise ValueError(f"values must hold {length} values per column, one per row")
+        return series
+    if worksheet.parent.write_only:
+        raise ValueError("A write-only worksheet cannot be read back: pass the column values with values=")
+    series = {column: [] for column in columns}
+    low, high = min(columns), max(columns)
+    for row in worksheet.iter_rows(min_row=start_row, max_row=end_row, min_col=low, max_col=high, values_only=True):
+        for column in columns:
+            series[column].append(row[column - low])
+    return series
+
+
+def _header_titles(worksheet, columns, start_row):
+    """
+    Return the header titles above `start_row`, or 'Series <n>' where they cannot be read.
+    """
+    if worksheet.parent.write_only or start_row < 2:
+        return [f'Series {item}' for item in range(1, len(columns) + 1)]
+    titles = []
+    for item, column in enumerate(columns, 1):
+        title = worksheet.cell(row=start_row - 1, column=column).value
+        titles.append(title if title is not None else f'Series {item}')
+    return titles
+
+
+def _points(values):
+    """
+    Return the (index, value) pairs of the numeric values of a series.
+    """
+    return [(index, value) for index, value in enumerate(values)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value]
+
+
+def _value(point):
+    return point[1]
@@ -0,0 +1,138 @@
+import datetime
+
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+
+from .instrument import timed
+from .registry import get_style_registry
+from .styles import *
+
+
+@timed
+def add_banding_rule(worksheet, start_row, end_row, start_col, end_col, m_color=None):
+    """
+    Add an Excel conditional-formatting rule that fills every even row of a range.
+
+    This is the conditional-formatting counterpart of `create_value(..., m=row)`:
+    one `MOD(ROW(),2)=0` rule for the whole range instead of a fill on every cell.
+
+    Parameters:
+    -----------
+    worksheet : openpyxl.worksheet.worksheet.Worksheet
+        The worksheet to add the rule to (write-only worksheets work too).
+    start_row, end_row : int
+        First and last row of the range.
+    start_col, end_col : int
+        First and last column of the range.
+    m_color : str, optional
+        Hex color of the banded rows instead of the default light cream.
+
+    Example:
+    --------
+    add_banding_rule(worksheet, 4, 1000, 1, 6)
+    """
+    fill = get_style_registry(worksheet.parent).fill(m_color) if m_color else VERY_LIGHT_CREAM_CELL
+    worksheet.conditional_formatting.add(
+        _range(start_row, end_row, start_col, end_col),
+        FormulaRule(formula=['MOD(ROW(),2)=0'], fill=_dxf_fill(fill))
+    )
+
+
+@timed
+def add_highlight_rule(worksheet, start_row, end_row, start_col, end_col, column, value, color=None):
+    """
+    Add an Excel conditional-formatting rule that fills the rows where `column` equals `value`.
+
+    This is the conditional-formatting counterpart of `create_value`'s
+    `different_cell`/`different_value` highlighting. The rule stops the evaluation
+    of later rules, so it wins over banding added after it.
+
+    Parameters:
+    -----------
+    worksheet : openpyxl.worksheet.worksheet.Worksheet
+        The worksheet to add the rule to (write-only worksheets work too).
+    start_row, end_row : int
+        First and last row of the range.
+    start_col, end_col : int
+        First and last column of the range.
+    column : int
+        Worksheet column index of the value compared with `value`.
+    value : str, int, float, bool, date, datetime or None
+        The value that highlights a row. Dates are compared as Excel serial numbers
+        and None matches empty cells.
+    color : str or PatternFill, optional
+        Fill of the highlighted rows (default: `RED_CELL`).
+
+    Example:
+    --------
+    add_highlight_rule(worksheet, 4, 1000, 1, 6, column=3, value='cancelled')
+    """
+    fill = get_style_registry(worksheet.parent).fill(color) if color is not None else RED_CELL
+    formula = f'${get_column_letter(column)}{start_row}={_formula_value(value, worksheet.parent.epoch)}'
+    worksheet.conditional_formatting.add(
+        _range(start_row, end_row, start_col, end_col),
+        FormulaRule(formula=[formula], fill=_dxf_fill(fill), stopIfTrue=True)
+    )
+
+
+def add_value_rules(worksheet, start_row, end_row, start_col, end_col, banding=False, different_cell=None,
+                    different_value=None, item_num=None, item_color=None, color=None, m_color=None):
+    """
+    Add the conditional-formatting rules for a block written by `create_values(..., conditional=True)`.
+
+    The rules reproduce the precedence of `create_value`: highlighted rows win over
+    everything, and columns with a static fill (`color`, `item_num`) are not banded.
+    """
+    if end_row < start_row or end_col < start_col:
+        return
+    if different_cell is not None:
+        add_highlight_rule(worksheet, start_row, end_row, start_col, end_col, start_col + different_cell,
+                           different_value)
+    if not banding:
+        return
+    # Banding only shows on columns without a static fill, so band each run of such columns.
+    run_start = None
+    for column in range(start_col, end_col + 2):
+        item = column - start_col
+        if column > end_col:
+            banded = False
+        elif item_num is not None and item == item_num:
+            banded = not item_color
+        else:
+            banded = color not in color_dict
+        if banded and run_start is None:
+            run_start = column
+        elif not banded and run_start is not None:
+            add_banding_rule(worksheet, start_row, end_row, run_start, column - 1, m_color)
+            run_start = None
+
+
+def _range(start_row, end_row, start_col, end_col):
+    return f'{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}'
+
+
+def _dxf_fill(fill):
+    """
+    Return `fill` as a differential fill; Excel reads the color of solid dxf fills from bgColor.
+    """
+    return PatternFill(fill_type='solid', fgColor=fill.fgColor, bgColor=fill.fgColor)
+
+
+def _formula_value(value, epoch):
+    """
+    Return `value` as an Excel formula literal, as the cell holding it is compared in Excel.
+    """
+    if value is None:
+        # An empty cell equals the empty string in Excel formulas.
+        return '""'
+    if isinstance(value, (datetime.date, datetime.time)):
+        # Dates are stored as serial numbers, so compare with the serial of `value`.
+        return repr(to_excel(value, epoch))
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    value = str(value).replace('"', '""')
+    return f'"{value}"'
@@ -0,0 +1,221 @@
+import sys
+
+from openpyxl.cell import Cell
+
+from .headers import _header_style
+from .instrument import timed
+from .registry import get_style_registry, apply_style
+from .streaming import StreamingReport
+from .styles import *
+from .utils import _TIMEZONE_ERROR, shamsi_dates
+from .values import _MAX_ROW
+
+# Rows converted to Python values at a time; bounds the extra memory used per column.
+_CHUNK_SIZE = 4096
+
+# Number format picked from the dtype kind of a column: signed/unsigned ints, floats, datetime64.
+_DTYPE_FORMATS = {
+    'i': '#,##0',
+    'u': '#,##0',
+    'f': '#,##0',
+    'M': 'yyyy-mm-dd',
+}
+
+
+@timed
+def from_dataframe(target, df, start_row=1, start_col=1, header=True, header_color=None, banding=False,
+                   formats=None, border_style=None, index=False, columns=None, layout=None):
+    """
+    Write a pandas DataFrame (or a 2-D NumPy array) as a styled table.
+
+    The number format and style of every column are chosen once from its dtype, and
+    the values are read column-wise from the underlying arrays in chunks, so no
+    per-cell type checks are made and no list of row lists is built.
+
+    Parameters:
+    -----------
+    target : openpyxl.worksheet.worksheet.Worksheet or StreamingReport
+        Where to write. A `StreamingReport` appends the table after its current row
+        and ignores `start_row`.
+    df : pandas.DataFrame or numpy.ndarray
+        The data. A 2-D array is written column by column, like a DataFrame.
+    start_row : int, optional
+        Row index of the header, or of the first data row if `header` is False (default: 1).
+    start_col : int, optional
+        Column index of the first column (default: 1).
+    header : bool, optional
+        Write the column names as a header row styled like `create_header` (default: True).
+    header_color : str, optional
+        Background color of the header row, as in `create_header(color=...)`.
+    banding : bool, optional
+        Apply the alternating fill to even worksheet rows, like `create_values(banding=True)`.
+    formats : dict, optional
+        Number formats by column name, overriding the dtype defaults. The special
+        format 'shamsi' writes a date column as Shamsi 'DD-MM-YYYY' strings.
+    border_style : str, optional
+        Border style to apply to each cell (e.g., 'thin', 'medium').
+    index : bool, optional
+        Write the DataFrame index as the first column (default: False).
+    columns : list, optional
+        Column names for a NumPy array; the header is skipped when not given.
+    layout : SheetLayout, optional
+        Record the value widths on this layout when it fits columns automatically.
+        Not used with a `StreamingReport`, which has its own layout.
+
+    Returns:
+    --------
+    int
+        The index of the row after the last written row.
+
+    Notes:
+    ------
+    - Integer and float columns get '#,##0', datetime columns 'yyyy-mm-dd'; other
+      columns are written as they are. Unlike `create_value`, zeros are shown as 0
+      because the format is chosen per column, not per value.
+    - Missing values (`NaN`, `NaT`, `None`, `pandas.NA`) are written as empty cells.
+    - pandas is not imported by excelstyler; any object with `columns` and `iloc`
+      works.
+
+    Example:
+    --------
+    next_row = from_dataframe(worksheet, df, header_color='green', banding=True,
+                              formats={'date': 'shamsi', 'ratio': '0.00%'})
+    """
+    if start_row is None or start_col is None or start_row < 1 or start_col < 1:
+        raise ValueError("start_row and start_col must be positive integers")
+    numpy = sys.modules.get('numpy')
+    if numpy is None:
+        raise ValueError("from_dataframe requires a pandas DataFrame or a NumPy array")
+    names, arrays = _columns(numpy, df, index, columns)
+    formats = formats or {}
+    values, number_formats = [], []
+    for item, array in enumerate(arrays):
+        column, number_format = _column_values(numpy, array, formats.get(names[item]) if names else None)
+        values.append(column)
+        number_formats.append(number_format)
+
+    streaming = isinstance(target, StreamingReport)
+    worksheet = target.worksheet if streaming else target
+    registry = get_style_registry(worksheet.parent)
+    plain, banded = _column_styles(registry, number_formats, border_style)
+
+    if streaming:
+        if header and names:
+            target.create_header([str(name) for name in names], start_col=start_col, color=header_color,
+                                 border_style=border_style)
+        target._start_body()
+        for data in _rows(values):
+            target._make_room()
+            target._append(data, banded if banding and (target.row + 1) % 2 == 0 else plain, start_col, None)
+        return target.row + 1
+
+    row_idx = start_row
+    if header and names:
+        style = _header_style(registry, header_color, None, border_style)
+        for col_num, name in enumerate(names, start_col):
+            apply_style(worksheet.cell(row=row_idx, column=col_num, value=str(name)), style)
+        if layout is not None and layout.auto_width:
+            layout.measure_row(start_col, [str(name) for name in names])
+        row_idx += 1
+    cells = worksheet._cells
+    add_cell = worksheet._add_cell
+    measure_row = layout.measure_row if layout is not None and layout.auto_width else None
+    for data in _rows(values):
+        if row_idx > _MAX_ROW:
+            raise ValueError(f"Row numbers must be between 1 and {_MAX_ROW}. Row number supplied was {row_idx}")
+        styles = banded if banding and row_idx % 2 == 0 else plain
+        for column, (value, style) in enumerate(zip(data, styles), start_col):
+            cell = cells.get((row_idx, column))
+            if cell is None:
+                add_cell(Cell(worksheet, row=row_idx, column=column, value=value, style_array=style))
+            else:
+                if value is not None:
+                    cell.value = value
+                apply_style(cell, style)
+        if measure_row is not None:
+            measure_row(start_col, data)
+        row_idx += 1
+    return row_idx
+
+
+def _columns(numpy, df, index=False, columns=None):
+    """
+    Return the column names and the per-column arrays of `df`.
+    """
+    if isinstance(df, numpy.ndarray):
+        if df.ndim != 2:
+            raise ValueError("A NumPy array must be two-dimensional")
+        names = list(columns) if columns is not None else []
+        arrays = [df[:, item] for item in range(df.shape[1])]
+    else:
+        names = list(df.columns)
+        arrays = [df.iloc[:, item] for item in range(len(names))]
+        if index:
+            names.insert(0, df.index.name or '')
+            arrays.insert(0, df.index)
+    return names, arrays
+
+
+def _column_values(numpy, array, number_format=None):
+    """
+    Convert one column to an array of values openpyxl can write, and pick its format.
+
+    Missing values become `None`, NumPy scalars become Python values (via `tolist`
+    when the rows are read), and datetimes become `datetime.datetime` objects.
+    """
+    if number_format == 'shamsi':
+        return numpy.array(shamsi_dates(array), dtype=object), None
+    kind = array.dtype.kind
+    if number_format is None:
+        number_format = _DTYPE_FORMATS.get(kind)
+    if kind == 'M':
+        if getattr(array.dtype, 'tz', None) is not None:
+            # NumPy would silently convert to UTC; reject them like `create_value` does.
+            raise TypeError(_TIMEZONE_ERROR)
+        # Microsecond precision converts to `datetime` objects, with NaT as None.
+        return numpy.asarray(array).astype('datetime64[us]').astype(object), number_format
+    if kind in 'iubf' and not isinstance(array.dtype, numpy.dtype):
+        # Nullable pandas dtypes (Int64, boolean, Float64) mark missing values with pandas.NA.
+        return array.to_numpy(dtype=object, na_value=None), number_format
+    if kind == 'f':
+        data = numpy.asarray(array)
+        missing = numpy.isnan(data)
+        if missing.any():
+            data = data.astype(object)
+            data[missing] = None
+        return data, number_format
+    if kind in 'iub':
+        return numpy.asarray(array), number_format
+    # Object, string and categorical columns: only the missing values need replacing.
+    isna = getattr(array, 'isna', None)
+    data = numpy.asarray(array, dtype=object)
+    if isna is not None:
+        missing = numpy.asarray(isna())
+        if missing.any():
+            data = data.copy()
+            data[missing] = None
+    return data, number_format
+
+
+def _column_styles(registry, number_formats, border_style=None):
+    """
+    Resolve the (plain, banded) style array of every column.
+    """
+    font = registry.font(size=10, bold=True)
+    border = registry.border(border_style)
+    plain = [registry.style(font=font, border=border, alignment=Alignment_CELL, number_format=number_format)
+             for number_format in number_formats]
+    banded = [registry.style(font=font, fill=VERY_LIGHT_CREAM_CELL, border=border, alignment=Alignment_CELL,
+                             number_format=number_format)
+              for number_format in number_formats]
+    return plain, banded
+
+
+def _rows(values):
+    """
+    Yield the rows of a list of column arrays, converting `_CHUNK_SIZE` rows at a time.
+    """
+    length = len(values[0]) if values else 0
+    for start in range(0, length, _CHUNK_SIZE):
+        chunk = [column[start:start + _CHUNK_SIZE].tolist() for column in values]
+        yield from zip(*chunk)
@@ -0,0 +1,102 @@
+from .xmlwriter import _report_class
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def stream_xlsx(rows, headers=None, fields=None, title=None, right_to_left=False, chunk_size=2000,
+                header_color=None, border_style=None, banding=False, width=None, buffer_size=65536,
+                conditional=False, table_style=None, backend='openpyxl'):
+    """
+    Export a Django QuerySet or any iterable of rows as xlsx bytes, chunk by chunk.
+
+    Rows are read lazily, written through a `StreamingReport` with the excelstyler
+    header and value styling, and the finished file is yielded in chunks, so neither
+    the rows, the workbook nor the file are ever held in memory in full.
+
+    Parameters:
+    -----------
+    rows : iterable
+        The rows. Objects with an `iterator()` method, like Django QuerySets, are read
+        with `rows.iterator(chunk_size=chunk_size)`.
+    headers : list, optional
+        Header titles, written as a frozen, filtered header row like `create_header_freez`.
+    fields : list of str, optional
+        Names of the values to take from each row, as dict keys or attribute names
+        (e.g. model fields). Without `fields` each row is used as a sequence of values.
+    title : str, optional
+        Title of the worksheet.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    chunk_size : int, optional
+        Number of rows fetched from the database at a time (default: 2000).
+    header_color : str, optional
+        Background color of the header row.
+    border_style : str, optional
+        Border style to apply to every cell (e.g., 'thin', 'medium').
+    banding : bool, optional
+        Apply the alternating fill to even rows.
+    width : int, optional
+        Width of the header columns.
+    buffer_size : int, optional
+        Approximate size of the yielded chunks in bytes (default: 65536).
+    conditional : bool, optional
+        Apply `banding` through a conditional-formatting rule, see `create_values`.
+    table_style : str, optional
+        Write the rows as a native Excel Table with this table style (e.g.
+        'TableStyleMedium2') instead of styling the cells; requires `headers`.
+    backend : str, optional
+        'openpyxl' to write through `StreamingReport` (default) or 'xml' to write the
+        sheet XML directly with `XmlReport`, which is much faster for large exports.
+
+    Yields:
+    -------
+    bytes
+        Consecutive pieces of the xlsx file.
+
+    Notes:
+    ------
+    - Nothing is read until the first chunk is requested, and the rows are read in the
+      thread consuming the generator, so database connections behave as usual.
+    - The first bytes are sent once all rows have been read: openpyxl writes the sheet
+      to a temporary file first and packs the xlsx at the end.
+
+    Example:
+    --------
+    from django.http import StreamingHttpResponse
+    from excelstyler.export import stream_xlsx, XLSX_CONTENT_TYPE
+
+    def export_employees(request):
+        employees = Employee.objects.order_by('id')
+        response = StreamingHttpResponse(
+            stream_xlsx(employees, ['نام', 'نام خانوادگی'], fields=['first_name', 'last_name'],
+                        right_to_left=True, border_style='thin'),
+            content_type=XLSX_CONTENT_TYPE
+        )
+        response['Content-Disposition'] = 'attachment; filename="employees.xlsx"'
+        return response
+    """
+    if table_style is not None and not headers:
+        raise ValueError("A table needs headers")
+    report = _report_class(backend)(title, right_to_left=right_to_left)
+    if hasattr(rows, 'iterator'):
+        rows = rows.iterator(chunk_size=chunk_size)
+    if fields is not None:
+        rows = (_row_values(item, fields) for item in rows)
+    if table_style is not None:
+        report.create_table(list(headers), rows, style=table_style)
+    else:
+        if headers:
+            report.create_header_freez(list(headers), width=width, color=header_color, border_style=border_style)
+        report.create_values(rows, border_style=border_style, banding=banding, conditional=conditional)
+    yield from report.iter_bytes(buffer_size)
+
+
+def _row_values(item, fields):
+    """
+    Return the values of `fields` from a mapping (dict, database record) or an object.
+    """
+    if isinstance(item, dict):
+        return [item.get(field) for field in fields]
+    if hasattr(item, 'keys'):
+        return [item[field] for field in fields]
+    return [getattr(item, field) for field in fields]
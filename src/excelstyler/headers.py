@@ -1,12 +1,15 @@
 import openpyxl
-from openpyxl.styles import PatternFill, Font, Border, Side
-from openpyxl.utils import get_column_letter
 
+from .instrument import timed
+from .layout import SheetLayout
+from .registry import get_style_registry, apply_style
 from .styles import *
 
 
+@timed
 def create_header(
-        worksheet, data, start_col, row, height=None, width=None, color=None, text_color=None, border_style=None
+        worksheet, data, start_col, row, height=None, width=None, color=None, text_color=None, border_style=None,
+        layout=None
 ):
     """
     Create a header row in an Excel worksheet with optional styling.
@@ -32,6 +35,8 @@ def create_header(
         Font color for header text. Default is white ('D9FFFFFF').
     border_style : str, optional
         Border style to apply to each header cell (e.g., 'thin', 'medium').
+    layout : SheetLayout, optional
+        Record the height and widths on this layout; they are applied by `layout.finish()`.
 
     Raises:
     -------
@@ -54,37 +59,45 @@ def create_header(
         raise ValueError("start_col and row cannot be None")
     if start_col < 1 or row < 1:
         raise ValueError("start_col and row must be positive integers")
+    deferred = layout is not None
+    if not deferred:
+        layout = SheetLayout(worksheet)
+    style = _header_style(get_style_registry(worksheet.parent), color, text_color, border_style)
     for col_num, option in enumerate(data, start_col):
         cell = worksheet.cell(row=row, column=col_num, value=option)
-        col_letter = get_column_letter(col_num)
-        cell.alignment = Alignment_CELL
-        if color is not None:
-            if color in color_dict:
-                cell.fill = color_dict[color]
-            else:
-                cell.fill = PatternFill(start_color=color, fill_type="solid")
-        else:
-            cell.fill = CREAM_CELL
-        if text_color is not None:
-            cell.font = Font(size=9, bold=True, color=text_color)
-        else:
-            cell.font = Font(size=9, bold=True, color='D9FFFFFF')
-        if height is not None:
-            worksheet.row_dimensions[row].height = height
+        apply_style(cell, style)
         if width is not None:
-            worksheet.column_dimensions[col_letter].width = width
-        if border_style is not None:
-            cell.border = Border(
-                left=Side(style=border_style),
-                right=Side(style=border_style),
-                top=Side(style=border_style),
-                bottom=Side(style=border_style)
-            )
+            layout.set_column_width(col_num, width)
+    if height is not None:
+        layout.set_row_height(row, height)
+    if layout.auto_width:
+        layout.measure_row(start_col, data)
+    if not deferred:
+        layout.finish()
 
 
+def _header_style(registry, color=None, text_color=None, border_style=None):
+    """
+    Resolve the `create_header` styling options to a `StyleArray`.
+
+    Used by both `create_header` and `StreamingReport.create_header`; the result is
+    the same for every cell of the row, so it is resolved once per call.
+    """
+    if color is not None:
+        fill = registry.fill(color)
+    else:
+        fill = CREAM_CELL
+    if text_color is not None:
+        font = registry.font(size=9, bold=True, color=text_color)
+    else:
+        font = registry.font(size=9, bold=True, color='D9FFFFFF')
+    return registry.style(font=font, fill=fill, border=registry.border(border_style), alignment=Alignment_CELL)
+
+
+@timed
 def create_header_freez(
         worksheet, data, start_col, row, header_row, height=None, width=None, len_with=None,
-        different_cell=None, color=None, border_style=None
+        different_cell=None, color=None, border_style=None, layout=None
 ):
     """
     Create a styled header row in an Excel worksheet with freeze panes and auto-filter.
@@ -114,45 +127,61 @@ def create_header_freez(
         Default is `GREEN_CELL`.
     border_style : str, optional
         Border style to apply to each header cell (e.g., 'thin', 'medium').
+    layout : SheetLayout, optional
+        Record the freeze panes, auto-filter and dimensions on this layout instead of
+        applying them now; `layout.finish()` then sizes the filter to the data written
+        afterwards.
 
     Notes:
     ------
     - All header cells are center-aligned by default using `Alignment_CELL`.
     - Header row is frozen at `header_row` to keep it visible when scrolling.
     - Auto-filter is applied to the range from the first column to the last used column.
+      Without `layout` the range is computed when the header is written, so it only
+      covers rows that already exist.
     - This function is useful for creating **Excel tables with fixed headers and filters**.
     """
+    deferred = layout is not None
+    if not deferred:
+        layout = SheetLayout(worksheet)
+    style, different_style = _header_freez_styles(get_style_registry(worksheet.parent), color, border_style)
     for col_num, option in enumerate(data, start_col):
-        col_letter = get_column_letter(col_num)
         cell = worksheet.cell(row=row, column=col_num, value=option)
-        cell.alignment = Alignment_CELL
-        cell.fill = LIGHT_CREAM_CELL
-        if color is not None:
-            if color in color_dict:
-                cell.fill = color_dict[color]
-            else:
-                cell.fill = PatternFill(start_color=color, fill_type="solid")
-
-        if height is not None:
-            worksheet.row_dimensions[row].height = height
-            if len(option) > worksheet.column_dimensions[col_letter].width:
-                worksheet.column_dimensions[col_letter].width = len(option) + 2
-        if width is not None:
-            worksheet.column_dimensions[col_letter].width = width
-        if len_with is not None:
-            if len(option) > worksheet.column_dimensions[col_letter].width:
-                worksheet.column_dimensions[col_letter].width = len(option) + 3
-        if different_cell is not None:
-            if option == different_cell:
-                cell.fill = PatternFill(start_color="C00000", fill_type="solid")
-        worksheet.freeze_panes = worksheet[f'A{header_row}']
-        max_col = worksheet.max_column
-        range_str = f'A{header_row - 1}:{get_column_letter(max_col)}{worksheet.max_row}'
-        worksheet.auto_filter.ref = range_str
-        if border_style is not None:
-            cell.border = Border(
-                left=Side(style=border_style),
-                right=Side(style=border_style),
-                top=Side(style=border_style),
-                bottom=Side(style=border_style)
-            )
+        if different_cell is not None and option == different_cell:
+            apply_style(cell, different_style)
+        else:
+            apply_style(cell, style)
+        _header_freez_width(layout, col_num, option, height, width, len_with)
+    if height is not None:
+        layout.set_row_height(row, height)
+    if layout.auto_width:
+        layout.measure_row(start_col, data)
+
+    layout.freeze(f'A{header_row}')
+    layout.auto_filter(header_row - 1)
+    if not deferred:
+        layout.finish()
+
+
+def _header_freez_styles(registry, color=None, border_style=None):
+    """
+    Resolve the `create_header_freez` options to (header style, `different_cell` style).
+    """
+    border = registry.border(border_style)
+    fill = registry.fill(color) if color is not None else LIGHT_CREAM_CELL
+    return (
+        registry.style(fill=fill, border=border, alignment=Alignment_CELL),
+        registry.style(fill=registry.fill("C00000"), border=border, alignment=Alignment_CELL)
+    )
+
+
+def _header_freez_width(layout, col_num, option, height=None, width=None, len_with=None):
+    """
+    Record the column width `create_header_freez` gives the column of `option`.
+    """
+    if height is not None and len(option) > layout.column_width(col_num):
+        layout.set_column_width(col_num, len(option) + 2)
+    if width is not None:
+        layout.set_column_width(col_num, width)
+    if len_with is not None and len(option) > layout.column_width(col_num):
+        layout.set_column_width(col_num, len(option) + 3)
@@ -1,8 +1,11 @@
+from .instrument import timed
+from .registry import get_style_registry, apply_style
 from .styles import *
-from openpyxl.styles import Font, PatternFill
 
 
-def excel_description(worksheet, from_row, description, size=None, color=None, my_color=None, to_row=None):
+@timed
+def excel_description(worksheet, from_row, description, size=None, color=None, my_color=None, to_row=None,
+                      height=None, layout=None):
     """
     Write a description or label in an Excel worksheet, optionally merge cells and apply styling.
 
@@ -22,6 +25,10 @@ def excel_description(worksheet, from_row, description, size=None, color=None, m
         Custom background color for the cell (hex format).
     to_row : str, optional
         If provided, merge cells from `from_row` to `to_row`.
+    height : int, optional
+        Height of the description row.
+    layout : SheetLayout, optional
+        Record the height on this layout; it is applied by `layout.finish()`.
 
     Notes:
     ------
@@ -33,17 +40,30 @@ def excel_description(worksheet, from_row, description, size=None, color=None, m
     --------
     excel_description(worksheet, 'A1', 'Cold House Report', size=14, color='red', to_row='C1')
     """
-    worksheet[from_row] = description
-    worksheet[from_row].alignment = Alignment_CELL
-    if size is not None:
-        worksheet[from_row].font = Font(size=size, bold=True)
-    elif color is not None:
-        worksheet[from_row].font = red_font
-    else:
-        worksheet[from_row].font = Font(size=10, bold=True)
-    if my_color is not None:
-        worksheet[from_row].fill = PatternFill(start_color=my_color, fill_type="solid")
+    cell = worksheet[from_row]
+    cell.value = description
+    apply_style(cell, _description_style(get_style_registry(worksheet.parent), size, color, my_color))
+
+    if height is not None:
+        if layout is not None:
+            layout.set_row_height(cell.row, height)
+        else:
+            worksheet.row_dimensions[cell.row].height = height
 
     if to_row is not None:
         merge_range = f'{from_row}:{to_row}'
         worksheet.merge_cells(merge_range)
+
+
+def _description_style(registry, size=None, color=None, my_color=None):
+    """
+    Resolve the `excel_description` styling options to a `StyleArray`.
+    """
+    if size is not None:
+        font = registry.font(size=size, bold=True)
+    elif color is not None:
+        font = red_font
+    else:
+        font = registry.font(size=10, bold=True)
+    fill = registry.fill(my_color) if my_color is not None else None
+    return registry.style(font=font, fill=fill, alignment=Alignment_CELL)
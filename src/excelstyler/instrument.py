@@ -0,0 +1,248 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# The `Instrumentation` collecting measurements, or None when instrumentation is off.
+_active = None
+_lock = threading.Lock()
+
+
+class Instrumentation:
+    """
+    Timings and counters collected while an `instrument()` block is active.
+
+    Attributes:
+    -----------
+    timings : dict
+        `[calls, total seconds, max seconds]` by entry point name, e.g.
+        'create_value' or 'StreamingReport.save'. Times are inclusive: an entry
+        point that calls another is also timed as a whole.
+    counters : dict
+        Event counts: style objects created by the style registries ('fonts_created',
+        'fills_created', 'borders_created') and style combinations resolved to a
+        cell style ('styles_resolved').
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.timings = {}
+        self.counters = {}
+        self._workbooks = {}
+        self._previous = None
+
+    def __enter__(self):
+        global _active
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = self._previous
+        self._previous = None
+
+    def record(self, name, seconds):
+        """
+        Add one call of `name` that took `seconds`.
+        """
+        with _lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                self.timings[name] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def count(self, name, amount=1):
+        """
+        Add `amount` to the counter `name`.
+        """
+        with _lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def track(self, workbook):
+        """
+        Include the style tables of `workbook` in `as_dict()`.
+
+        Workbooks styled by excelstyler while the block is active are tracked
+        automatically, and are kept alive until the instrumentation is discarded.
+        """
+        self._workbooks[id(workbook)] = workbook
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of your own code, such as fetching rows or `workbook.save()`.
+
+        Example:
+        --------
+        with stats.phase('fetch'):
+            rows = list(queryset)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def as_dict(self):
+        """
+        Return the measurements as plain data, ready for JSON or a metrics client.
+
+        Returns:
+        --------
+        dict
+            'timings': {name: {'calls', 'total', 'mean', 'max'}} with times in seconds,
+            'counters': {name: count}, and 'workbooks': one dict per tracked workbook
+            with the number of distinct cell styles, fonts, fills, borders and custom
+            number formats it holds.
+        """
+        with _lock:
+            timings = {
+                name: {'calls': calls, 'total': total, 'mean': total / calls, 'max': longest}
+                for name, (calls, total, longest) in self.timings.items()
+            }
+            counters = dict(self.counters)
+            workbooks = list(self._workbooks.values())
+        return {
+            'timings': timings,
+            'counters': counters,
+            'workbooks': [_style_counts(workbook) for workbook in workbooks],
+        }
+
+    def log(self, logger=None, level=None):
+        """
+        Emit the measurements as one log record.
+
+        The record goes to `logger` (default: the 'excelstyler' logger) at `level`
+        (default: INFO). The message is a readable summary; the full `as_dict()`
+        data is attached to the record as its `excelstyler` attribute, for
+        structured log handlers.
+        """
+        # Imported here: logging is slow to import and only needed when logging.
+        import logging
+        if logger is None:
+            logger = logging.getLogger('excelstyler')
+        if level is None:
+            level = logging.INFO
+        data = self.as_dict()
+        parts = [
+            f"{name}: {timing['calls']} calls, {timing['total']:.3f}s"
+            for name, timing in sorted(data['timings'].items(), key=lambda item: -item[1]['total'])
+        ]
+        parts.extend(f'{name}: {count}' for name, count in sorted(data['counters'].items()))
+        parts.extend(f"workbook {number}: {counts['cell_styles']} cell styles"
+                     for number, counts in enumerate(data['workbooks'], 1))
+        logger.log(level, 'excelstyler instrumentation: %s', '; '.join(parts), extra={'excelstyler': data})
+
+
+def instrument(callback=None):
+    """
+    Measure excelstyler calls made inside a `with` block.
+
+    While the block is active, every excelstyler entry point (`create_header`,
+    `create_value`, `shamsi_date`, `add_chart`, the `StreamingReport` methods,
+    saving, ...) records its call count and time, and the style registries count
+    the style objects they create. Instrumentation is off by default and costs a
+    single check per call when off.
+
+    Parameters:
+    -----------
+    callback : callable, optional
+        Called as `callback(name, seconds)` after every timed call, e.g. to feed a
+        metrics histogram.
+
+    Returns:
+    --------
+    Instrumentation
+        The collected measurements; use `as_dict()` or `log()` after the block.
+
+    Notes:
+    ------
+    - Calls made from other threads while the block is active are measured too,
+      e.g. the executor threads of `AsyncReport` or the save thread of `iter_bytes`.
+    - Sheets built in the worker processes of `ParallelWorkbook` are not measured;
+      only its `save` is.
+
+    Example:
+    --------
+    with instrument() as stats:
+        with stats.phase('fetch'):
+            rows = fetch_rows()
+        report = StreamingReport('Sales')
+        report.create_values(rows, banding=True)
+        report.save('sales.xlsx')
+    stats.log()
+    """
+    return Instrumentation(callback)
+
+
+def timed(func=None, name=None):
+    """
+    Decorator recording the calls of `func` while instrumentation is active.
+
+    The calls are recorded under `name`, or the qualified name of `func`. Can be
+    used on your own functions to see them next to the excelstyler entry points.
+
+    Example:
+    --------
+    @timed
+    def load_rows(warehouse_id):
+        ...
+    """
+    if func is None:
+        return functools.partial(timed, name=name)
+    label = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = _active
+        if stats is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.record(label, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _call(name, func, *args):
+    """
+    Call `func(*args)`, recording it under `name` if instrumentation is active.
+    """
+    stats = _active
+    if stats is None:
+        return func(*args)
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        stats.record(name, time.perf_counter() - start)
+
+
+def _count(name):
+    stats = _active
+    if stats is not None:
+        stats.count(name)
+
+
+def _track(workbook):
+    stats = _active
+    if stats is not None:
+        stats.track(workbook)
+
+
+def _style_counts(workbook):
+    return {
+        'cell_styles': len(workbook._cell_styles),
+        'fonts': len(workbook._fonts),
+        'fills': len(workbook._fills),
+        'borders': len(workbook._borders),
+        'number_formats': len(workbook._number_formats),
+    }
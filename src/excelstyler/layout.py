@@ -0,0 +1,213 @@
+import unicodedata
+from datetime import date, datetime, time
+from functools import lru_cache
+
+from openpyxl.utils import get_column_letter
+
+# Width openpyxl gives a column without a dimension entry.
+_DEFAULT_COLUMN_WIDTH = 13
+
+# Display width of characters that are not one column wide, filled lazily by `_char_width`.
+_CHAR_WIDTHS = {}
+
+
+def _char_width(char):
+    """
+    Return how many Excel width units `char` takes up.
+
+    Combining marks (Arabic/Persian harakat) and format characters such as the
+    zero-width non-joiner used in Persian words take no space; East Asian wide
+    and full-width glyphs take two; everything else, including Persian and
+    Arabic letters and digits, takes one.
+    """
+    width = _CHAR_WIDTHS.get(char)
+    if width is None:
+        if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+            width = 0
+        elif unicodedata.east_asian_width(char) in ('W', 'F'):
+            width = 2
+        else:
+            width = 1
+        _CHAR_WIDTHS[char] = width
+    return width
+
+
+@lru_cache(maxsize=4096)
+def text_width(text):
+    """
+    Return the display width of `text`, i.e. of its longest line.
+
+    Example:
+    --------
+    >>> text_width('می\u200cشود')
+    5
+    """
+    if '\n' in text:
+        return max(text_width(line) for line in text.split('\n'))
+    return sum(_char_width(char) for char in text)
+
+
+def display_width(value):
+    """
+    Return the display width of a cell value as excelstyler writes it.
+
+    Numbers are measured with thousands separators, matching the '#,###' format.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return text_width(value)
+    if isinstance(value, bool):
+        return 5
+    if isinstance(value, int):
+        return len(f'{value:,}')
+    if isinstance(value, float):
+        return len(f'{value:,.0f}')
+    if isinstance(value, datetime):
+        return 19
+    if isinstance(value, (date, time)):
+        return 10
+    return text_width(str(value))
+
+
+class SheetLayout:
+    """
+    Collect sheet-level settings while a report is written and apply them once.
+
+    Freeze panes and the auto-filter range depend on how much data ends up in the
+    sheet, so instead of recomputing them for every header cell the writers record
+    them here and `finish()` applies them after the last row has been written.
+    Row heights and column widths requested by the writers are tracked the same
+    way: repeated requests only update a dict entry, and each dimension is written
+    to the worksheet once by `finish()`.
+    With `auto_width=True` the writers also report every value they write, and the
+    layout keeps the widest display width per column, so fitted column widths come
+    without a second pass over the sheet.
+    The layout can also be used as a context manager that calls `finish()` on exit.
+
+    Parameters:
+    -----------
+    worksheet : openpyxl.worksheet.worksheet.Worksheet
+        The worksheet the settings belong to.
+    auto_width : bool, optional
+        Fit the width of every written column to its widest value (default: False).
+        Columns given an explicit width keep it.
+    min_width : float, optional
+        Smallest fitted width (default: 8).
+    max_width : float, optional
+        Largest fitted width (default: 60).
+    padding : float, optional
+        Extra width added to the widest value (default: 2).
+
+    Example:
+    --------
+    with SheetLayout(worksheet) as layout:
+        create_header_freez(worksheet, headers, 1, 3, 4, color='green', layout=layout)
+        create_values(worksheet, rows, 4, banding=True)
+    # freeze panes at A4 and an auto-filter over A3:<last column><last row>
+    """
+
+    def __init__(self, worksheet, auto_width=False, min_width=8, max_width=60, padding=2):
+        self.worksheet = worksheet
+        self.auto_width = auto_width
+        self.min_width = min_width
+        self.max_width = max_width
+        self.padding = padding
+        self.content_widths = {}
+        self.freeze_cell = None
+        self.filter_start = None
+        self.max_row = 0
+        self.max_column = 0
+        self.row_heights = {}
+        self.column_widths = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+        return False
+
+    def freeze(self, cell):
+        """
+        Freeze the rows above and the columns left of `cell` (e.g. 'A4').
+        """
+        self.freeze_cell = cell
+
+    def auto_filter(self, row, start_col=1):
+        """
+        Apply an auto-filter from (`row`, `start_col`) to the last used row and column.
+        """
+        if row < 1 or start_col < 1:
+            raise ValueError("row and start_col must be positive integers")
+        self.filter_start = (row, start_col)
+
+    def set_row_height(self, row, height):
+        """
+        Request a height for `row`; the last request wins.
+        """
+        self.row_heights[row] = height
+
+    def set_column_width(self, column, width):
+        """
+        Request a width for the column with index `column`; the last request wins.
+        """
+        self.column_widths[column] = width
+
+    def column_width(self, column):
+        """
+        Return the width `column` will have: the requested width, else the current one.
+        """
+        width = self.column_widths.get(column)
+        if width is None:
+            # `get`, because looking a column up by key adds a dimension entry for it.
+            dimension = self.worksheet.column_dimensions.get(get_column_letter(column))
+            width = dimension.width if dimension is not None else _DEFAULT_COLUMN_WIDTH
+        return width
+
+    def measure_row(self, start_col, data):
+        """
+        Record the display width of the values of a row starting at `start_col`.
+        """
+        widths = self.content_widths
+        for column, value in enumerate(data, start_col):
+            width = display_width(value)
+            if width > widths.get(column, 0):
+                widths[column] = width
+
+    def extent(self):
+        """
+        Return the (max_row, max_column) of the sheet.
+
+        Write-only worksheets do not track their size, so writers streaming into
+        them report it through `max_row` and `max_column`.
+        """
+        worksheet = self.worksheet
+        return (
+            max(getattr(worksheet, 'max_row', 0), self.max_row),
+            max(getattr(worksheet, 'max_column', 0), self.max_column)
+        )
+
+    def finish(self):
+        """
+        Apply the recorded freeze panes, auto-filter and dimensions to the worksheet.
+        """
+        worksheet = self.worksheet
+        for row, height in self.row_heights.items():
+            worksheet.row_dimensions[row].height = height
+        for column, width in self.column_widths.items():
+            worksheet.column_dimensions[get_column_letter(column)].width = width
+        if self.auto_width:
+            for column, content in self.content_widths.items():
+                if column not in self.column_widths:
+                    width = min(max(content + self.padding, self.min_width), self.max_width)
+                    worksheet.column_dimensions[get_column_letter(column)].width = width
+        if self.freeze_cell is not None:
+            worksheet.freeze_panes = self.freeze_cell
+        if self.filter_start is not None:
+            row, start_col = self.filter_start
+            max_row, max_column = self.extent()
+            worksheet.auto_filter.ref = (
+                f'{get_column_letter(start_col)}{row}:{get_column_letter(max(max_column, start_col))}{max(max_row, row)}'
+            )
@@ -0,0 +1,227 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE
+
+from .instrument import timed
+from .tables import _table_name
+from .xmlwriter import _RenderedWriter, _report_class
+
+# Start tags that can refer to the style tables, with the value of a shared string cell.
+_STYLED_TAG = re.compile(rb'<(?:c|row|col|cfRule) [^>]*>(?:<v>\d+</v>)?')
+# Style references: cell and row styles (s), column styles (style) and conditional formats (dxfId).
+_STYLE_ATTRIBUTE = re.compile(rb' (s|style|dxfId)="(\d+)"')
+# Shared string references, written by openpyxl versions without inline strings.
+_SHARED_STRING = re.compile(rb'( t="s"[^>]*><v>)(\d+)(</v>)')
+_BLOCK_SIZE = 1 << 20
+
+
+class ParallelWorkbook:
+    """
+    Build a multi-sheet workbook with one worker process per sheet.
+
+    Every sheet is written by a `build` function into its own `StreamingReport` in a
+    worker process, which renders the sheet XML to a temporary file. The parent then
+    merges the style tables of the workers into one, renumbers the style references
+    of each sheet (again in the workers) and packs the sheets into a single xlsx.
+    Cells that look the same share one style index across all sheets.
+
+    Parameters:
+    -----------
+    max_workers : int, optional
+        Number of worker processes (default: the number of CPUs).
+    backend : str, optional
+        'openpyxl' to build the sheets with `StreamingReport` (default) or 'xml' for `XmlReport`.
+
+    Notes:
+    ------
+    - `build` and its arguments are sent to the worker processes, so `build` must be
+      a module-level function and the arguments must be picklable.
+    - Everything a `StreamingReport` supports works, including conditional formats
+      and tables; charts and images are not supported.
+
+    Example:
+    --------
+    def build_warehouse(report, warehouse_id):
+        report.create_header_freez(HEADERS, color='green')
+        report.create_values(load_rows(warehouse_id), border_style='thin', banding=True)
+
+    workbook = ParallelWorkbook()
+    for warehouse in warehouses:
+        workbook.add_sheet(warehouse.name, build_warehouse, warehouse.id, right_to_left=True)
+    workbook.save('monthly.xlsx')
+    """
+
+    def __init__(self, max_workers=None, backend='openpyxl'):
+        self.max_workers = max_workers
+        self.report_class = _report_class(backend)
+        self.sheets = []
+
+    def add_sheet(self, title, build, *args, right_to_left=False):
+        """
+        Add a sheet that is built by calling `build(report, *args)` in a worker process.
+        """
+        if any(sheet[0] == title for sheet in self.sheets):
+            raise ValueError(f"A sheet named {title!r} was already added")
+        self.sheets.append((title, build, args, right_to_left))
+
+    @timed
+    def save(self, filename):
+        """
+        Build all sheets in parallel and save the workbook to `filename`.
+        """
+        workbook = Workbook(write_only=True)
+        rendered = []
+        try:
+            with ProcessPoolExecutor(self.max_workers) as executor:
+                futures = [executor.submit(_render_sheet, self.report_class, title, build, args, right_to_left)
+                           for title, build, args, right_to_left in self.sheets]
+                for future in futures:
+                    rendered.append(future.result())
+                remaps = [
+                    executor.submit(_remap_sheet, sheet['path'], _merge_styles(workbook, sheet),
+                                    [workbook._differential_styles.add(dxf) for dxf in sheet['dxfs']],
+                                    [workbook.shared_strings.add(string) for string in sheet['strings']])
+                    for sheet in rendered
+                ]
+                for sheet, future in zip(rendered, remaps):
+                    sheet['path'] = future.result()
+            for sheet in rendered:
+                _attach_sheet(workbook, sheet)
+            workbook.save(filename)
+        finally:
+            for sheet in rendered:
+                if os.path.exists(sheet['path']):
+                    os.remove(sheet['path'])
+
+
+def _render_sheet(report_class, title, build, args, right_to_left):
+    """
+    Worker: build one sheet and return its XML file together with its local style tables.
+    """
+    report = report_class(title, right_to_left=right_to_left)
+    build(report, *args)
+    report._finish()
+    if report._parts:
+        raise ValueError(f"Sheet {title!r} has more rows than fit on one worksheet")
+    worksheet = report.worksheet
+    if worksheet._charts or worksheet._images:
+        raise ValueError("Charts and images are not supported in parallel sheets")
+    if not worksheet.closed:
+        worksheet.close()
+    if isinstance(worksheet._writer, _RenderedWriter):
+        # The parent process reads and removes the file; it must outlive this report.
+        worksheet._writer._remove.detach()
+    workbook = report.workbook
+    return {
+        'title': title,
+        'path': worksheet._writer.out,
+        'rels': worksheet._writer._rels,
+        'tables': list(worksheet.tables.values()),
+        'auto_filter': worksheet.auto_filter.ref,
+        'sheet_state': worksheet.sheet_state,
+        'styles': [_style_parts(workbook, style) for style in workbook._cell_styles],
+        'dxfs': list(workbook._differential_styles.styles),
+        'strings': list(workbook.shared_strings),
+    }
+
+
+def _style_parts(workbook, style):
+    """
+    Return the objects a `StyleArray` of `workbook` points to, so another workbook can index them.
+    """
+    number_format = style.numFmtId
+    if number_format >= BUILTIN_FORMATS_MAX_SIZE:
+        number_format = workbook._number_formats[number_format - BUILTIN_FORMATS_MAX_SIZE]
+    return (
+        workbook._fonts[style.fontId],
+        workbook._fills[style.fillId],
+        workbook._borders[style.borderId],
+        workbook._alignments[style.alignmentId],
+        workbook._protections[style.protectionId],
+        number_format,
+        style.pivotButton,
+        style.quotePrefix,
+        style.xfId,
+    )
+
+
+def _merge_styles(workbook, sheet):
+    """
+    Add the styles of a rendered sheet to `workbook` and return the old-to-new style index map.
+    """
+    mapping = []
+    for font, fill, border, alignment, protection, number_format, pivot_button, quote_prefix, xf_id in sheet['styles']:
+        style = StyleArray()
+        style.fontId = workbook._fonts.add(font)
+        style.fillId = workbook._fills.add(fill)
+        style.borderId = workbook._borders.add(border)
+        style.alignmentId = workbook._alignments.add(alignment)
+        style.protectionId = workbook._protections.add(protection)
+        if isinstance(number_format, str):
+            number_format = workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+        style.numFmtId = number_format
+        style.pivotButton = pivot_button
+        style.quotePrefix = quote_prefix
+        style.xfId = xf_id
+        mapping.append(workbook._cell_styles.add(style))
+    return mapping
+
+
+def _remap_sheet(path, style_map, dxf_map, string_map):
+    """
+    Worker: rewrite the style and shared string references of a sheet XML file.
+
+    The file is processed in blocks cut after a closing `</c>` tag, so references
+    never straddle two blocks.
+    """
+    maps = {b's': style_map, b'style': style_map, b'dxfId': dxf_map}
+
+    def style_reference(match):
+        return b' %s="%d"' % (match.group(1), maps[match.group(1)][int(match.group(2))])
+
+    def string_reference(match):
+        return b'%s%d%s' % (match.group(1), string_map[int(match.group(2))], match.group(3))
+
+    def tag(match):
+        # Only attributes of the tags are rewritten; cell text is never touched.
+        data = _STYLE_ATTRIBUTE.sub(style_reference, match.group(0))
+        if string_map:
+            data = _SHARED_STRING.sub(string_reference, data)
+        return data
+
+    target = path + '.remapped'
+    with open(path, 'rb') as source, open(target, 'wb') as out:
+        pending = b''
+        while True:
+            block = source.read(_BLOCK_SIZE)
+            data = pending + block
+            if block:
+                cut = data.rfind(b'</c>')
+                if cut < 0:
+                    pending = data
+                    continue
+                cut += 4
+                data, pending = data[:cut], data[cut:]
+            out.write(_STYLED_TAG.sub(tag, data))
+            if not block:
+                break
+    os.remove(path)
+    return target
+
+
+def _attach_sheet(workbook, sheet):
+    """
+    Add a worksheet to `workbook` whose content is the rendered sheet XML.
+    """
+    worksheet = workbook.create_sheet(sheet['title'])
+    worksheet._writer = _RenderedWriter(sheet['path'], sheet['rels'])
+    worksheet.sheet_state = sheet['sheet_state']
+    worksheet.auto_filter.ref = sheet['auto_filter']
+    for table in sheet['tables']:
+        if workbook._duplicate_name(table.name):
+            table.name = table.displayName = _table_name(workbook)
+        worksheet._tables.add(table)
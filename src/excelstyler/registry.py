@@ -0,0 +1,141 @@
+from copy import copy
+
+from openpyxl.styles import PatternFill, Font, Border, Side
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
+
+from .instrument import _count, _track
+from .styles import color_dict
+
+
+class StyleRegistry:
+    """
+    Per-workbook cache of interned style objects and resolved cell styles.
+
+    openpyxl stores a cell's style as a small array of indices into the workbook's
+    font, fill, border, alignment and number format tables. Assigning `cell.font`
+    or `cell.fill` hashes the object to find (or add) its index on every call.
+    The registry builds each `Font`, `PatternFill` and `Border` once, resolves
+    each (font, fill, border, alignment, number_format) combination to its index
+    array once, and lets writers copy that array straight onto the cell.
+
+    Use `get_style_registry(workbook)` rather than instantiating it directly, so
+    every writer working on the same workbook shares one registry.
+
+    Parameters:
+    -----------
+    workbook : openpyxl.Workbook
+        The workbook whose style tables the resolved styles index into.
+    """
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self._fonts = {}
+        self._fills = {}
+        self._borders = {}
+        self._styles = {}
+
+    def font(self, size=None, bold=False, color=None):
+        """
+        Return the shared `Font` for the given size, weight and color.
+        """
+        key = (size, bold, color)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = Font(size=size, bold=bold, color=color)
+            _count('fonts_created')
+        return font
+
+    def fill(self, color):
+        """
+        Return the shared solid fill for `color`.
+
+        `color` can be a key of `color_dict`, a hex color string or a `PatternFill`,
+        which is returned unchanged. `None` means no fill.
+        """
+        if color is None or isinstance(color, PatternFill):
+            return color
+        fill = self._fills.get(color)
+        if fill is None:
+            fill = color_dict.get(color)
+            if fill is None:
+                fill = PatternFill(start_color=color, fill_type="solid")
+                _count('fills_created')
+            self._fills[color] = fill
+        return fill
+
+    def border(self, style):
+        """
+        Return the shared four-sided `Border` for a border style such as 'thin'.
+        """
+        if not style:
+            return None
+        border = self._borders.get(style)
+        if border is None:
+            border = self._borders[style] = Border(
+                left=Side(style=style),
+                right=Side(style=style),
+                top=Side(style=style),
+                bottom=Side(style=style)
+            )
+            _count('borders_created')
+        return border
+
+    def style(self, font=None, fill=None, border=None, alignment=None, number_format=None):
+        """
+        Resolve a combination of style objects to a `StyleArray` for this workbook.
+
+        Arguments left as `None` stay at the workbook default. The result is cached,
+        keyed by object identity, so pass objects obtained from the registry or
+        long-lived constants from `excelstyler.styles`.
+        """
+        key = (id(font), id(fill), id(border), id(alignment), number_format)
+        entry = self._styles.get(key)
+        if entry is None:
+            workbook = self.workbook
+            array = StyleArray()
+            if font is not None:
+                array.fontId = workbook._fonts.add(font)
+            if fill is not None:
+                array.fillId = workbook._fills.add(fill)
+            if border is not None:
+                array.borderId = workbook._borders.add(border)
+            if alignment is not None:
+                array.alignmentId = workbook._alignments.add(alignment)
+            if number_format is not None:
+                if number_format in BUILTIN_FORMATS_REVERSE:
+                    array.numFmtId = BUILTIN_FORMATS_REVERSE[number_format]
+                else:
+                    array.numFmtId = workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+            # Keep the objects alive so their ids cannot be reused by other objects.
+            entry = self._styles[key] = (array, (font, fill, border, alignment))
+            _count('styles_resolved')
+        return entry[0]
+
+
+def get_style_registry(workbook):
+    """
+    Return the `StyleRegistry` attached to `workbook`, creating it on first use.
+    """
+    _track(workbook)
+    registry = getattr(workbook, '_excelstyler_registry', None)
+    if registry is None:
+        registry = workbook._excelstyler_registry = StyleRegistry(workbook)
+    return registry
+
+
+def apply_style(cell, style):
+    """
+    Copy a resolved `StyleArray` onto `cell`.
+
+    Fields left at their default in `style` keep whatever the cell already had,
+    matching the behaviour of assigning only some of `cell.font`, `cell.fill`, etc.
+    """
+    if cell._style is not None and any(cell._style):
+        merged = copy(cell._style)
+        for index, value in enumerate(style):
+            if value:
+                merged[index] = value
+        cell._style = merged
+    else:
+        cell._style = copy(style)
@@ -0,0 +1,395 @@
+from openpyxl.cell import Cell
+
+from .chart import add_chart
+from .export import _row_values
+from .headers import _header_style
+from .instrument import timed
+from .layout import SheetLayout
+from .registry import get_style_registry, apply_style
+from .streaming import StreamingReport
+from .styles import *
+from .to_locale_string import _to_locale_str
+from .utils import _jalali_str
+from .values import _MAX_ROW
+
+# Column types and the number format their cells get. 'shamsi' and 'locale' columns
+# are converted to text: Shamsi 'DD-MM-YYYY' dates and '1,234,567' numbers.
+COLUMN_TYPES = {
+    'text': None,
+    'int': '#,##0',
+    'money': '#,##0',
+    'float': '#,##0.00',
+    'percent': '0.00%',
+    'date': 'yyyy-mm-dd',
+    'shamsi': None,
+    'locale': None,
+}
+
+
+class Column:
+    """
+    One column of a `ReportSchema`: its header title, where its values come from and how they look.
+
+    Parameters:
+    -----------
+    title : str
+        Header title of the column.
+    field : str, optional
+        Dict key or attribute name (e.g. a model field) of the value in each
+        row. Without fields, rows are sequences of values in column order.
+    type : str, optional
+        One of `COLUMN_TYPES` (default: 'text'): 'int' and 'money' ('#,##0'), 'float'
+        ('#,##0.00'), 'percent' ('0.00%'), 'date' ('yyyy-mm-dd'), 'shamsi' (dates
+        written as Shamsi 'DD-MM-YYYY' text) or 'locale' (numbers written as
+        '1,234,567' text).
+    width : float, optional
+        Column width.
+    color : str, optional
+        Background color of the cells, a key of `color_dict` or a hex color.
+    highlight : any or callable, optional
+        Cells whose value equals `highlight`, or for which `highlight(value)` is true,
+        get `highlight_color`. The value is tested before any conversion.
+    highlight_color : str, optional
+        Background color of highlighted cells (default: 'red', as for `different_value`).
+    number_format : str, optional
+        Number format overriding the one of `type`.
+    """
+
+    def __init__(self, title, field=None, type='text', width=None, color=None, highlight=None,
+                 highlight_color='red', number_format=None):
+        if type not in COLUMN_TYPES:
+            raise ValueError(f"type must be one of {', '.join(COLUMN_TYPES)}")
+        self.title = title
+        self.field = field
+        self.type = type
+        self.width = width
+        self.color = color
+        self.highlight = highlight
+        self.highlight_color = highlight_color
+        self.number_format = number_format if number_format is not None else COLUMN_TYPES[type]
+
+    def __repr__(self):
+        return f'Column({self.title!r}, field={self.field!r}, type={self.type!r})'
+
+
+class ReportSchema:
+    """
+    Describe a report once as a list of columns and write its header, rows and charts from it.
+
+    Instead of passing the same positional `create_value` options for every row, the
+    styling is given per column: a type with its number format, a width, a
+    background color and a highlight rule. `compile()` turns the schema into a
+    `RowWriter` holding the resolved style of every column, so writing a row only
+    picks precomputed styles: no per-cell type checks or style lookups, and the
+    conversions ('shamsi', 'locale') run only on the columns that need them.
+
+    Parameters:
+    -----------
+    columns : list of Column
+        The columns, in sheet order.
+    start_col : int, optional
+        Sheet column of the first column (default: 1).
+    border_style : str, optional
+        Border style of the header and value cells (e.g., 'thin', 'medium').
+    banding : bool, optional
+        Apply the alternating fill to even worksheet rows, like `create_values(banding=True)`.
+    m_color : str, optional
+        Hex color used for banded rows instead of the default light cream.
+    header_color : str, optional
+        Background color of the header row, as in `create_header(color=...)`.
+    header_height : float, optional
+        Height of the header row.
+
+    Notes:
+    ------
+    - The number format is chosen per column, so unlike `create_value` zeros are
+      shown as 0.
+    - A schema is not tied to a workbook and can be shared; `compile()` resolves
+      its styles for one worksheet or report.
+
+    Example:
+    --------
+    SALES = ReportSchema([
+        Column('انبار', field='warehouse', width=24),
+        Column('تاریخ', field='day', type='shamsi', width=12),
+        Column('وزن', field='weight', type='int', highlight=lambda weight: weight < 0),
+        Column('مبلغ', field='amount', type='money', width=16, color='light_green'),
+    ], border_style='thin', banding=True, header_color='green')
+
+    report = StreamingReport('Sales', right_to_left=True)
+    SALES.create_header(report)
+    SALES.create_values(report, Sale.objects.values('warehouse', 'day', 'weight', 'amount'))
+    """
+
+    def __init__(self, columns, start_col=1, border_style=None, banding=False, m_color=None, header_color=None,
+                 header_height=None):
+        columns = list(columns)
+        if not columns:
+            raise ValueError("A schema needs at least one column")
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        with_field = [column.field is not None for column in columns]
+        if any(with_field) and not all(with_field):
+            raise ValueError("Either every column or no column must have a field")
+        self.columns = columns
+        self.start_col = start_col
+        self.border_style = border_style
+        self.banding = banding
+        self.m_color = m_color
+        self.header_color = header_color
+        self.header_height = header_height
+        self.fields = [column.field for column in columns] if all(with_field) else None
+
+    @property
+    def titles(self):
+        """
+        The header titles, in column order.
+        """
+        return [column.title for column in self.columns]
+
+    def index(self, name):
+        """
+        Return the sheet column number of the column with the title or field `name`.
+        """
+        for column_number, column in enumerate(self.columns, self.start_col):
+            if column.title == name or (column.field is not None and column.field == name):
+                return column_number
+        raise ValueError(f"The schema has no column {name!r}")
+
+    @timed
+    def create_header(self, target, row=1, freeze=True, layout=None):
+        """
+        Write the header row, styled like `create_header`, and set the column widths.
+
+        Parameters:
+        -----------
+        target : openpyxl.worksheet.worksheet.Worksheet or StreamingReport
+            Where to write. A `StreamingReport` appends the header after its current
+            row and ignores `row`.
+        row : int, optional
+            Row index of the header on a worksheet (default: 1).
+        freeze : bool, optional
+            Freeze the rows above the data and add an auto-filter from the header
+            (default: True).
+        layout : SheetLayout, optional
+            Record the widths, freeze panes and auto-filter on this layout, so
+            `layout.finish()` sizes the filter to the rows written afterwards. Not used
+            with a `StreamingReport`, which has its own layout.
+        """
+        titles = self.titles
+        start_col = self.start_col
+        if isinstance(target, StreamingReport):
+            if freeze and target._pending is None:
+                raise ValueError("Freeze panes must be set before the first data row is written")
+            target.create_header(titles, start_col=start_col, height=self.header_height, color=self.header_color,
+                                 border_style=self.border_style)
+            for column_number, column in enumerate(self.columns, start_col):
+                if column.width is not None:
+                    target._set_width(column_number, column.width)
+            if freeze:
+                target.worksheet.freeze_panes = f'A{target.row + 1}'
+                target.layout.auto_filter(target.row, start_col)
+            return
+
+        if row is None or row < 1:
+            raise ValueError("row must be a positive integer")
+        deferred = layout is not None
+        if not deferred:
+            layout = SheetLayout(target)
+        style = _header_style(get_style_registry(target.parent), self.header_color, None, self.border_style)
+        for column_number, column in enumerate(self.columns, start_col):
+            apply_style(target.cell(row=row, column=column_number, value=column.title), style)
+            if column.width is not None:
+                layout.set_column_width(column_number, column.width)
+        if self.header_height is not None:
+            layout.set_row_height(row, self.header_height)
+        if layout.auto_width:
+            layout.measure_row(start_col, titles)
+        if freeze:
+            layout.freeze(f'A{row + 1}')
+            layout.auto_filter(row, start_col)
+        if not deferred:
+            layout.finish()
+
+    def compile(self, target):
+        """
+        Resolve the styles of the schema for `target` and return a `RowWriter`.
+
+        Parameters:
+        -----------
+        target : openpyxl.worksheet.worksheet.Worksheet or StreamingReport
+            Where the rows will be written.
+        """
+        return RowWriter(self, target)
+
+    @timed
+    def create_values(self, target, rows, start_row=None, layout=None):
+        """
+        Write `rows` through a compiled `RowWriter`; see `RowWriter.write`.
+
+        Returns:
+        --------
+        int
+            The index of the row after the last written row.
+        """
+        return self.compile(target).write(rows, start_row, layout)
+
+    @timed
+    def add_chart(self, worksheet, chart_type, data_columns, category_column, start_row, end_row, chart_position,
+                  chart_title, x_axis_title=None, y_axis_title=None, **kwargs):
+        """
+        Add a chart of schema columns; see `add_chart` for the options.
+
+        `data_columns` (a name or a list of names) and `category_column` are column
+        titles or fields. The axis titles default to the titles of the category
+        column and of the first data column, and the series are named after the
+        column titles, so the header does not have to be read back.
+        """
+        names = [data_columns] if isinstance(data_columns, str) else list(data_columns)
+        columns = [self.index(name) for name in names]
+        titles = kwargs.pop('titles', None)
+        if titles is None:
+            titles = [self.columns[column - self.start_col].title for column in columns]
+        category = self.index(category_column)
+        if x_axis_title is None:
+            x_axis_title = self.columns[category - self.start_col].title
+        if y_axis_title is None:
+            y_axis_title = titles[0]
+        add_chart(worksheet, chart_type, columns, category, start_row, end_row, chart_position, chart_title,
+                  x_axis_title, y_axis_title, titles=titles, **kwargs)
+
+
+class RowWriter:
+    """
+    Row writer compiled from a `ReportSchema` for one worksheet or report.
+
+    Holds the resolved (plain, banded, highlighted) style of every column, the value
+    extraction for the schema fields and the list of columns needing a conversion or
+    a highlight test, so the loop over the rows does no per-cell style work.
+    Use `ReportSchema.compile()` to create it.
+    """
+
+    def __init__(self, schema, target):
+        self.schema = schema
+        self.target = target
+        self.fields = schema.fields
+        worksheet = target.worksheet if isinstance(target, StreamingReport) else target
+        registry = get_style_registry(worksheet.parent)
+        font = registry.font(size=10, bold=True)
+        border = registry.border(schema.border_style)
+        band_fill = registry.fill(schema.m_color) if schema.m_color else VERY_LIGHT_CREAM_CELL
+        self.plain, self.banded, self.highlighted = [], [], []
+        self.converters, self.highlights = [], []
+        for item, column in enumerate(schema.columns):
+            fill = registry.fill(column.color)
+            fills = (fill, fill if fill is not None else band_fill, registry.fill(column.highlight_color))
+            for styles, column_fill in zip((self.plain, self.banded, self.highlighted), fills):
+                styles.append(registry.style(font=font, fill=column_fill, border=border, alignment=Alignment_CELL,
+                                             number_format=column.number_format))
+            if column.type == 'shamsi':
+                self.converters.append((item, _shamsi))
+            elif column.type == 'locale':
+                self.converters.append((item, _locale))
+            if column.highlight is not None:
+                test = column.highlight
+                if not callable(test):
+                    test = _equals(test)
+                self.highlights.append((item, test))
+
+    def row(self, item, banded):
+        """
+        Return the (values, styles) of one row, a sequence or a dict/object holding the schema fields.
+
+        The highlight rules test the values before the conversions are applied. A
+        sequence shorter than the schema only fills its first columns, as with
+        `create_values`.
+        """
+        if self.fields is not None:
+            values = _row_values(item, self.fields)
+        elif self.converters:
+            values = list(item)
+        else:
+            values = item
+        styles = self.banded if banded else self.plain
+        width = len(values)
+        for index, test in self.highlights:
+            if index < width and test(values[index]):
+                if styles is self.plain or styles is self.banded:
+                    styles = list(styles)
+                styles[index] = self.highlighted[index]
+        for index, convert in self.converters:
+            if index < width:
+                values[index] = convert(values[index])
+        return values, styles
+
+    def write(self, rows, start_row=None, layout=None):
+        """
+        Write `rows` and return the index of the row after the last written row.
+
+        Parameters:
+        -----------
+        rows : iterable
+            Sequences of values in column order, or dicts/objects holding the schema
+            fields; consumed lazily.
+        start_row : int, optional
+            Row index of the first row on a worksheet (default: the row after the last
+            used one). A `StreamingReport` appends after its current row.
+        layout : SheetLayout, optional
+            Record the value widths on this layout when it fits columns automatically.
+            Not used with a `StreamingReport`.
+        """
+        target = self.target
+        schema = self.schema
+        banding = schema.banding
+        start_col = schema.start_col
+        if isinstance(target, StreamingReport):
+            target._start_body()
+            for item in rows:
+                target._make_room()
+                values, styles = self.row(item, banding and (target.row + 1) % 2 == 0)
+                target._append(values, styles, start_col, None)
+            return target.row + 1
+
+        if start_row is None:
+            start_row = target.max_row + 1 if target._cells else 1
+        if start_row < 1:
+            raise ValueError("start_row must be a positive integer")
+        cells = target._cells
+        add_cell = target._add_cell
+        measure_row = layout.measure_row if layout is not None and layout.auto_width else None
+        row_idx = start_row
+        for item in rows:
+            if row_idx > _MAX_ROW:
+                raise ValueError(f"Row numbers must be between 1 and {_MAX_ROW}. Row number supplied was {row_idx}")
+            values, styles = self.row(item, banding and row_idx % 2 == 0)
+            for column, value, style in zip(range(start_col, start_col + len(styles)), values, styles):
+                cell = cells.get((row_idx, column))
+                if cell is None:
+                    add_cell(Cell(target, row=row_idx, column=column, value=value, style_array=style))
+                else:
+                    if value is not None:
+                        cell.value = value
+                    apply_style(cell, style)
+            if measure_row is not None:
+                measure_row(start_col, values)
+            row_idx += 1
+        return row_idx
+
+
+def _shamsi(value):
+    if value is None:
+        return None
+    try:
+        return _jalali_str(value.year, value.month, value.day)
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid date format: {e}")
+
+
+def _locale(value):
+    return None if value is None else _to_locale_str(value)
+
+
+def _equals(expected):
+    def test(value):
+        return value == expected
+    return test
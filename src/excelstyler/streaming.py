@@ -0,0 +1,519 @@
+import queue
+import threading
+
+from openpyxl import Workbook
+from openpyxl.cell import Cell
+from openpyxl.utils import get_column_letter, quote_sheetname
+from openpyxl.worksheet.hyperlink import Hyperlink
+
+from .conditional import add_value_rules
+from .headers import _header_freez_styles, _header_freez_width, _header_style
+from .helpers import _description_style
+from .instrument import timed
+from .layout import SheetLayout
+from .registry import get_style_registry
+from .styles import Alignment_CELL
+from .tables import DEFAULT_TABLE_STYLE, _column_names, add_table
+from .values import _MAX_ROW, _NUMBER_TYPES, _ValuePlan, _value_style
+
+# Rows of an Excel worksheet; `StreamingReport` continues on a new sheet past it.
+EXCEL_MAX_ROWS = _MAX_ROW
+
+
+class StreamingReport:
+    """
+    Build a styled report row by row using openpyxl's write-only mode.
+
+    Rows are turned into cells and handed to the worksheet
+    writer as soon as they are produced, so memory use stays flat no matter how
+    many rows the report has. The styling options mirror `create_header` and
+    `create_value`.
+
+    Parameters:
+    -----------
+    title : str, optional
+        Title of the worksheet.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    max_rows : int, optional
+        Rows per sheet (default: `EXCEL_MAX_ROWS`, Excel's limit of 1,048,576). When a
+        sheet is full the report continues on a new sheet, 'Title (2)', 'Title (3)', ...,
+        that repeats the header rows, column widths, freeze panes and auto-filter.
+    index_title : str or None, optional
+        Title of the sheet added in front of the others when the report spans several
+        sheets, listing the rows held by each (default: 'Index'). None adds no index.
+
+    Notes:
+    ------
+    - Rows can only be appended; the row index is tracked by the report and restarts
+      on every continuation sheet.
+    - The header rows are the rows written before the first data row. Full sheets are
+      already on disk, so a rollover does not hold any of their rows in memory.
+    - A table (`create_table`) cannot continue on another sheet; a ValueError is raised
+      when it would.
+    - Header rows are held back until the first data row, because freeze panes and
+      column widths are written at the top of the sheet. `width` and freeze panes
+      therefore only take effect when given before the first `create_value(s)` call.
+    - The auto-filter of `create_header_freez` is sized to the data when saving.
+    - A write-only workbook can be saved once; no rows can be added afterwards.
+
+    Example:
+    --------
+    report = StreamingReport('Sales', right_to_left=True)
+    report.create_header(['Name', 'Amount'], color='green', width=20)
+    for m, row in enumerate(rows):
+        report.create_value(row, border_style='thin', m=m)
+    report.save('sales.xlsx')
+    """
+
+    def __init__(self, title=None, right_to_left=False, max_rows=EXCEL_MAX_ROWS, index_title='Index'):
+        if max_rows is None or not 1 < max_rows <= EXCEL_MAX_ROWS:
+            raise ValueError(f"max_rows must be between 2 and {EXCEL_MAX_ROWS}")
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(title)
+        if right_to_left:
+            self.worksheet.sheet_view.rightToLeft = True
+        self.registry = get_style_registry(self.workbook)
+        self.layout = SheetLayout(self.worksheet)
+        self.max_rows = max_rows
+        self.index_title = index_title
+        self.row = 0
+        self._written = 0
+        self._pending = []
+        # The header block repeated on continuation sheets: (rows, heights, merged cells).
+        self._header = None
+        # (title, first row, last row) of every sheet filled so far, once the report rolls over.
+        self._parts = []
+        self._index = None
+
+    @timed
+    def create_header(self, data, start_col=1, height=None, width=None, color=None, text_color=None,
+                      border_style=None):
+        """
+        Append a styled header row; see `create_header` for the styling options.
+        """
+        if data is None or not isinstance(data, list) or len(data) == 0:
+            raise ValueError("Data must be a non-empty list")
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        style = _header_style(self.registry, color, text_color, border_style)
+        if width is not None:
+            for col_num in range(start_col, start_col + len(data)):
+                self._set_width(col_num, width)
+        self._append(data, [style] * len(data), start_col, height)
+
+    @timed
+    def create_header_freez(self, data, start_col=1, height=None, width=None, len_with=None, different_cell=None,
+                            color=None, border_style=None):
+        """
+        Append a styled header row, freeze the sheet below it and add an auto-filter.
+
+        See `create_header_freez` for the styling options; the header goes on the next
+        row and the filter covers every data row written after it.
+        """
+        if data is None or not isinstance(data, list) or len(data) == 0:
+            raise ValueError("Data must be a non-empty list")
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        if self._pending is None:
+            raise ValueError("Freeze panes must be set before the first data row is written")
+        style, different_style = _header_freez_styles(self.registry, color, border_style)
+        styles = []
+        for col_num, option in enumerate(data, start_col):
+            styles.append(different_style if different_cell is not None and option == different_cell else style)
+            _header_freez_width(self.layout, col_num, option, height, width, len_with)
+        self._append(data, styles, start_col, height)
+        self.worksheet.freeze_panes = f'A{self.row + 1}'
+        self.layout.auto_filter(self.row)
+
+    @timed
+    def create_value(self, data, start_col=1, border_style=None, m=None, height=None, color=None, width=None,
+                     different_cell=None, different_value=None, item_num=None, item_color=None, m_color=None):
+        """
+        Append a row of values; see `create_value` for the styling options.
+        """
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        self._start_body()
+        styles = [
+            _value_style(self.registry, data, item, border_style, m, color, different_cell, different_value,
+                         item_num, item_color, m_color)
+            for item in range(len(data))
+        ]
+        if width is not None:
+            for item in range(len(data)):
+                self._set_width(item + start_col, width)
+        self._append(data, styles, start_col, height)
+
+    @timed
+    def create_values(self, rows, start_col=1, border_style=None, banding=False, height=None, color=None, width=None,
+                      different_cell=None, different_value=None, item_num=None, item_color=None, m_color=None,
+                      conditional=False):
+        """
+        Append a block of rows; see `create_values` for the styling options.
+
+        Banding follows the sheet row index, so even rows get the alternating fill.
+        """
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        first_row, columns = self._write_values(rows, start_col, border_style, banding, height, color, width,
+                                                different_cell, different_value, item_num, item_color, m_color,
+                                                conditional)
+        if conditional and first_row <= self.row:
+            add_value_rules(self.worksheet, first_row, self.row, start_col, start_col + columns - 1, banding,
+                            different_cell, different_value, item_num, item_color, color, m_color)
+
+    def _write_values(self, rows, start_col, border_style, banding, height, color, width, different_cell,
+                      different_value, item_num, item_color, m_color, conditional, block=None):
+        """
+        Write the rows of `create_values`; return the first row and the width of the rows still without rules.
+
+        With `conditional`, the rows of a sheet that fills up get their rules before the
+        report continues on a new sheet. `block` is the (first row, width) returned by an
+        earlier call, to continue a block written in several parts.
+        """
+        plan = _ValuePlan(self.registry, border_style, color, None if conditional else different_cell,
+                          different_value, item_num, item_color, m_color)
+        static_banding = banding and not conditional
+        first_row, columns = block if block is not None else (self.row + 1, 0)
+        number_types = _NUMBER_TYPES
+        for data in rows:
+            if width is not None and self._pending is not None:
+                for item in range(len(data)):
+                    self._set_width(item + start_col, width)
+            self._start_body()
+            if self.row >= self.max_rows:
+                # The block continues on a new sheet; each sheet gets rules for its own rows.
+                if conditional and first_row <= self.row:
+                    add_value_rules(self.worksheet, first_row, self.row, start_col,
+                                    start_col + max(columns, plan.width) - 1, banding, different_cell,
+                                    different_value, item_num, item_color, color, m_color)
+                self._rollover()
+                first_row = self.row + 1
+            pairs = plan.row(data, static_banding and (self.row + 1) % 2 == 0)
+            styles = [
+                pairs[item][1] if isinstance(value, number_types) and value != 0 else pairs[item][0]
+                for item, value in enumerate(data)
+            ]
+            self._append(data, styles, start_col, height)
+        return first_row, max(columns, plan.width)
+
+    @timed
+    def create_table(self, headers, rows, start_col=1, name=None, style=DEFAULT_TABLE_STYLE, banded_rows=True,
+                     banded_columns=False, number_format='#,###'):
+        """
+        Append a header and rows formatted as a native Excel Table; see `create_table`.
+
+        Only the values are written per cell; the table style provides the header,
+        banding and auto-filter.
+        """
+        if not headers:
+            raise ValueError("Headers must be a non-empty list")
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        headers = _column_names(headers)
+        self._append(headers, [None] * len(headers), start_col, None)
+        header_row = self.row
+        number_style = self.registry.style(number_format=number_format) if number_format is not None else None
+        self._start_body()
+        for data in rows:
+            if self.row >= self.max_rows:
+                raise ValueError("A table cannot continue on another sheet; it has more rows than max_rows allows")
+            styles = [
+                number_style if isinstance(value, _NUMBER_TYPES) and value != 0 else None
+                for value in data
+            ]
+            self._append(data, styles, start_col, None)
+        if self.row == header_row:
+            # A table needs at least one data row.
+            self._append([], [], start_col, None)
+        add_table(self.worksheet, headers, header_row, self.row, start_col, name, style, banded_rows,
+                  banded_columns)
+
+    @timed
+    def excel_description(self, description, start_col=1, end_col=None, size=None, color=None, my_color=None,
+                          height=None):
+        """
+        Append a description row; see `excel_description` for the styling options.
+
+        The description goes in `start_col` and, if `end_col` is given, is merged
+        across the columns up to `end_col`.
+        """
+        if start_col is None or start_col < 1:
+            raise ValueError("start_col must be a positive integer")
+        self._append([description], [_description_style(self.registry, size, color, my_color)], start_col, height)
+        if end_col is not None and end_col > start_col:
+            self.worksheet.merged_cells.add(
+                f'{get_column_letter(start_col)}{self.row}:{get_column_letter(end_col)}{self.row}'
+            )
+
+    @timed
+    def save(self, filename):
+        """
+        Save the workbook to `filename` (a path or a writable file object).
+        """
+        self._finish()
+        self._save_to(filename)
+
+    def iter_bytes(self, chunk_size=65536):
+        """
+        Save the workbook and yield the xlsx file as chunks of bytes.
+
+        The workbook is written by a background thread into a bounded queue, so at
+        most a few chunks are held in memory and the file is never assembled in full.
+        Suitable as the content of a Django `StreamingHttpResponse`.
+
+        Parameters:
+        -----------
+        chunk_size : int, optional
+            Approximate size of the yielded chunks in bytes (default: 65536).
+
+        Example:
+        --------
+        with open('report.xlsx', 'wb') as f:
+            for chunk in report.iter_bytes():
+                f.write(chunk)
+        """
+        self._finish()
+        pipe = _Pipe(chunk_size)
+        thread = threading.Thread(target=_save, args=(self, pipe), name='excelstyler-save', daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = pipe.queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+            if pipe.error is not None:
+                raise pipe.error
+        finally:
+            # Stops the writer if the consumer went away before the end of the file.
+            pipe.cancelled = True
+            thread.join()
+
+    def _finish(self):
+        """
+        Write the held-back rows, the recorded layout and, after a rollover, the index sheet before saving.
+        """
+        self._start_body()
+        self._close_sheet()
+        if self._parts and self._index is None:
+            self._parts.append((self.worksheet.title, len(self._header[0]) + 1, self.row))
+            if self.index_title is not None:
+                self._write_index()
+
+    def _save_to(self, file):
+        """
+        Write the xlsx file to `file` (a path or a writable file object).
+        """
+        self.workbook.save(file)
+
+    def _set_width(self, col_num, width):
+        if self._pending is not None:
+            self.layout.set_column_width(col_num, width)
+
+    def _start_body(self):
+        """
+        Write the held-back header rows; sheet-level settings are fixed from here on.
+        """
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            worksheet = self.worksheet
+            # Kept to be repeated at the top of continuation sheets.
+            heights = {row: worksheet.row_dimensions[row].height for row in range(1, len(pending) + 1)
+                       if row in worksheet.row_dimensions}
+            self._header = (pending, heights, [cell_range.coord for cell_range in worksheet.merged_cells])
+            for col_num, width in self.layout.column_widths.items():
+                worksheet.column_dimensions[get_column_letter(col_num)].width = width
+            for row in pending:
+                self._write(*row)
+
+    def _make_room(self):
+        """
+        Continue on a new sheet if the current one has `max_rows` rows.
+        """
+        if self.row >= self.max_rows and self._pending is None:
+            self._rollover()
+
+    def _rollover(self):
+        """
+        Close the full sheet and open a continuation sheet starting with the header rows of the first one.
+
+        The full sheet has already been written to its temporary file, so nothing of
+        it stays in memory.
+        """
+        rows, heights, merged = self._header
+        if len(rows) >= self.max_rows:
+            raise ValueError("max_rows leaves no room for data rows below the header rows")
+        self._close_sheet()
+        previous = self.worksheet
+        self._parts.append((previous.title, len(rows) + 1, self.row))
+        worksheet = self.worksheet = self.workbook.create_sheet(self._part_title(len(self._parts) + 1))
+        worksheet.sheet_view.rightToLeft = previous.sheet_view.rightToLeft
+        if previous.freeze_panes is not None:
+            worksheet.freeze_panes = previous.freeze_panes
+        layout = SheetLayout(worksheet)
+        layout.column_widths = dict(self.layout.column_widths)
+        layout.filter_start = self.layout.filter_start
+        self.layout = layout
+        self.row = 0
+        self._written = 0
+        self._open_sheet()
+        for col_num, width in layout.column_widths.items():
+            worksheet.column_dimensions[get_column_letter(col_num)].width = width
+        for cell_range in merged:
+            worksheet.merged_cells.add(cell_range)
+        for values, styles, start_col in rows:
+            self.row += 1
+            layout.max_column = max(layout.max_column, start_col + len(values) - 1)
+            if heights.get(self.row) is not None:
+                worksheet.row_dimensions[self.row].height = heights[self.row]
+            self._write(values, styles, start_col)
+        layout.max_row = self.row
+
+    def _part_title(self, number):
+        """
+        Return the title of continuation sheet `number`, e.g. 'Ledger (2)', within Excel's 31 characters.
+        """
+        suffix = f' ({number})'
+        title = self._parts[0][0][:31 - len(suffix)] + suffix
+        while title in self.workbook.sheetnames:
+            number += 1
+            suffix = f' ({number})'
+            title = self._parts[0][0][:31 - len(suffix)] + suffix
+        return title
+
+    def _close_sheet(self):
+        """
+        Apply the recorded layout to the current sheet; no rows are added to it afterwards.
+        """
+        self.layout.finish()
+
+    def _open_sheet(self):
+        """
+        Prepare the writer for a continuation sheet.
+        """
+
+    def _write_index(self):
+        """
+        Add a first sheet listing, for every sheet of the report, the data rows it holds.
+        """
+        worksheet = self._index = self.workbook.create_sheet(self.index_title)
+        # Make it the first sheet; write-only workbooks save their sheets in list order.
+        self.workbook._sheets.insert(0, self.workbook._sheets.pop())
+        if self.worksheet.sheet_view.rightToLeft:
+            worksheet.sheet_view.rightToLeft = True
+        registry = self.registry
+        header_style = _header_style(registry, None, None, 'thin')
+        style = registry.style(font=registry.font(size=10, bold=True), border=registry.border('thin'),
+                               alignment=Alignment_CELL)
+        number_style = registry.style(font=registry.font(size=10, bold=True), border=registry.border('thin'),
+                                      alignment=Alignment_CELL, number_format='#,##0')
+        for column, width in zip('ABCDE', (34, 14, 14, 14, 20)):
+            worksheet.column_dimensions[column].width = width
+        worksheet.append([Cell(worksheet, row=1, column=1, value=title, style_array=header_style)
+                          for title in ('Sheet', 'First row', 'Last row', 'Rows', 'Range')])
+        last = 0
+        for row_idx, (title, first_row, last_row) in enumerate(self._parts, 2):
+            count = last_row - first_row + 1
+            link = Cell(worksheet, row=row_idx, column=1, value=title, style_array=style)
+            link.hyperlink = Hyperlink(ref='', location=f"{quote_sheetname(title)}!A{first_row}")
+            worksheet.append([
+                link,
+                Cell(worksheet, row=row_idx, column=2, value=last + 1, style_array=number_style),
+                Cell(worksheet, row=row_idx, column=3, value=last + count, style_array=number_style),
+                Cell(worksheet, row=row_idx, column=4, value=count, style_array=number_style),
+                Cell(worksheet, row=row_idx, column=5, value=f'{first_row}:{last_row}', style_array=style),
+            ])
+            last += count
+
+    def _append(self, values, styles, start_col, height):
+        """
+        Add a row of values with their resolved styles (`StyleArray` or None) after the last row.
+        """
+        self._make_room()
+        self.row += 1
+        end_col = start_col + len(values) - 1
+        if end_col > self.layout.max_column:
+            self.layout.max_column = end_col
+        self.layout.max_row = self.row
+        if height is not None:
+            self.worksheet.row_dimensions[self.row].height = height
+        if self._pending is not None:
+            self._pending.append((list(values), styles, start_col))
+        else:
+            self._write(values, styles, start_col)
+
+    def _write(self, values, styles, start_col):
+        worksheet = self.worksheet
+        row = [None] * (start_col - 1)
+        row.extend(Cell(worksheet, row=1, column=1, value=value, style_array=style)
+                   for value, style in zip(values, styles))
+        worksheet.append(row)
+        self._written += 1
+        # The row has been serialised, drop its dimension so memory stays flat.
+        worksheet.row_dimensions.pop(self._written, None)
+
+
+class _Pipe:
+    """
+    Write-only file object that hands what is written to a reader through a bounded queue.
+
+    `zipfile` falls back to streaming mode for file objects that cannot seek or tell,
+    so the workbook can be saved straight into it.
+    """
+
+    def __init__(self, chunk_size, max_chunks=8):
+        self.queue = queue.Queue(max_chunks)
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.error = None
+        self.cancelled = False
+        self.discarding = False
+
+    def write(self, data):
+        if self.discarding:
+            # The reader went away and the writer was told; ignore the output of its clean-up.
+            return len(data)
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self._put(bytes(self.buffer))
+            self.buffer.clear()
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """
+        Send what is left in the buffer followed by the end-of-stream marker `None`.
+        """
+        try:
+            if self.buffer and self.error is None:
+                self._put(bytes(self.buffer))
+            self._put(None)
+        except OSError:
+            pass
+
+    def _put(self, item):
+        while not self.cancelled:
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        self.discarding = True
+        raise OSError("The reader of the stream went away")
+
+
+@timed(name='StreamingReport.iter_bytes')
+def _save(report, pipe):
+    """
+    Save `report` into `pipe`, recording an error for the reader, and close the pipe.
+    """
+    try:
+        report._save_to(pipe)
+    except BaseException as e:
+        pipe.error = e
+    finally:
+        pipe.close()
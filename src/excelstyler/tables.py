@@ -0,0 +1,169 @@
+import warnings
+
+from openpyxl.cell import Cell
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+
+from .instrument import timed
+from .registry import get_style_registry
+from .values import _MAX_ROW, _NUMBER_TYPES
+
+DEFAULT_TABLE_STYLE = 'TableStyleMedium2'
+
+
+@timed
+def add_table(worksheet, headers, start_row, end_row, start_col=1, name=None, style=DEFAULT_TABLE_STYLE,
+              banded_rows=True, banded_columns=False):
+    """
+    Wrap a written range in a native Excel Table.
+
+    Excel draws the header, the banded rows and the auto-filter of the table from
+    its table style, so none of the cells need a style of their own.
+
+    Parameters:
+    -----------
+    worksheet : openpyxl.worksheet.worksheet.Worksheet
+        The worksheet holding the range (write-only worksheets work too).
+    headers : list
+        The header titles, as written in `start_row`. Excel requires unique text
+        headers, so they are converted to strings and repeated titles get a suffix.
+    start_row : int
+        Row index of the header row.
+    end_row : int
+        Row index of the last data row.
+    start_col : int, optional
+        Column index of the first column (default: 1).
+    name : str, optional
+        Name of the table, unique in the workbook. Defaults to 'Table<n>'.
+    style : str, optional
+        Name of a built-in table style (default: 'TableStyleMedium2').
+    banded_rows : bool, optional
+        Alternate the row fill (default: True).
+    banded_columns : bool, optional
+        Alternate the column fill (default: False).
+
+    Returns:
+    --------
+    openpyxl.worksheet.table.Table
+        The added table.
+
+    Raises:
+    -------
+    ValueError
+        If `headers` is empty or the range is invalid.
+
+    Example:
+    --------
+    add_table(worksheet, ['Name', 'Amount'], start_row=3, end_row=100, style='TableStyleLight9')
+    """
+    if not headers:
+        raise ValueError("Headers must be a non-empty list")
+    if start_row is None or start_col is None or start_row < 1 or start_col < 1:
+        raise ValueError("start_row and start_col must be positive integers")
+    if end_row is None or end_row < start_row:
+        raise ValueError("end_row must not be before start_row")
+    # A table needs at least one data row, even if it is empty.
+    end_row = max(end_row, start_row + 1)
+    ref = f'{get_column_letter(start_col)}{start_row}:{get_column_letter(start_col + len(headers) - 1)}{end_row}'
+    table = Table(displayName=name or _table_name(worksheet.parent), ref=ref)
+    table.tableStyleInfo = TableStyleInfo(name=style, showRowStripes=banded_rows, showColumnStripes=banded_columns,
+                                          showFirstColumn=False, showLastColumn=False)
+    for column_id, title in enumerate(_column_names(headers), 1):
+        table.tableColumns.append(TableColumn(id=column_id, name=title))
+    table.autoFilter = AutoFilter(ref=ref)
+    with warnings.catch_warnings():
+        # openpyxl warns that write-only sheets need the table columns added by hand, which they are.
+        warnings.filterwarnings('ignore', message='In write-only mode')
+        worksheet.add_table(table)
+    return table
+
+
+@timed
+def create_table(worksheet, headers, rows, start_row=1, start_col=1, name=None, style=DEFAULT_TABLE_STYLE,
+                 banded_rows=True, banded_columns=False, number_format='#,###'):
+    """
+    Write a header and rows and format them as a native Excel Table.
+
+    Only the values are written per cell; the table style provides the header,
+    banding and auto-filter.
+
+    Parameters:
+    -----------
+    worksheet : openpyxl.worksheet.worksheet.Worksheet
+        The worksheet where the table will be created.
+    headers : list
+        The header titles.
+    rows : iterable of list
+        Rows of values; consumed lazily, so a generator can be passed.
+    start_row : int, optional
+        Row index of the header row (default: 1).
+    start_col : int, optional
+        Column index of the first column (default: 1).
+    name, style, banded_rows, banded_columns :
+        See `add_table`.
+    number_format : str, optional
+        Number format of non-zero numbers, as in `create_value` (default: '#,###').
+        `None` leaves numbers unformatted.
+
+    Returns:
+    --------
+    int
+        The index of the row after the table.
+
+    Example:
+    --------
+    next_row = create_table(worksheet, ['Name', 'Amount'], rows, start_row=3)
+    """
+    if not headers:
+        raise ValueError("Headers must be a non-empty list")
+    if start_row is None or start_col is None or start_row < 1 or start_col < 1:
+        raise ValueError("start_row and start_col must be positive integers")
+    headers = _column_names(headers)
+    for column, title in enumerate(headers, start_col):
+        worksheet.cell(row=start_row, column=column, value=title)
+    number_style = None
+    if number_format is not None:
+        number_style = get_style_registry(worksheet.parent).style(number_format=number_format)
+    add_cell = worksheet._add_cell
+    row_idx = start_row + 1
+    for data in rows:
+        if row_idx > _MAX_ROW:
+            raise ValueError(f"Row numbers must be between 1 and {_MAX_ROW}. Row number supplied was {row_idx}")
+        for column, value in enumerate(data, start_col):
+            cell_style = number_style if isinstance(value, _NUMBER_TYPES) and value != 0 else None
+            add_cell(Cell(worksheet, row=row_idx, column=column, value=value, style_array=cell_style))
+        row_idx += 1
+    add_table(worksheet, headers, start_row, row_idx - 1, start_col, name, style, banded_rows, banded_columns)
+    return max(row_idx, start_row + 2)
+
+
+def _column_names(headers):
+    """
+    Return `headers` as unique strings, suffixing repeated titles with ' 2', ' 3', ...
+
+    Empty titles become 'Column<n>', as Excel names them.
+    """
+    names = []
+    seen = set()
+    for column_id, title in enumerate(headers, 1):
+        title = f'Column{column_id}' if title is None or title == '' else str(title)
+        name = title
+        count = 1
+        while name.lower() in seen:
+            count += 1
+            name = f'{title} {count}'
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _table_name(workbook):
+    """
+    Return the first 'Table<n>' name not used by a table of `workbook`.
+    """
+    used = {name.lower() for worksheet in workbook.worksheets for name in getattr(worksheet, 'tables', {})}
+    number = len(used) + 1
+    while f'table{number}' in used:
+        number += 1
+    return f'Table{number}'
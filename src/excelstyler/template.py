@@ -0,0 +1,215 @@
+import os
+from copy import copy, deepcopy
+
+from openpyxl import Workbook
+from openpyxl.styles.differential import DifferentialStyleList
+from openpyxl.utils.indexed_list import IndexedList
+
+from .instrument import _track, timed
+from .layout import SheetLayout
+from .registry import StyleRegistry
+from .xmlwriter import XmlReport, _report_class
+
+# Style tables of a workbook, copied for every report made from a template.
+_INDEXED_TABLES = (
+    '_fonts', '_fills', '_borders', '_alignments', '_protections', '_number_formats', '_cell_styles',
+    'shared_strings',
+)
+
+
+class ReportTemplate:
+    """
+    Build the skeleton of a report once and hand out ready-made copies of it.
+
+    Most of the cost of a small export is setting up the same report every time:
+    creating the workbook and its style tables, resolving the fonts, fills and
+    borders of the title and header, sizing the columns and freezing the header.
+    A template runs `build` once on a `StreamingReport` (or `XmlReport`) and keeps
+    the result; `new_report()` returns a report in the same state by copying the
+    workbook style tables, the resolved styles and the held-back title and header
+    rows, so each request only writes its data rows.
+
+    Parameters:
+    -----------
+    build : callable
+        Called once as `build(report, *args)` to write the title and header rows,
+        e.g. with `excel_description` and `create_header_freez`.
+    *args :
+        Extra arguments passed to `build`.
+    title : str, optional
+        Title of the worksheet of the reports.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    backend : str, optional
+        'openpyxl' to make `StreamingReport`s (default) or 'xml' to make `XmlReport`s.
+
+    Notes:
+    ------
+    - `build` can only write rows that come before the data: once a data row is
+      written the report can no longer be copied, and a ValueError is raised.
+    - The reports get the held-back rows, row heights, column widths, merged cells,
+      freeze panes, auto-filter, sheet view (right-to-left, zoom, ...) and sheet
+      state of the template. Other worksheet settings, such as page setup, must be
+      made on each report.
+    - The template is not changed by `new_report()`, so one template can be shared
+      by all requests and threads.
+
+    Example:
+    --------
+    def sales_header(report, headers):
+        report.excel_description('گزارش فروش', end_col=len(headers), size=14, height=25)
+        report.create_header_freez(headers, color='green', border_style='thin', width=18)
+
+    SALES = ReportTemplate(sales_header, HEADERS, title='Sales', right_to_left=True)
+
+    def export(request):
+        report = SALES.new_report()
+        report.create_values(load_rows(request), border_style='thin', banding=True)
+        return StreamingHttpResponse(report.iter_bytes(), content_type=XLSX_CONTENT_TYPE)
+    """
+
+    def __init__(self, build, *args, title=None, right_to_left=False, backend='openpyxl'):
+        skeleton = _report_class(backend)(title, right_to_left=right_to_left)
+        try:
+            build(skeleton, *args)
+        finally:
+            # The skeleton is never saved; only its copies are.
+            _discard(skeleton)
+        if skeleton._pending is None:
+            raise ValueError("A template can only hold the rows written before the data rows; "
+                             "write the data rows to the reports made by new_report()")
+        worksheet = skeleton.worksheet
+        if worksheet._charts or worksheet._images or worksheet.tables or worksheet.conditional_formatting:
+            raise ValueError("Charts, images, tables and conditional formats cannot be part of a template")
+        self.skeleton = skeleton
+
+    @timed
+    def new_report(self, title=None):
+        """
+        Return a new report holding the rows and settings written by `build`.
+
+        Parameters:
+        -----------
+        title : str, optional
+            Title of the worksheet (default: the title of the template).
+
+        Returns:
+        --------
+        StreamingReport or XmlReport
+            A report ready for its data rows; the next row written is the one after
+            the template rows.
+        """
+        skeleton = self.skeleton
+        report = skeleton.__class__.__new__(skeleton.__class__)
+        report.workbook = _copy_workbook(skeleton.workbook)
+        report.worksheet = _copy_worksheet(skeleton.worksheet, report.workbook, title)
+        report.registry = _copy_registry(skeleton.registry, report.workbook)
+        report.layout = _copy_layout(skeleton.layout, report.worksheet)
+        report.max_rows = skeleton.max_rows
+        report.index_title = skeleton.index_title
+        report.row = skeleton.row
+        report._written = 0
+        report._pending = list(skeleton._pending)
+        report._header = None
+        report._parts = []
+        report._index = None
+        if isinstance(report, XmlReport):
+            report._style_ids = dict(skeleton._style_ids)
+            report._style_refs = list(skeleton._style_refs)
+            report._strings = dict(skeleton._strings)
+            report._columns = list(skeleton._columns)
+        report._open_sheet()
+        return report
+
+
+def _discard(report):
+    """
+    Remove the temporary files of a report that will not be saved.
+    """
+    if isinstance(report, XmlReport):
+        report._rows_file.close()
+    worksheet = report.worksheet
+    if worksheet._writer is not None:
+        worksheet.close()
+        os.remove(worksheet._writer.out)
+
+
+def _copy_indexed(items):
+    """
+    Copy an `IndexedList` without hashing its items again.
+    """
+    result = IndexedList()
+    list.extend(result, items)
+    result._dict = dict(items._dict)
+    result.clean = items.clean
+    return result
+
+
+def _copy_workbook(workbook):
+    """
+    Return a workbook without sheets sharing the settings and style tables of `workbook`.
+
+    `Workbook()` builds and hashes its default styles, which costs more than copying
+    the tables of a workbook that already has them. Style objects are immutable once
+    they are in a table, so the copies share them; everything the writers or saving
+    change is copied.
+    """
+    result = Workbook.__new__(Workbook)
+    result.__dict__.update(workbook.__dict__)
+    for name in _INDEXED_TABLES:
+        setattr(result, name, _copy_indexed(getattr(workbook, name)))
+    result._named_styles = copy(workbook._named_styles)
+    result._differential_styles = DifferentialStyleList(dxf=list(workbook._differential_styles.dxf))
+    result._date_formats = dict(workbook._date_formats)
+    result._timedelta_formats = dict(workbook._timedelta_formats)
+    result._sheets = []
+    result._pivots = []
+    result._external_links = []
+    result.defined_names = copy(workbook.defined_names)
+    result.custom_doc_props = copy(workbook.custom_doc_props)
+    result.properties = copy(workbook.properties)
+    result.views = [copy(view) for view in workbook.views]
+    result.__dict__.pop('_excelstyler_registry', None)
+    return result
+
+
+def _copy_worksheet(worksheet, workbook, title):
+    """
+    Add a sheet to `workbook` with the view, merged cells and row heights of `worksheet`.
+    """
+    result = workbook.create_sheet(worksheet.title if title is None else title)
+    result.views = deepcopy(worksheet.views)
+    result.sheet_state = worksheet.sheet_state
+    for cell_range in worksheet.merged_cells:
+        result.merged_cells.add(cell_range.coord)
+    for row, dimension in worksheet.row_dimensions.items():
+        if dimension.height is not None:
+            result.row_dimensions[row].height = dimension.height
+    return result
+
+
+def _copy_registry(registry, workbook):
+    """
+    Return a registry for `workbook` that already knows the styles resolved by `registry`.
+
+    The resolved index arrays stay valid because the style tables were copied in order.
+    """
+    _track(workbook)
+    result = workbook._excelstyler_registry = StyleRegistry(workbook)
+    result._fonts = dict(registry._fonts)
+    result._fills = dict(registry._fills)
+    result._borders = dict(registry._borders)
+    result._styles = dict(registry._styles)
+    return result
+
+
+def _copy_layout(layout, worksheet):
+    result = SheetLayout(worksheet, layout.auto_width, layout.min_width, layout.max_width, layout.padding)
+    result.content_widths = dict(layout.content_widths)
+    result.freeze_cell = layout.freeze_cell
+    result.filter_start = layout.filter_start
+    result.max_row = layout.max_row
+    result.max_column = layout.max_column
+    result.row_heights = dict(layout.row_heights)
+    result.column_widths = dict(layout.column_widths)
+    return result
@@ -1,3 +1,7 @@
+from . import instrument
+from .instrument import timed
+
+
 def to_locale_str(a):
     """
     Convert a number to a string with thousands separators.
@@ -22,6 +26,13 @@ def to_locale_str(a):
     >>> to_locale_str(1234567)
     '1,234,567'
     """
+    # Called once per value, so instrumentation is checked inline instead of through `timed`.
+    if instrument._active is not None:
+        return instrument._call('to_locale_str', _to_locale_str, a)
+    return _to_locale_str(a)
+
+
+def _to_locale_str(a):
     if a is None:
         raise ValueError("Input cannot be None")
     
@@ -29,3 +40,92 @@ def to_locale_str(a):
         return "{:,}".format(int(a))
     except (ValueError, TypeError) as e:
         raise ValueError(f"Cannot convert '{a}' to a number: {e}")
+
+
+PERSIAN_DIGITS = '۰۱۲۳۴۵۶۷۸۹'
+
+
+@timed
+def to_locale_strs(values, decimals=None, separator=',', decimal_point='.', persian_digits=False):
+    """
+    Format a whole column of numbers with thousands separators in one call.
+
+    Parameters:
+    -----------
+    values : iterable
+        Numbers to format: a list, a NumPy array, a pandas Series, or any iterable of
+        int, float or `decimal.Decimal` values.
+    decimals : int or None, optional
+        Number of decimal places, rounded. If None (default), values are truncated to
+        integers exactly like `to_locale_str`.
+    separator : str, optional
+        Thousands separator (default: ',').
+    decimal_point : str, optional
+        Decimal point (default: '.').
+    persian_digits : bool, optional
+        Write the digits as Persian digits (۰-۹).
+
+    Returns:
+    --------
+    list of str
+        The formatted values, in order. Missing values (`None`, NaN) stay `None`.
+
+    Raises:
+    -------
+    ValueError
+        If a value cannot be converted to a number.
+
+    Notes:
+    ------
+    - The format and the translation to the requested separators and digits are
+      built once per call; arrays are converted to Python numbers in one step.
+
+    Example:
+    --------
+    >>> to_locale_strs([1234567, 1234.5, None], decimals=1, separator='٬', decimal_point='٫', persian_digits=True)
+    ['۱٬۲۳۴٬۵۶۷٫۰', '۱٬۲۳۴٫۵', None]
+    """
+    if decimals is None:
+        template = '{:,}'.format
+    else:
+        template = ('{:,.%df}' % decimals).format
+    table = _translation(separator, decimal_point, persian_digits)
+
+    if getattr(getattr(values, 'dtype', None), 'kind', None) in ('i', 'u'):
+        # Integer arrays have no missing values and need no conversion per element.
+        texts = list(map(template, values.tolist()))
+        return texts if table is None else [text.translate(table) for text in texts]
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+
+    result = []
+    for value in values:
+        if value is None or value != value:
+            result.append(None)
+            continue
+        try:
+            text = template(int(value)) if decimals is None else template(value)
+        except (ValueError, TypeError, OverflowError) as e:
+            raise ValueError(f"Cannot convert '{value}' to a number: {e}")
+        result.append(text.translate(table) if table is not None else text)
+    return result
+
+
+_TRANSLATIONS = {}
+
+
+def _translation(separator, decimal_point, persian_digits):
+    """
+    Return the cached `str.translate` table for the options, or None if nothing changes.
+    """
+    key = (separator, decimal_point, persian_digits)
+    if key not in _TRANSLATIONS:
+        mapping = {}
+        if separator != ',':
+            mapping[','] = separator
+        if decimal_point != '.':
+            mapping['.'] = decimal_point
+        if persian_digits:
+            mapping.update(zip('0123456789', PERSIAN_DIGITS))
+        _TRANSLATIONS[key] = str.maketrans(mapping) if mapping else None
+    return _TRANSLATIONS[key]
@@ -1,7 +1,24 @@
-from datetime import datetime
+import sys
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache
 
 import jdatetime
 
+from . import instrument
+from .instrument import timed
+
+# Formats tried by `convert_str_to_date`, in order.
+_DATE_FORMATS = ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d')
+
+ParsedDates = namedtuple('ParsedDates', ['dates', 'invalid'])
+
+# Day number of 1970-01-01 in the Gregorian day count used by `_jalali_fields`.
+_EPOCH_DAY = 1075195
+# Raised for timezone-aware datetime columns, which NumPy would silently convert to UTC.
+_TIMEZONE_ERROR = ("Excel does not support timezones in datetimes. Convert the column with "
+                   "`.dt.tz_localize(None)` (local time) or `.dt.tz_convert(None)` (UTC) first.")
+
 
 def shamsi_date(date, in_value=None):
     """
@@ -35,30 +52,126 @@ def shamsi_date(date, in_value=None):
     Setting `in_value=True` is useful when you want to write the date directly
     into Excel cell values, while `in_value=False` is for formatted text display.
     """
+    # Called once per value, so instrumentation is checked inline instead of through `timed`.
+    if instrument._active is not None:
+        return instrument._call('shamsi_date', _shamsi_date, date, in_value)
+    return _shamsi_date(date, in_value)
+
+
+def _shamsi_date(date, in_value):
     if date is None:
         raise ValueError("Date cannot be None")
     
     try:
         if in_value:
-            sh_date = jdatetime.date.fromgregorian(
-                year=date.year,
-                month=date.month,
-                day=date.day
-            )
+            sh_date = _jalali_date(date.year, date.month, date.day)
         else:
-            miladi_date = jdatetime.date.fromgregorian(
-                year=date.year,
-                month=date.month,
-                day=date.day
-            ).strftime('%Y-%m-%d')
-            reversed_date = reversed(miladi_date.split("-"))
-            separate = "-"
-            sh_date = separate.join(reversed_date)
+            sh_date = _jalali_str(date.year, date.month, date.day)
         return sh_date
     except (ValueError, AttributeError) as e:
         raise ValueError(f"Invalid date format: {e}")
 
 
+@lru_cache(maxsize=8192)
+def _jalali_date(year, month, day):
+    return jdatetime.date.fromgregorian(year=year, month=month, day=day)
+
+
+@lru_cache(maxsize=8192)
+def _jalali_str(year, month, day):
+    miladi_date = _jalali_date(year, month, day).strftime('%Y-%m-%d')
+    reversed_date = reversed(miladi_date.split("-"))
+    separate = "-"
+    return separate.join(reversed_date)
+
+
+@timed
+def shamsi_dates(dates, in_value=None):
+    """
+    Convert a whole column of Gregorian dates to Shamsi (Persian) dates.
+
+    Parameters:
+    -----------
+    dates : iterable
+        `datetime.date`/`datetime.datetime` values, or a NumPy `datetime64` array
+        (a pandas datetime Series or index works too).
+    in_value : bool, optional
+        Same as in `shamsi_date`: `jdatetime.date` objects if True, 'DD-MM-YYYY'
+        strings otherwise.
+
+    Returns:
+    --------
+    list
+        The converted dates, in order. Missing values (`None`, `NaT`) stay `None`.
+
+    Raises:
+    -------
+    ValueError
+        If a value is not a valid date.
+    TypeError
+        If `dates` is a timezone-aware pandas column.
+
+    Notes:
+    ------
+    - Conversions are memoized per day, so a column with few distinct dates only
+      pays for each date once.
+    - `datetime64` input is converted with vectorized Jalali arithmetic, one
+      conversion per distinct day, without calling jdatetime per element.
+
+    Example:
+    --------
+    >>> shamsi_dates([date(2023, 3, 21), None])
+    ['01-01-1402', None]
+    """
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and getattr(getattr(dates, 'dtype', None), 'kind', None) == 'M':
+        if getattr(dates.dtype, 'tz', None) is not None:
+            raise TypeError(_TIMEZONE_ERROR)
+        return _shamsi_datetime64(numpy, numpy.asarray(dates), in_value)
+
+    convert = _jalali_date if in_value else _jalali_str
+    result = []
+    for value in dates:
+        if value is None:
+            result.append(None)
+            continue
+        try:
+            result.append(convert(value.year, value.month, value.day))
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"Invalid date format: {e}")
+    return result
+
+
+def _jalali_fields(numpy, days):
+    """
+    Return Jalali (year, month, day) arrays for an int64 array of day numbers.
+    """
+    year = -1595 + 33 * (days // 12053)
+    days = days % 12053
+    year += 4 * (days // 1461)
+    days = days % 1461
+    over = days > 365
+    year += numpy.where(over, (days - 1) // 365, 0)
+    days = numpy.where(over, (days - 1) % 365, days)
+    first_half = days < 186
+    month = numpy.where(first_half, 1 + days // 31, 7 + (days - 186) // 30)
+    day = numpy.where(first_half, 1 + days % 31, 1 + (days - 186) % 30)
+    return year, month, day
+
+
+def _shamsi_datetime64(numpy, values, in_value):
+    days = values.astype('datetime64[D]')
+    missing = numpy.isnat(days)
+    unique, inverse = numpy.unique(days[~missing].astype('int64'), return_inverse=True)
+    years, months, day_numbers = _jalali_fields(numpy, unique + _EPOCH_DAY)
+    if in_value:
+        converted = [jdatetime.date(y, m, d) for y, m, d in zip(years.tolist(), months.tolist(), day_numbers.tolist())]
+    else:
+        converted = [f'{d:02d}-{m:02d}-{y}' for y, m, d in zip(years.tolist(), months.tolist(), day_numbers.tolist())]
+    present = iter([converted[i] for i in inverse.ravel().tolist()])
+    return [None if is_missing else next(present) for is_missing in missing.ravel().tolist()]
+
+
 def convert_str_to_date(string):
     """
     Convert a string to a datetime.date object.
@@ -83,14 +196,104 @@ def convert_str_to_date(string):
     - 'YYYY-MM-DDTHH:MM:SSZ'      (ISO 8601 without milliseconds)
     - 'YYYY-MM-DD'                 (Simple date)
     """
-    string = str(string).strip()
-    try:
-        return datetime.strptime(string, '%Y-%m-%dT%H:%M:%S.%fZ').date()
-    except ValueError:
+    # Called once per value, so instrumentation is checked inline instead of through `timed`.
+    if instrument._active is not None:
+        return instrument._call('convert_str_to_date', _convert_str_to_date, string)
+    return _convert_str_to_date(string)
+
+
+def _convert_str_to_date(string):
+    return _parse_date(str(string).strip())[0]
+
+
+@timed
+def convert_str_to_dates(strings):
+    """
+    Convert a column of date strings to datetime.date objects.
+
+    Accepts the same formats as `convert_str_to_date`. The format is detected
+    from the first value that parses and then reused: values matching it are
+    parsed by slicing the fixed-width fields directly, and only values that do
+    not match fall back to trying every format with `strptime`.
+
+    Parameters:
+    -----------
+    strings : iterable
+        The date strings to convert.
+
+    Returns:
+    --------
+    ParsedDates
+        A `(dates, invalid)` named tuple: the list of datetime.date objects, with
+        None where a value could not be parsed, and the number of such values.
+
+    Example:
+    --------
+    >>> dates, invalid = convert_str_to_dates(['2023-03-21T10:30:45Z', 'oops'])
+    >>> dates, invalid
+    ([datetime.date(2023, 3, 21), None], 1)
+    """
+    dates = []
+    invalid = 0
+    detected = None
+    for value in strings:
+        string = str(value).strip()
+        parsed = None if detected is None else _slice_date(string, detected)
+        if parsed is None:
+            parsed, fmt = _parse_date(string)
+            if parsed is None:
+                invalid += 1
+            else:
+                detected = fmt
+        dates.append(parsed)
+    return ParsedDates(dates, invalid)
+
+
+def _parse_date(string):
+    """
+    Try every supported format; return (date, format) or (None, None).
+    """
+    for fmt in _DATE_FORMATS:
         try:
-            return datetime.strptime(string, '%Y-%m-%dT%H:%M:%SZ').date()
+            return datetime.strptime(string, fmt).date(), fmt
         except ValueError:
-            try:
-                return datetime.strptime(string, '%Y-%m-%d').date()
-            except ValueError:
-                return None
+            pass
+    return None, None
+
+
+def _slice_date(string, fmt):
+    """
+    Parse `string` by position if it has exactly the shape of `fmt`, else return None.
+    """
+    length = len(string)
+    if length < 10 or string[4] != '-' or string[7] != '-':
+        return None
+    if fmt == _DATE_FORMATS[2]:
+        if length != 10:
+            return None
+    elif fmt == _DATE_FORMATS[1]:
+        if length != 20 or string[19] != 'Z' or not _valid_time(string):
+            return None
+    elif (length < 22 or length > 27 or string[19] != '.' or string[-1] != 'Z'
+          or not _ascii_digits(string[20:-1]) or not _valid_time(string)):
+        return None
+    if not _ascii_digits(string[0:4] + string[5:7] + string[8:10]):
+        return None
+    try:
+        return date(int(string[0:4]), int(string[5:7]), int(string[8:10]))
+    except ValueError:
+        return None
+
+
+def _valid_time(string):
+    """
+    Check the 'THH:MM:SS' part of an ISO timestamp the way strptime would.
+    """
+    if string[10] != 'T' or string[13] != ':' or string[16] != ':':
+        return False
+    return (_ascii_digits(string[11:13] + string[14:16] + string[17:19]) and int(string[11:13]) <= 23
+            and int(string[14:16]) <= 59 and int(string[17:19]) <= 59)
+
+
+def _ascii_digits(string):
+    return string.isascii() and string.isdigit()
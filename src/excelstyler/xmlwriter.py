@@ -0,0 +1,297 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE, ERROR_CODES, _TYPES, get_time_format, get_type
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS, BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE, is_date_format
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+from .streaming import EXCEL_MAX_ROWS, StreamingReport
+
+# How openpyxl's writers render the rows of a sheet without rows.
+_EMPTY_SHEET_DATA = (b'<sheetData></sheetData>', b'<sheetData />', b'<sheetData/>')
+_INFINITIES = (float('inf'), float('-inf'))
+# Escaped cell fragments of repeated strings are reused up to this many distinct strings.
+_STRING_CACHE_SIZE = 65536
+
+
+class XmlReport(StreamingReport):
+    """
+    `StreamingReport` that writes the sheet XML directly instead of building cells.
+
+    openpyxl creates, type-checks and serialises a `Cell` object for every value, even
+    in write-only mode. This backend turns each row straight into SpreadsheetML text:
+    style indices come from the workbook style table through a per-style cache, and
+    the XML of repeated strings is cached, so a cell costs a few string operations.
+    Everything outside the rows (sheet views and freeze panes, column widths,
+    auto-filter, merged description cells, conditional formats, tables, styles.xml
+    and the package) is still written by openpyxl.
+
+    The API is the one of `StreamingReport`, so it can be used as a drop-in
+    replacement, and the file it produces is byte-for-byte the file
+    `StreamingReport` produces for the same calls.
+
+    Parameters:
+    -----------
+    title : str, optional
+        Title of the worksheet.
+    right_to_left : bool, optional
+        Display the sheet right-to-left (useful for Persian/Farsi reports).
+    max_rows : int, optional
+        Rows per sheet before continuing on a new sheet; see `StreamingReport`.
+    index_title : str or None, optional
+        Title of the index sheet added when the report spans several sheets.
+
+    Notes:
+    ------
+    - Values can be strings, numbers, booleans, dates/times and `None`, like the
+      values excelstyler writes; rich text and formula objects are not supported.
+    - Strings are written inline, as openpyxl does.
+
+    Example:
+    --------
+    report = XmlReport('Sales', right_to_left=True)
+    report.excel_description('گزارش فروش', end_col=4, size=14)
+    report.create_header_freez(headers, color='green')
+    report.create_values(rows, border_style='thin', banding=True)
+    report.save('sales.xlsx')
+    """
+
+    def __init__(self, title=None, right_to_left=False, max_rows=EXCEL_MAX_ROWS, index_title='Index'):
+        super().__init__(title, right_to_left, max_rows, index_title)
+        self._style_ids = {}
+        self._style_refs = []
+        self._strings = {}
+        self._columns = []
+        self._open_sheet()
+
+    def _write(self, values, styles, start_col):
+        row_idx = self._written + 1
+        height = self.worksheet.row_dimensions.pop(row_idx, None)
+        self._render(row_idx, height.height if height is not None else None, values, styles, start_col)
+        self._written = row_idx
+
+    def _render(self, row_idx, height, values, styles, start_col):
+        """
+        Write row `row_idx` as SpreadsheetML to the rows file.
+        """
+        if height is not None:
+            parts = [f'<row r="{row_idx}" ht="{height:.16g}" customHeight="1">']
+        else:
+            parts = [f'<row r="{row_idx}">']
+        columns = self._columns
+        last_column = start_col + len(values) - 1
+        if last_column > len(columns):
+            columns.extend(get_column_letter(column) for column in range(len(columns) + 1, last_column + 1))
+        style_ids = self._style_ids
+        strings = self._strings
+        suffix = f'{row_idx}"'
+        for column, (value, style) in enumerate(zip(values, styles), start_col - 1):
+            index = style_ids.get(id(style)) if style is not None else 0
+            if index is None:
+                index = self._style_id(style)
+            value_type = type(value)
+            if value_type is str:
+                fragment = strings.get(value)
+                if fragment is None:
+                    fragment = self._string_fragment(value)
+            elif value_type is int or value_type is float:
+                fragment = _number_fragment(value)
+            elif value is None:
+                if not index:
+                    continue
+                fragment = ' t="n" />'
+            else:
+                fragment, index = self._other_fragment(value, style, index)
+            if index:
+                parts.append(f'<c r="{columns[column]}{suffix} s="{index}"{fragment}')
+            else:
+                parts.append(f'<c r="{columns[column]}{suffix}{fragment}')
+        parts.append('</row>')
+        self._rows_file.write(''.join(parts))
+
+    def _style_id(self, style):
+        """
+        Return the index of `style` in the workbook's cell style table (`s` attribute).
+        """
+        index = self.workbook._cell_styles.add(style) if any(style) else 0
+        self._style_ids[id(style)] = index
+        # Keep the style alive so its id cannot be reused by another object.
+        self._style_refs.append(style)
+        return index
+
+    def _string_fragment(self, value):
+        """
+        Return the cell XML after the `s` attribute for a string, as openpyxl writes it.
+        """
+        value = value[:32767]
+        if next(ILLEGAL_CHARACTERS_RE.finditer(value), None):
+            raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+        if value == '':
+            fragment = ' t="inlineStr" />'
+        elif len(value) > 1 and value.startswith('='):
+            fragment = f'><f>{_escape(value[1:])}</f><v /></c>'
+        elif value in ERROR_CODES:
+            fragment = f' t="e"><v>{_escape(value)}</v></c>'
+        elif value.strip() != value:
+            fragment = f' t="inlineStr"><is><t xml:space="preserve">{_escape(value)}</t></is></c>'
+        else:
+            fragment = f' t="inlineStr"><is><t>{_escape(value)}</t></is></c>'
+        if len(self._strings) < _STRING_CACHE_SIZE:
+            self._strings[value] = fragment
+        return fragment
+
+    def _other_fragment(self, value, style, index):
+        """
+        Return (cell XML after the `s` attribute, style index) for values other than str, int and float.
+        """
+        value_type = type(value)
+        data_type = _TYPES.get(value_type) or get_type(value_type, value)
+        if data_type == 'n':
+            return _number_fragment(value), index
+        if data_type == 'b':
+            return f' t="b"><v>{int(value)}</v></c>', index
+        if data_type == 'd':
+            if getattr(value, 'tzinfo', None) is not None:
+                raise TypeError("Excel does not support timezones in datetimes. "
+                                "The tzinfo in the datetime/time object must be set to None.")
+            return _number_fragment(to_excel(value, self.workbook.epoch)), self._date_style_id(style, value_type)
+        if data_type == 's' and isinstance(value, bytes):
+            return self._string_fragment(value.decode('utf-8')), index
+        raise ValueError("Cannot convert {0!r} to Excel".format(value))
+
+    def _date_style_id(self, style, value_type):
+        """
+        Return the style index of a date cell: `style` with a date format unless it has one.
+        """
+        key = (id(style), value_type)
+        index = self._style_ids.get(key)
+        if index is None:
+            workbook = self.workbook
+            array = StyleArray(style) if style is not None else StyleArray()
+            if array.numFmtId < BUILTIN_FORMATS_MAX_SIZE:
+                number_format = BUILTIN_FORMATS.get(array.numFmtId, 'General')
+            else:
+                number_format = workbook._number_formats[array.numFmtId - BUILTIN_FORMATS_MAX_SIZE]
+            if not is_date_format(number_format):
+                number_format = get_time_format(value_type)
+                if number_format in BUILTIN_FORMATS_REVERSE:
+                    array.numFmtId = BUILTIN_FORMATS_REVERSE[number_format]
+                else:
+                    array.numFmtId = workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+            index = self._style_ids[key] = workbook._cell_styles.add(array)
+        return index
+
+    def _close_sheet(self):
+        super()._close_sheet()
+        if self._rendered:
+            return
+        self._rendered = True
+        worksheet = self.worksheet
+        # With no rows appended, openpyxl renders everything around an empty sheetData.
+        worksheet.close()
+        skeleton_path = worksheet._writer.out
+        with open(skeleton_path, 'rb') as skeleton:
+            content = skeleton.read()
+        os.remove(skeleton_path)
+        empty = next(marker for marker in _EMPTY_SHEET_DATA if marker in content)
+        top, tail = content.split(empty, 1)
+        handle, path = tempfile.mkstemp(suffix='.xml', prefix='excelstyler-')
+        writer = _RenderedWriter(path, worksheet._writer._rels)
+        with os.fdopen(handle, 'wb') as out, self._rows_file as rows:
+            out.write(top)
+            out.write(b'<sheetData>')
+            rows.seek(0)
+            shutil.copyfileobj(rows.buffer, out, 1 << 20)
+            out.write(b'</sheetData>')
+            out.write(tail)
+        worksheet._writer = writer
+
+    def _open_sheet(self):
+        super()._open_sheet()
+        # Removed by the system once closed, so an abandoned report leaves no file behind.
+        self._rows_file = tempfile.TemporaryFile('w+', encoding='utf-8', newline='', buffering=1 << 20,
+                                                 suffix='.xml', prefix='excelstyler-')
+        self._rendered = False
+
+    def _save_to(self, file):
+        try:
+            super()._save_to(file)
+        finally:
+            # Saving removes each sheet file once it is in the package; a failed or cancelled save
+            # removes the others now instead of when the report is garbage collected.
+            for worksheet in self.workbook.worksheets:
+                writer = worksheet._writer
+                if isinstance(writer, _RenderedWriter):
+                    writer.cleanup()
+                elif writer is not None and not worksheet.closed:
+                    # A sheet written by openpyxl, such as the index sheet.
+                    worksheet.close()
+                    writer.cleanup()
+
+
+class _RenderedWriter:
+    """
+    Stands in for openpyxl's worksheet writer of a sheet rendered by a worker.
+
+    The rendered file `out` is removed by `cleanup()`, or when the writer is garbage
+    collected if the workbook is never saved.
+    """
+
+    def __init__(self, out, rels):
+        self.out = out
+        self._rels = rels
+        self._remove = weakref.finalize(self, _remove_file, out)
+
+    def write_rows(self):
+        pass
+
+    def write_tail(self):
+        pass
+
+    def close(self):
+        pass
+
+    def cleanup(self):
+        self._remove()
+
+
+def _remove_file(path):
+    """
+    Remove the file `path` if it still exists.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _report_class(backend):
+    """
+    Return the report class of a backend name: 'openpyxl' (`StreamingReport`) or 'xml' (`XmlReport`).
+    """
+    if backend == 'openpyxl':
+        return StreamingReport
+    if backend == 'xml':
+        return XmlReport
+    raise ValueError(f"Unknown backend {backend!r}; expected 'openpyxl' or 'xml'")
+
+
+def _escape(text):
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _number_fragment(value):
+    if value != value or value in _INFINITIES:
+        return ' t="n"><v /></c>'
+    return ' t="n"><v>%.16g</v></c>' % value
@@ -0,0 +1,201 @@
+import asyncio
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from openpyxl import load_workbook
+
+from excelstyler.aio import AsyncReport, astream_xlsx
+from excelstyler.streaming import StreamingReport
+
+
+async def fetch(count, delay=0):
+    for i in range(1, count + 1):
+        await asyncio.sleep(delay)
+        yield [f'name {i}', i * 10]
+
+
+async def collect(chunks):
+    return b''.join([chunk async for chunk in chunks])
+
+
+def rows_of(data):
+    worksheet = load_workbook(io.BytesIO(data)).active
+    return [[cell.value for cell in row] for row in worksheet.iter_rows()]
+
+
+class TestAsyncReport:
+    """Test cases for AsyncReport."""
+
+    def test_same_rows_as_streaming_report(self):
+        """Test an async source produces the same values and styles as StreamingReport."""
+        async def build():
+            report = AsyncReport('Sales', batch_size=7)
+            await report.excel_description('Sales', end_col=2)
+            await report.create_header_freez(['Name', 'Amount'], color='green')
+            await report.create_values(fetch(30), border_style='thin', banding=True, different_cell=1,
+                                       different_value=50)
+            await report.create_value(['total', 4650])
+            return await collect(report.iter_bytes())
+
+        expected = StreamingReport('Sales')
+        expected.excel_description('Sales', end_col=2)
+        expected.create_header_freez(['Name', 'Amount'], color='green')
+        expected.create_values(([f'name {i}', i * 10] for i in range(1, 31)), border_style='thin', banding=True,
+                               different_cell=1, different_value=50)
+        expected.create_value(['total', 4650])
+        buffer = io.BytesIO()
+        expected.save(buffer)
+        actual = load_workbook(io.BytesIO(asyncio.run(build()))).active
+        worksheet = load_workbook(buffer).active
+
+        assert [[cell.value for cell in row] for row in actual.iter_rows()] == \
+               [[cell.value for cell in row] for row in worksheet.iter_rows()]
+        for row in (3, 4, 7, 33):
+            assert actual.cell(row, 2).fill.start_color.rgb == worksheet.cell(row, 2).fill.start_color.rgb
+        assert actual.freeze_panes == 'A3'
+        assert actual.auto_filter.ref == 'A2:B33'
+
+    def test_writes_overlap_fetching(self):
+        """Test rows are written in the executor while later rows are fetched, two batches at most."""
+        threads = set()
+        behind = []
+
+        async def build():
+            report = AsyncReport(batch_size=10, executor=ThreadPoolExecutor(1))
+            write = report.report.create_values
+
+            def create_values(rows, **kwargs):
+                threads.add(threading.get_ident())
+                write(rows, **kwargs)
+
+            report.report.create_values = create_values
+
+            async def source():
+                async for row in fetch(100, delay=0.001):
+                    behind.append(row[1] // 10 - 1 - report.row)
+                    yield row
+
+            await report.create_values(source())
+            await report.save(io.BytesIO())
+            return report.row
+
+        assert asyncio.run(build()) == 100
+        assert threading.get_ident() not in threads
+        assert max(behind) < 20
+        assert min(behind) >= 0
+
+    def test_conditional_rules_added_once(self):
+        """Test conditional banding covers all the batches with one rule."""
+        async def build():
+            report = AsyncReport(batch_size=4)
+            await report.create_values(fetch(10), banding=True, conditional=True)
+            return [str(rule.sqref) for rule in report.report.worksheet.conditional_formatting], \
+                await collect(report.iter_bytes())
+
+        ranges, data = asyncio.run(build())
+
+        assert ranges == ['A1:B10']
+        assert rows_of(data)[9] == ['name 10', 100]
+
+    @pytest.mark.parametrize('backend', ['openpyxl', 'xml'])
+    def test_conditional_rules_per_sheet(self, backend):
+        """Test every sheet of a report that rolls over gets the rules of its own rows."""
+        async def build():
+            report = AsyncReport('T', batch_size=7, backend=backend, max_rows=20)
+            await report.create_header(['Name', 'Amount'])
+            await report.create_values(fetch(30), banding=True, different_cell=1, different_value=250,
+                                       conditional=True)
+            return await collect(report.iter_bytes())
+
+        workbook = load_workbook(io.BytesIO(asyncio.run(build())))
+
+        assert workbook.sheetnames == ['Index', 'T', 'T (2)']
+        for title, ranges in (('T', ['A2:B20']), ('T (2)', ['A2:B12'])):
+            worksheet = workbook[title]
+            assert [str(rules.sqref) for rules in worksheet.conditional_formatting] == ranges
+            assert [rule.formula[0] for rule in list(worksheet.conditional_formatting)[0].rules] == [
+                '$B2=250', 'MOD(ROW(),2)=0']
+        assert workbook['T (2)'].cell(12, 1).value == 'name 30'
+
+    def test_source_error_is_raised(self):
+        """Test an error of the source is raised after the written batches are finished."""
+        async def broken():
+            yield ['a', 1]
+            raise RuntimeError('connection lost')
+
+        async def build():
+            report = AsyncReport(batch_size=1)
+            try:
+                await report.create_values(broken())
+            finally:
+                await report.save(io.BytesIO())
+
+        with pytest.raises(RuntimeError, match='connection lost'):
+            asyncio.run(build())
+
+    def test_invalid_batch_size(self):
+        """Test a batch size below one raises ValueError."""
+        with pytest.raises(ValueError):
+            AsyncReport(batch_size=0)
+
+    def test_consumer_stops_early(self):
+        """Test the writer stops when the byte stream is closed before the end."""
+        async def build():
+            report = AsyncReport()
+            await report.create_values(([str(i) * 50, i] for i in range(20000)))
+            chunks = report.iter_bytes(1024)
+            first = await chunks.__anext__()
+            await chunks.aclose()
+            return first
+
+        assert asyncio.run(build())[:2] == b'PK'
+
+    def test_stalled_consumers_do_not_block_the_executor(self):
+        """Test downloads that stop reading do not hold the executor threads the other reports use."""
+        async def stall(executor):
+            report = AsyncReport(executor=executor)
+            await report.create_values(([str(i) * 50, i] for i in range(20000)))
+            chunks = report.iter_bytes(1024)
+            await chunks.__anext__()
+            return chunks
+
+        async def build():
+            executor = ThreadPoolExecutor(2)
+            streams = []
+            try:
+                for _ in range(3):
+                    streams.append(await asyncio.wait_for(stall(executor), timeout=10))
+                report = AsyncReport(executor=executor)
+                await report.create_values(fetch(3))
+                buffer = io.BytesIO()
+                await asyncio.wait_for(report.save(buffer), timeout=10)
+            finally:
+                for chunks in streams:
+                    await chunks.aclose()
+                executor.shutdown()
+            return buffer.getvalue()
+
+        assert rows_of(asyncio.run(build())) == [['name 1', 10], ['name 2', 20], ['name 3', 30]]
+
+
+class TestAstreamXlsx:
+    """Test cases for astream_xlsx function."""
+
+    def test_dict_rows(self):
+        """Test exporting dict rows picked by fields."""
+        async def records():
+            for i in range(3):
+                yield {'name': f'n{i}', 'amount': i}
+
+        data = asyncio.run(collect(astream_xlsx(records(), ['Name', 'Amount'], fields=['name', 'amount'],
+                                                header_color='green', backend='xml')))
+
+        assert rows_of(data) == [['Name', 'Amount'], ['n0', 0], ['n1', 1], ['n2', 2]]
+
+    def test_plain_iterable(self):
+        """Test a plain iterable is accepted as well."""
+        data = asyncio.run(collect(astream_xlsx([[1, 2], [3, 4]])))
+
+        assert rows_of(data) == [[1, 2], [3, 4]]
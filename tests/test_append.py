@@ -0,0 +1,147 @@
+import gc
+import io
+import tempfile
+import zipfile
+from copy import copy
+from datetime import date
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excelstyler.append import AppendReport
+from excelstyler.streaming import StreamingReport
+from excelstyler.tables import create_table
+from excelstyler.values import create_values
+from excelstyler.xmlwriter import XmlReport
+
+ROWS = [[f'item {j}', j, j * 1.5] for j in range(12)]
+
+
+def build_report(report_class, rows, path):
+    report = report_class('Sales', right_to_left=True)
+    report.excel_description('گزارش فروش', end_col=3, size=14, height=25)
+    report.create_header_freez(['Name', 'Qty', 'Amount'], color='green', border_style='thin', width=18)
+    report.create_values(rows, border_style='thin', banding=True, different_cell=1, different_value=5)
+    report.save(path)
+
+
+def entries(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist() if name != 'docProps/core.xml'}
+
+
+def cells(worksheet):
+    return [[(cell.value, copy(cell.font), copy(cell.fill), copy(cell.border), cell.number_format) for cell in row]
+            for row in worksheet.iter_rows()]
+
+
+class TestAppendReport:
+    """Test cases for AppendReport."""
+
+    @pytest.mark.parametrize('report_class', [StreamingReport, XmlReport])
+    def test_same_file_as_building_in_one_go(self, report_class, tmp_path):
+        """Test appending rows in two runs saves the file built with all the rows at once."""
+        build_report(report_class, ROWS, tmp_path / 'full.xlsx')
+        path = tmp_path / 'month.xlsx'
+        build_report(report_class, ROWS[:5], path)
+        report = AppendReport(path)
+        report.create_values(ROWS[5:9], border_style='thin', banding=True, different_cell=1, different_value=5)
+        report.save()
+        report = AppendReport(path, 'Sales')
+        report.create_values(ROWS[9:], border_style='thin', banding=True, different_cell=1, different_value=5)
+        report.save()
+
+        assert entries(path) == entries(tmp_path / 'full.xlsx')
+
+    def test_ranges_extended(self, tmp_path):
+        """Test the dimension, auto-filter, conditional formats and tables grow with the appended rows."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        create_table(worksheet, ['Name', 'Qty', 'Amount'], ROWS[:5], start_col=5, name='Stock')
+        create_values(worksheet, ROWS[:6], start_row=1, banding=True, conditional=True)
+        worksheet.auto_filter.ref = 'A1:C6'
+        worksheet['J2'] = 'note'
+        path = tmp_path / 'ranges.xlsx'
+        workbook.save(path)
+        report = AppendReport(path)
+        report.create_values(ROWS[6:], start_col=1)
+        report.save()
+        worksheet = load_workbook(path).active
+
+        assert report.row == 12
+        assert worksheet.dimensions == 'A1:J12'
+        assert worksheet.auto_filter.ref == 'A1:C12'
+        assert [str(rules.sqref) for rules in worksheet.conditional_formatting] == ['A1:C12']
+        assert worksheet.tables['Stock'].ref == 'E1:G12'
+        assert worksheet.tables['Stock'].autoFilter.ref == 'E1:G12'
+        assert worksheet.cell(12, 1).value == 'item 11'
+
+    def test_new_styles(self, tmp_path):
+        """Test styles missing from the file are added without changing the styles of the existing cells."""
+        build_report(XmlReport, ROWS[:5], tmp_path / 'month.xlsx')
+        before = cells(load_workbook(tmp_path / 'month.xlsx')['Sales'])
+        report = AppendReport(tmp_path / 'month.xlsx')
+        report.create_value(['total', 10, date(2024, 3, 20)], border_style='double', color='red', height=30)
+        report.save()
+        worksheet = load_workbook(tmp_path / 'month.xlsx')['Sales']
+
+        assert cells(worksheet)[:-1] == before
+        assert worksheet.cell(8, 1).fill.start_color.index == '00FCDFDC'
+        assert worksheet.cell(8, 1).border.left.style == 'double'
+        assert worksheet.cell(8, 3).value.date() == date(2024, 3, 20)
+        assert worksheet.row_dimensions[8].height == 30
+
+    def test_unchanged_entries_copied(self, tmp_path):
+        """Test entries other than the sheet are copied as they are, and styles.xml when no style is new."""
+        path = tmp_path / 'month.xlsx'
+        build_report(StreamingReport, ROWS[:5], path)
+        before = entries(path)
+        report = AppendReport(path)
+        report.create_values(ROWS[5:], border_style='thin', banding=True)
+        report.save(tmp_path / 'copy.xlsx')
+        after = entries(tmp_path / 'copy.xlsx')
+
+        assert entries(path) == before
+        assert [name for name in before if before[name] != after[name]] == [
+            'xl/worksheets/sheet1.xml', 'xl/workbook.xml',
+        ]
+
+    def test_iter_bytes_and_empty_sheet(self, tmp_path):
+        """Test a sheet without rows starts at row 1 and the file can be streamed."""
+        workbook = Workbook()
+        workbook.create_sheet('Empty')
+        workbook.save(tmp_path / 'empty.xlsx')
+        report = AppendReport(tmp_path / 'empty.xlsx', 'Empty')
+        report.create_header(['Name', 'Qty'], color='green')
+        report.create_values(ROWS[:2])
+        worksheet = load_workbook(io.BytesIO(b''.join(report.iter_bytes())))['Empty']
+
+        assert [[cell.value for cell in row] for row in worksheet.iter_rows()] == [
+            ['Name', 'Qty', None], ['item 0', 0, 0], ['item 1', 1, 1.5],
+        ]
+
+    def test_unsupported(self, tmp_path):
+        """Test unknown sheets and content other than data rows are rejected."""
+        build_report(XmlReport, ROWS[:2], tmp_path / 'month.xlsx')
+        with pytest.raises(ValueError, match="does not exist"):
+            AppendReport(tmp_path / 'month.xlsx', 'Missing')
+        report = AppendReport(tmp_path / 'month.xlsx')
+        with pytest.raises(ValueError, match="Conditional rules cannot be added"):
+            report.create_values(ROWS, conditional=True)
+        with pytest.raises(ValueError, match="Tables cannot be added"):
+            report.create_table(['a'], [[1]])
+        with pytest.raises(ValueError, match="Descriptions cannot be added"):
+            report.excel_description('title')
+        with pytest.raises(ValueError, match="Freeze panes must be set"):
+            report.create_header_freez(['a'])
+
+    def test_unsaved_report_leaves_no_files(self, tmp_path, monkeypatch):
+        """Test the rows of a report that is never saved are not left in temporary files."""
+        build_report(XmlReport, ROWS[:2], tmp_path / 'month.xlsx')
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        report = AppendReport(tmp_path / 'month.xlsx')
+        report.create_values(ROWS)
+        del report
+        gc.collect()
+
+        assert [path.name for path in tmp_path.iterdir()] == ['month.xlsx']
@@ -0,0 +1,54 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+RUNNER = os.path.join(BENCHMARKS, 'run.py')
+
+
+def load_runner():
+    spec = importlib.util.spec_from_file_location('benchmark_run', RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkRunner:
+    """Test cases for the benchmark runner."""
+
+    def test_save_and_compare(self, tmp_path):
+        """Test a saved baseline holds the three numbers and can be compared against."""
+        baseline = tmp_path / 'baseline.json'
+        command = [sys.executable, RUNNER, '--rows', '20', '--cases', 'xml', 'shamsi_date']
+        subprocess.run(command + ['--save', str(baseline)], check=True, capture_output=True)
+        results = json.loads(baseline.read_text())['results']
+
+        assert set(results) == {'xml/narrow/20', 'xml/wide/20', 'xml/banded/20', 'xml/bordered/20',
+                                'xml/persian/20', 'shamsi_date/persian/20'}
+        assert results['xml/narrow/20']['rows_per_sec'] > 0
+        assert results['xml/narrow/20']['peak_mb'] > 0
+        assert results['xml/narrow/20']['file_bytes'] > 0
+        assert results['shamsi_date/persian/20']['file_bytes'] == 0
+
+        completed = subprocess.run(command + ['--shapes', 'persian', '--compare', str(baseline),
+                                              '--threshold', '1000'], capture_output=True, text=True)
+        assert completed.returncode == 0
+        assert 'xml/persian/20' in completed.stdout
+
+    def test_regressions(self):
+        """Test slower, larger and hungrier results are reported as regressions."""
+        runner = load_runner()
+        base = {'rows_per_sec': 1000.0, 'peak_mb': 50.0, 'file_bytes': 1000}
+        results = {
+            'same': dict(base),
+            'slow': dict(base, rows_per_sec=800.0),
+            'big': dict(base, peak_mb=60.0, file_bytes=1200),
+            'new': dict(base),
+        }
+        baseline = {'same': base, 'slow': base, 'big': base}
+
+        regressions = runner.compare(results, baseline, threshold=0.10)
+
+        assert regressions == [('slow', ['slower']), ('big', ['more memory', 'larger file'])]
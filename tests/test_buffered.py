@@ -0,0 +1,143 @@
+import io
+import zipfile
+
+import pytest
+from openpyxl import load_workbook
+
+from excelstyler.buffered import BufferedReport
+from excelstyler.xmlwriter import XmlReport
+
+ROWS = [[f'item {j}', j, j * 1.5] for j in range(500)]
+
+
+def build_report(report):
+    report.excel_description('گزارش فروش', end_col=3, size=14, height=25)
+    report.create_header_freez(['Name', 'Qty', 'Amount'], color='green', border_style='thin', width=18)
+    report.create_values(ROWS, border_style='thin', banding=True, different_cell=1, different_value=5)
+    report.create_value(['Total', None, 375], border_style='double', color='red', height=30)
+
+
+def package(report):
+    buffer = io.BytesIO()
+    report.save(buffer)
+    archive = zipfile.ZipFile(buffer)
+    return {name: archive.read(name) for name in archive.namelist() if name != 'docProps/core.xml'}
+
+
+def load(report):
+    buffer = io.BytesIO()
+    report.save(buffer)
+    return load_workbook(buffer)
+
+
+class TestBufferedReport:
+    """Test cases for BufferedReport."""
+
+    @pytest.mark.parametrize('memory_budget', [1024, 50000, None])
+    def test_same_file_as_xml_report(self, memory_budget):
+        """Test the rows replayed from memory and from the spill file save the file of XmlReport."""
+        expected = XmlReport('Sales', right_to_left=True)
+        build_report(expected)
+        if memory_budget is None:
+            report = BufferedReport('Sales', right_to_left=True)
+        else:
+            report = BufferedReport('Sales', right_to_left=True, memory_budget=memory_budget)
+        build_report(report)
+
+        assert (report._spill_file is not None) == (memory_budget is not None)
+        assert report._buffered <= report.memory_budget
+        assert package(report) == package(expected)
+
+    def test_write_over_earlier_rows(self):
+        """Test reserved rows, headers and spilled rows can be written after the data."""
+        report = BufferedReport('Sales', memory_budget=1024)
+        title = report.reserve_rows()
+        totals = report.reserve_rows(2)
+        report.create_header_freez(['Name', 'Qty', 'Amount'], color='green')
+        report.create_values(ROWS, border_style='thin')
+        report.excel_description('Sales', end_col=3, size=14, row=title)
+        report.create_value(['Total', sum(row[1] for row in ROWS)], border_style='double', row=totals, height=30)
+        report.create_value(['Average'], start_col=2, row=totals + 1)
+        report.create_header(['Item'], color='red', row=4)
+        report.create_value([0], start_col=3, row=5)
+        report.create_value([-1], start_col=3, row=5)
+        worksheet = load(report)['Sales']
+
+        assert report._spill_file is None and report._overrides == {}
+        assert worksheet.cell(1, 1).value == 'Sales'
+        assert 'A1:C1' in worksheet.merged_cells
+        assert [cell.value for cell in worksheet[2]] == ['Total', 124750, None]
+        assert worksheet.cell(2, 1).border.left.style == 'double'
+        assert worksheet.row_dimensions[2].height == 30
+        assert worksheet.cell(3, 2).value == 'Average'
+        assert [cell.value for cell in worksheet[4]] == ['Item', 'Qty', 'Amount']
+        assert worksheet.cell(4, 1).fill.start_color.index == '00FCDFDC'
+        assert worksheet.cell(4, 2).fill.start_color.index == '0000B050'
+        assert [cell.value for cell in worksheet[5]] == ['item 0', 0, -1]
+        assert worksheet.freeze_panes == 'A5'
+        assert worksheet.max_row == 504
+
+    def test_write_over_held_back_rows(self):
+        """Test rows before the first data row can be written over before they are written."""
+        report = BufferedReport('Sales')
+        report.reserve_rows()
+        report.create_header_freez(['Name', 'Qty'], width=20)
+        report.excel_description('Sales', row=1, height=25)
+        report.create_header(['Item'], row=2)
+        report.create_header_freez(['Code'], start_col=3)
+        report.create_values(ROWS[:2])
+        worksheet = load(report)['Sales']
+
+        assert worksheet.cell(1, 1).value == 'Sales'
+        assert worksheet.row_dimensions[1].height == 25
+        assert [cell.value for cell in worksheet[2]] == ['Item', 'Qty', None]
+        assert worksheet.cell(3, 3).value == 'Code'
+        assert worksheet.column_dimensions['B'].width == 20
+        assert worksheet.freeze_panes == 'A4'
+
+    def test_rollover(self):
+        """Test each continuation sheet is replayed before the next one starts."""
+        report = BufferedReport('Sales', memory_budget=1024, max_rows=200)
+        report.create_header(['Name', 'Qty', 'Amount'])
+        report.create_values(ROWS)
+        report.create_value(['Total'], row=2)
+        workbook = load(report)
+
+        assert workbook.sheetnames == ['Index', 'Sales', 'Sales (2)', 'Sales (3)']
+        assert workbook['Sales'].cell(2, 1).value == 'item 0'
+        assert workbook['Sales (3)'].cell(1, 1).value == 'Name'
+        assert workbook['Sales (3)'].cell(2, 1).value == 'Total'
+        assert workbook['Sales (3)'].max_row == 103
+
+    def test_header_written_over_is_repeated(self):
+        """Test header and reserved rows written over after the data started are repeated on later sheets."""
+        report = BufferedReport('Sales', max_rows=200)
+        title = report.reserve_rows()
+        report.create_header(['Name', 'Qty', 'Amount'])
+        report.create_values(ROWS[:100])
+        report.excel_description('Sales', end_col=3, height=25, row=title)
+        report.create_header(['Item'], color='red', row=2)
+        report.create_values(ROWS[100:])
+        workbook = load(report)
+
+        assert workbook.sheetnames == ['Index', 'Sales', 'Sales (2)', 'Sales (3)']
+        for name in workbook.sheetnames[1:]:
+            worksheet = workbook[name]
+            assert worksheet.cell(1, 1).value == 'Sales'
+            assert 'A1:C1' in worksheet.merged_cells
+            assert worksheet.row_dimensions[1].height == 25
+            assert [cell.value for cell in worksheet[2]] == ['Item', 'Qty', 'Amount']
+            assert worksheet.cell(2, 1).fill.start_color.index == '00FCDFDC'
+
+    def test_invalid_arguments(self):
+        """Test rows outside the sheet and invalid budgets are rejected."""
+        with pytest.raises(ValueError, match="memory_budget"):
+            BufferedReport(memory_budget=0)
+        report = BufferedReport()
+        report.create_values(ROWS[:2])
+        with pytest.raises(ValueError, match="row must be between 1 and 2"):
+            report.create_value(['x'], row=3)
+        with pytest.raises(ValueError, match="count must be"):
+            report.reserve_rows(0)
+        report.create_value(['x'], row=2)
+        assert report.row == 2
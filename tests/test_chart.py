@@ -1,7 +1,10 @@
+import io
+
 import pytest
 import openpyxl
 from openpyxl import Workbook
-from excelstyler.chart import add_chart
+from excelstyler import StreamingReport
+from excelstyler.chart import add_chart, lttb_indices, minmax_indices
 
 
 class TestAddChart:
@@ -104,3 +107,119 @@ class TestAddChart:
         chart = self.worksheet._charts[0]
         assert chart.width == 30
         assert chart.height == 20
+
+
+class TestChartSeriesAndDownsampling:
+    """Test cases for multi-series charts and downsampling in add_chart."""
+
+    def setup_method(self):
+        """Set up a long two-series range."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.worksheet.append(["Day", "Sales", "Cost"])
+        for day in range(5000):
+            self.worksheet.append([day, (day * 37) % 101, day % 13])
+
+    def test_multiple_series(self):
+        """Test one series per data column, titled from the header row."""
+        add_chart(self.worksheet, 'line', [2, 3], 1, 2, 5001, "E2", "Chart", "Day", "Amount")
+
+        chart = self.worksheet._charts[0]
+        assert [series.val.numRef.f for series in chart.series] == ["'Sheet'!$B$2:$B$5001", "'Sheet'!$C$2:$C$5001"]
+        assert [series.tx.strRef.f for series in chart.series] == ["'Sheet'!B1", "'Sheet'!C1"]
+        assert self.workbook.sheetnames == ["Sheet"]
+
+    def test_lttb_helper_sheet(self):
+        """Test LTTB writes at most max_points rows to a hidden sheet the chart points at."""
+        add_chart(self.worksheet, 'line', [2, 3], 1, 2, 5001, "E2", "Chart", "Day", "Amount",
+                  downsample='lttb', max_points=200)
+
+        helper = self.workbook["ChartData1"]
+        assert helper.sheet_state == 'hidden'
+        assert [cell.value for cell in helper[1]] == ['', 'Sales', 'Cost']
+        assert 3 <= helper.max_row - 1 <= 200
+        assert helper.cell(2, 1).value == 0
+        assert helper.cell(helper.max_row, 1).value == 4999
+        for row in helper.iter_rows(min_row=2, values_only=True):
+            assert row[1] == (row[0] * 37) % 101
+        chart = self.worksheet._charts[0]
+        assert chart.series[0].val.numRef.f == f"'ChartData1'!$B$2:$B${helper.max_row}"
+
+    def test_minmax_keeps_extremes(self):
+        """Test min/max bucketing keeps every bucket's lowest and highest value."""
+        values = [0] * 1000
+        values[123] = 50
+        values[877] = -50
+
+        kept = minmax_indices(values, 10)
+
+        assert 123 in kept and 877 in kept
+        assert kept[0] == 0 and kept[-1] == 999
+        assert len(kept) <= 10
+
+    @pytest.mark.parametrize('method', ['lttb', 'minmax'])
+    @pytest.mark.parametrize('max_points', [100, 4])
+    def test_union_of_series_within_max_points(self, method, max_points):
+        """Test the points kept for several series add up to at most max_points rows, end points included."""
+        add_chart(self.worksheet, 'line', [2, 3], 1, 2, 5001, "E2", "Chart", "Day", "Amount",
+                  downsample=method, max_points=max_points)
+
+        helper = self.workbook["ChartData1"]
+        assert helper.max_row - 1 <= max_points
+        assert helper.cell(2, 1).value == 0
+        assert helper.cell(helper.max_row, 1).value == 4999
+
+    def test_lttb_shape(self):
+        """Test LTTB keeps the peak of a spike and the end points, skipping missing values."""
+        values = [1.0] * 1000
+        values[500] = 100.0
+        values[10] = None
+
+        kept = lttb_indices(values, 50)
+
+        assert len(kept) == 50
+        assert 500 in kept and 10 not in kept
+        assert kept[0] == 0 and kept[-1] == 999
+        assert kept == sorted(kept)
+
+    def test_short_range_is_not_downsampled(self):
+        """Test ranges shorter than max_points are charted in place."""
+        add_chart(self.worksheet, 'bar', 2, 1, 2, 101, "E2", "Chart", "Day", "Amount", downsample='minmax')
+
+        assert self.workbook.sheetnames == ["Sheet"]
+
+    def test_write_only_worksheet(self):
+        """Test downsampling a write-only sheet from the given values, with titles."""
+        report = StreamingReport('Report')
+        report.create_header(['Day', 'Sales'])
+        report.create_values([day, day % 7] for day in range(3000))
+        values = {1: list(range(3000)), 2: [day % 7 for day in range(3000)]}
+        add_chart(report.worksheet, 'line', 2, 1, 2, 3001, "D2", "Chart", "Day", "Sales",
+                  downsample='minmax', max_points=100, values=values, titles=['Sales'])
+        buffer = io.BytesIO()
+        report.save(buffer)
+        workbook = openpyxl.load_workbook(buffer)
+
+        assert workbook.sheetnames == ['Report', 'ChartData1']
+        helper = workbook['ChartData1']
+        assert helper.sheet_state == 'hidden'
+        assert helper.cell(1, 2).value == 'Sales'
+        assert helper.max_row <= 101
+
+    def test_write_only_needs_values(self):
+        """Test downsampling a write-only sheet without values raises ValueError."""
+        report = StreamingReport('Report')
+        report.create_values([day, day] for day in range(2000))
+
+        with pytest.raises(ValueError, match="values="):
+            add_chart(report.worksheet, 'line', 2, 1, 1, 2000, "D2", "Chart", "Day", "Sales", downsample='lttb')
+        report.save(io.BytesIO())
+
+    def test_invalid_options(self):
+        """Test unknown methods, empty columns and mismatched titles raise ValueError."""
+        with pytest.raises(ValueError):
+            add_chart(self.worksheet, 'line', 2, 1, 2, 5001, "E2", "C", "X", "Y", downsample='mean')
+        with pytest.raises(ValueError):
+            add_chart(self.worksheet, 'line', [], 1, 2, 5001, "E2", "C", "X", "Y")
+        with pytest.raises(ValueError):
+            add_chart(self.worksheet, 'line', [2, 3], 1, 2, 5001, "E2", "C", "X", "Y", titles=['Sales'])
@@ -0,0 +1,110 @@
+import re
+import zipfile
+from datetime import date, datetime
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excelstyler.conditional import add_banding_rule, add_highlight_rule, add_value_rules
+from excelstyler.streaming import StreamingReport
+from excelstyler.styles import RED_CELL
+from excelstyler.values import create_values
+
+PARITY_ROWS = [['a', None], ['b', date(2024, 3, 20)], ['c', datetime(2024, 3, 20, 12)], ['d', 7], ['e', 0]]
+
+
+def _rules(worksheet):
+    return {str(cf.sqref): [rule.formula[0] for rule in cf.rules] for cf in worksheet.conditional_formatting}
+
+
+class TestConditionalRules:
+    """Test cases for the conditional-formatting rules."""
+
+    def setup_method(self):
+        """Set up test workbook and worksheet."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+
+    def test_banding_rule(self):
+        """Test the banding rule covers the range with a MOD(ROW(),2) formula."""
+        add_banding_rule(self.worksheet, 2, 10, 1, 3, m_color='DDEBF7')
+
+        assert _rules(self.worksheet) == {'A2:C10': ['MOD(ROW(),2)=0']}
+        rule = list(self.worksheet.conditional_formatting)[0].rules[0]
+        assert rule.dxf.fill.bgColor.rgb == '00DDEBF7'
+
+    def test_highlight_rule(self):
+        """Test the highlight rule compares the anchored column with a literal."""
+        add_highlight_rule(self.worksheet, 4, 20, 2, 5, column=3, value='say "hi"')
+        add_highlight_rule(self.worksheet, 4, 20, 2, 5, column=4, value=0)
+
+        assert _rules(self.worksheet) == {'B4:E20': ['$C4="say ""hi"""', '$D4=0']}
+        assert list(self.worksheet.conditional_formatting)[0].rules[0].stopIfTrue
+
+    def test_value_rules_skip_statically_filled_columns(self):
+        """Test banding is not applied to the item_num column that has its own fill."""
+        add_value_rules(self.worksheet, 1, 5, 1, 4, banding=True, item_num=1, item_color='yellow')
+
+        assert _rules(self.worksheet) == {'A1:A5': ['MOD(ROW(),2)=0'], 'C1:D5': ['MOD(ROW(),2)=0']}
+
+    def test_value_rules_highlight_first(self):
+        """Test the highlight rule gets a higher priority than banding."""
+        add_value_rules(self.worksheet, 1, 5, 1, 2, banding=True, different_cell=1, different_value=3)
+        rules = list(self.worksheet.conditional_formatting)[0].rules
+
+        assert [rule.formula[0] for rule in rules] == ['$B1=3', 'MOD(ROW(),2)=0']
+        assert rules[0].priority < rules[1].priority
+
+
+class TestConditionalValues:
+    """Test cases for create_values(..., conditional=True)."""
+
+    def test_create_values_conditional(self, tmp_path):
+        """Test conditional mode writes rules instead of per-cell fills."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        rows = [["A", 1], ["B", 2], ["C", 3]]
+        create_values(worksheet, rows, 2, banding=True, different_cell=1, different_value=3, conditional=True)
+        path = tmp_path / "conditional.xlsx"
+        workbook.save(path)
+        worksheet = load_workbook(path).active
+
+        assert _rules(worksheet) == {'A2:B4': ['$B2=3', 'MOD(ROW(),2)=0']}
+        for row in range(2, 5):
+            assert worksheet.cell(row, 1).fill.fill_type is None
+        assert worksheet.cell(2, 2).number_format == '#,###'
+
+    def test_streaming_conditional(self, tmp_path):
+        """Test conditional mode in a write-only report."""
+        report = StreamingReport('Report')
+        report.create_header(["Name", "Amount"])
+        report.create_values([["A", 1], ["B", 2]], banding=True, conditional=True)
+        path = tmp_path / "report.xlsx"
+        report.save(path)
+        worksheet = load_workbook(path)['Report']
+
+        assert _rules(worksheet) == {'A2:B3': ['MOD(ROW(),2)=0']}
+        assert worksheet.cell(2, 1).fill.fill_type is None
+
+    @pytest.mark.parametrize('value', [None, date(2024, 3, 20), datetime(2024, 3, 20, 12), 7])
+    def test_highlight_parity_with_cell_fills(self, value, tmp_path):
+        """Test the highlight rule matches the rows that per-cell fills highlight, as Excel stores the cells."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        create_values(worksheet, PARITY_ROWS, 1, different_cell=1, different_value=value)
+        filled = [row for row in range(1, 6) if worksheet.cell(row, 1).fill.start_color.rgb == RED_CELL.start_color.rgb]
+
+        workbook = Workbook()
+        create_values(workbook.active, PARITY_ROWS, 1, different_cell=1, different_value=value, conditional=True)
+        path = tmp_path / 'parity.xlsx'
+        workbook.save(path)
+        with zipfile.ZipFile(path) as archive:
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        literal = _rules(load_workbook(path).active)['A1:B5'][0].split('=', 1)[1]
+        # Evaluate `$Bn=literal` against the values written to the file: empty cells equal "".
+        stored = {int(row): float(number) for row, number in re.findall(r'<c r="B(\d+)"[^>]*><v>([^<]*)</v>', sheet)}
+        matched = [row for row in range(1, 6)
+                   if (row not in stored and literal == '""')
+                   or (row in stored and literal != '""' and stored[row] == float(literal))]
+
+        assert filled == matched and len(matched) == 1
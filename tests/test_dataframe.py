@@ -0,0 +1,143 @@
+import io
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excelstyler import StreamingReport, from_dataframe
+from excelstyler.styles import GREEN_CELL, VERY_LIGHT_CREAM_CELL
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+
+class TestFromDataframe:
+    """Test cases for from_dataframe function."""
+
+    def setup_method(self):
+        """Set up test workbook, worksheet and DataFrame."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.df = pd.DataFrame({
+            'name': ['Ali', None, 'Sara'],
+            'count': [1, 0, 3],
+            'amount': [1500.5, np.nan, 0.0],
+            'date': pd.to_datetime(['2023-03-21', None, '2024-01-01']),
+        })
+
+    def test_header_and_values(self):
+        """Test that the header and values are written from the columns."""
+        next_row = from_dataframe(self.worksheet, self.df, start_row=2, start_col=2)
+
+        assert next_row == 6
+        rows = list(self.worksheet.iter_rows(min_row=2, min_col=2, values_only=True))
+        assert rows[0] == ('name', 'count', 'amount', 'date')
+        assert rows[1] == ('Ali', 1, 1500.5, datetime(2023, 3, 21))
+        assert rows[2] == (None, 0, None, None)
+        assert rows[3] == ('Sara', 3, 0.0, datetime(2024, 1, 1))
+
+    def test_values_are_python_types(self):
+        """Test that NumPy scalars are converted to Python values."""
+        from_dataframe(self.worksheet, self.df)
+
+        assert type(self.worksheet.cell(2, 2).value) is int
+        assert type(self.worksheet.cell(2, 3).value) is float
+
+    def test_number_formats_from_dtypes(self):
+        """Test that the number format is chosen per column from the dtype."""
+        from_dataframe(self.worksheet, self.df)
+
+        for row in (2, 3):
+            assert self.worksheet.cell(row, 1).number_format == 'General'
+            assert self.worksheet.cell(row, 2).number_format == '#,##0'
+            assert self.worksheet.cell(row, 3).number_format == '#,##0'
+            assert self.worksheet.cell(row, 4).number_format == 'yyyy-mm-dd'
+
+    def test_formats_override(self):
+        """Test that formats override the dtype defaults and 'shamsi' converts dates."""
+        from_dataframe(self.worksheet, self.df, formats={'amount': '0.00', 'date': 'shamsi'})
+
+        assert self.worksheet.cell(2, 3).number_format == '0.00'
+        assert self.worksheet.cell(2, 4).value == '01-01-1402'
+        assert self.worksheet.cell(3, 4).value is None
+
+    def test_header_color_and_banding(self):
+        """Test header color and banding on even rows."""
+        from_dataframe(self.worksheet, self.df, header_color='green', banding=True, border_style='thin')
+
+        assert self.worksheet.cell(1, 1).fill == GREEN_CELL
+        assert self.worksheet.cell(2, 1).fill == VERY_LIGHT_CREAM_CELL
+        assert self.worksheet.cell(3, 1).fill.fill_type is None
+        assert self.worksheet.cell(3, 1).border.left.style == 'thin'
+
+    def test_index(self):
+        """Test writing the index as the first column."""
+        df = self.df.set_index('name')
+        from_dataframe(self.worksheet, df, index=True)
+
+        assert self.worksheet.cell(1, 1).value == 'name'
+        assert self.worksheet.cell(2, 1).value == 'Ali'
+        assert self.worksheet.cell(2, 2).value == 1
+
+    def test_numpy_array(self):
+        """Test writing a 2-D NumPy array with and without column names."""
+        array = np.arange(6).reshape(3, 2)
+        next_row = from_dataframe(self.worksheet, array)
+
+        assert next_row == 4
+        assert self.worksheet.cell(1, 1).value == 0
+        assert self.worksheet.cell(3, 2).value == 5
+
+        from_dataframe(self.worksheet, array, start_row=5, columns=['a', 'b'])
+        assert self.worksheet.cell(5, 2).value == 'b'
+        assert self.worksheet.cell(6, 2).value == 1
+
+    def test_invalid_arguments(self):
+        """Test that invalid positions and arrays raise ValueError."""
+        with pytest.raises(ValueError):
+            from_dataframe(self.worksheet, self.df, start_row=0)
+        with pytest.raises(ValueError):
+            from_dataframe(self.worksheet, np.arange(3))
+
+    def test_nullable_dtypes(self):
+        """Test that pandas nullable columns keep their Python types and write pandas.NA as empty cells."""
+        df = pd.DataFrame({
+            'count': pd.array([1, None, 3], dtype='Int64'),
+            'flag': pd.array([True, None, False], dtype='boolean'),
+            'amount': pd.array([1.5, None, 0.0], dtype='Float64'),
+        })
+        from_dataframe(self.worksheet, df)
+        buffer = io.BytesIO()
+        self.workbook.save(buffer)
+        worksheet = load_workbook(buffer).active
+
+        values = [[cell.value for cell in row] for row in worksheet.iter_rows(min_row=2)]
+        assert values == [[1, True, 1.5], [None, None, None], [3, False, 0.0]]
+        assert type(values[0][0]) is int
+        assert worksheet.cell(2, 1).number_format == '#,##0'
+
+    def test_timezone_aware_datetimes(self):
+        """Test that timezone-aware datetime columns raise TypeError instead of being converted to UTC."""
+        df = pd.DataFrame({'time': pd.date_range('2024-01-01 10:00', periods=2, tz='Asia/Tehran')})
+        with pytest.raises(TypeError, match="timezones"):
+            from_dataframe(self.worksheet, df)
+
+        df['time'] = df['time'].dt.tz_localize(None)
+        from_dataframe(self.worksheet, df)
+        assert self.worksheet.cell(2, 1).value == datetime(2024, 1, 1, 10, 0)
+
+    def test_streaming_report(self):
+        """Test writing a DataFrame to a StreamingReport."""
+        report = StreamingReport('Data')
+        report.create_header(['Report'])
+        next_row = from_dataframe(report, self.df, banding=True)
+        buffer = io.BytesIO()
+        report.save(buffer)
+
+        assert next_row == 6
+        worksheet = load_workbook(buffer).active
+        assert worksheet.cell(2, 2).value == 'count'
+        assert worksheet.cell(3, 3).value == 1500.5
+        assert worksheet.cell(4, 3).value is None
+        assert worksheet.cell(4, 2).number_format == '#,##0'
+        assert worksheet.cell(4, 1).fill.start_color.rgb == VERY_LIGHT_CREAM_CELL.start_color.rgb
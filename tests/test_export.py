@@ -0,0 +1,107 @@
+import io
+import sqlite3
+import tracemalloc
+
+from openpyxl import load_workbook
+
+from excelstyler.export import stream_xlsx, XLSX_CONTENT_TYPE
+
+
+class FakeQuerySet:
+    """Minimal stand-in for a Django QuerySet."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.chunk_size = None
+
+    def __iter__(self):
+        raise AssertionError("QuerySets must be read with iterator()")
+
+    def iterator(self, chunk_size=None):
+        self.chunk_size = chunk_size
+        return iter(self.rows)
+
+
+class Employee:
+    def __init__(self, name, salary):
+        self.name = name
+        self.salary = salary
+
+
+def _load(chunks):
+    return load_workbook(io.BytesIO(b''.join(chunks))).active
+
+
+class TestStreamXlsx:
+    """Test cases for stream_xlsx function."""
+
+    def setup_method(self):
+        """Set up an in-memory SQLite table."""
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE sales (id INTEGER, name TEXT, amount REAL)')
+        self.connection.executemany(
+            'INSERT INTO sales VALUES (?, ?, ?)',
+            ((i, 'name %d' % i, i * 1.5) for i in range(1, 501))
+        )
+
+    def teardown_method(self):
+        self.connection.close()
+
+    def test_sqlite_cursor(self):
+        """Test exporting rows from a database cursor."""
+        cursor = self.connection.execute('SELECT id, name, amount FROM sales ORDER BY id')
+        worksheet = _load(stream_xlsx(cursor, ['ID', 'Name', 'Amount'], header_color='green',
+                                      border_style='thin', banding=True))
+
+        assert worksheet.cell(1, 1).value == 'ID'
+        assert worksheet.freeze_panes == 'A2'
+        assert worksheet.auto_filter.ref == 'A1:C501'
+        assert worksheet.cell(501, 2).value == 'name 500'
+        assert worksheet.cell(2, 3).number_format == '#,###'
+        assert worksheet.cell(2, 1).border.left.style == 'thin'
+
+    def test_queryset_is_read_in_chunks(self):
+        """Test objects with iterator() are read with the chunk size."""
+        queryset = FakeQuerySet([Employee('Ali', 1000), Employee('Sara', 2000)])
+        worksheet = _load(stream_xlsx(queryset, ['Name', 'Salary'], fields=['name', 'salary'], chunk_size=500))
+
+        assert queryset.chunk_size == 500
+        assert worksheet.cell(3, 1).value == 'Sara'
+        assert worksheet.cell(3, 2).value == 2000
+
+    def test_dict_rows(self):
+        """Test fields are looked up as keys in dict rows."""
+        rows = [{'name': 'Ali', 'salary': 1000}, {'name': 'Sara'}]
+        worksheet = _load(stream_xlsx(rows, fields=['name', 'salary'], title='Staff', right_to_left=True))
+
+        assert worksheet.title == 'Staff'
+        assert worksheet.sheet_view.rightToLeft
+        assert worksheet.cell(1, 2).value == 1000
+        assert worksheet.cell(2, 2).value is None
+
+    def test_lazy(self):
+        """Test nothing is read before the first chunk is requested."""
+        queryset = FakeQuerySet([])
+        stream = stream_xlsx(queryset)
+
+        assert queryset.chunk_size is None
+        next(stream)
+        assert queryset.chunk_size == 2000
+        stream.close()
+
+    def test_memory_is_bounded(self):
+        """Test rows are not accumulated in memory while exporting."""
+        rows = ((i, 'name %d' % i, i * 1.5) for i in range(3000))
+        tracemalloc.start()
+        try:
+            size = sum(len(chunk) for chunk in stream_xlsx(rows, buffer_size=16384))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert size > 0
+        assert peak < 4 * 1024 * 1024
+
+    def test_content_type(self):
+        """Test the xlsx content type constant."""
+        assert XLSX_CONTENT_TYPE == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -2,6 +2,7 @@ import pytest
 import openpyxl
 from openpyxl import Workbook
 from excelstyler.headers import create_header, create_header_freez
+from excelstyler.layout import SheetLayout
 
 
 class TestCreateHeader:
@@ -108,4 +109,25 @@ class TestCreateHeaderFreez:
         create_header_freez(self.worksheet, data, 1, 2, 3, different_cell="Status")
         
         # Check that Status cell has red fill
-        assert self.worksheet.cell(2, 3).fill.start_color.index == "00C00000"
\ No newline at end of file
+        assert self.worksheet.cell(2, 3).fill.start_color.index == "00C00000"
+
+    def test_create_header_freez_does_not_add_cells(self):
+        """Test freezing does not create a cell below the header."""
+        create_header_freez(self.worksheet, ["Name", "Age"], 1, 2, 3)
+
+        assert self.worksheet.max_row == 2
+        assert self.worksheet.auto_filter.ref == "A2:B2"
+
+    def test_create_header_freez_with_layout(self):
+        """Test a layout defers the filter until the data has been written."""
+        layout = SheetLayout(self.worksheet)
+        create_header_freez(self.worksheet, ["Name", "Age"], 1, 2, 3, layout=layout)
+        assert self.worksheet.auto_filter.ref is None
+
+        for row in range(3, 8):
+            self.worksheet.cell(row, 1, "John")
+            self.worksheet.cell(row, 2, row)
+        layout.finish()
+
+        assert self.worksheet.freeze_panes == "A3"
+        assert self.worksheet.auto_filter.ref == "A2:B7"
@@ -0,0 +1,123 @@
+import io
+import logging
+import threading
+from datetime import date
+
+from openpyxl import Workbook
+
+from excelstyler import StreamingReport, create_value, shamsi_date
+from excelstyler.headers import create_header
+from excelstyler.instrument import instrument, timed
+from excelstyler.to_locale_string import to_locale_str
+from excelstyler.utils import convert_str_to_date
+
+
+class TestInstrument:
+    """Test cases for the instrumentation hooks."""
+
+    def test_timings_and_counters(self):
+        """Test entry points, date conversion and style creation are recorded."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        with instrument() as stats:
+            create_header(worksheet, ['Name', 'Date'], 1, 1, color='green')
+            for row in range(2, 12):
+                create_value(worksheet, [shamsi_date(date(2024, 1, row)), to_locale_str(row),
+                                         convert_str_to_date(f'2024-01-{row:02d}')], row, 1, border_style='thin', m=row)
+        data = stats.as_dict()
+
+        assert data['timings']['create_header']['calls'] == 1
+        assert data['timings']['create_value']['calls'] == 10
+        assert data['timings']['shamsi_date']['calls'] == 10
+        assert data['timings']['to_locale_str']['calls'] == 10
+        assert data['timings']['convert_str_to_date']['calls'] == 10
+        timing = data['timings']['create_value']
+        assert 0 < timing['max'] <= timing['total']
+        assert timing['mean'] == timing['total'] / 10
+        assert data['counters']['borders_created'] == 1
+        assert data['counters']['styles_resolved'] >= 3
+        assert data['workbooks'] == [{
+            'cell_styles': len(workbook._cell_styles),
+            'fonts': len(workbook._fonts),
+            'fills': len(workbook._fills),
+            'borders': len(workbook._borders),
+            'number_formats': len(workbook._number_formats),
+        }]
+
+    def test_off_by_default(self):
+        """Test nothing is recorded outside an instrument block."""
+        stats = instrument()
+        shamsi_date(date(2024, 1, 1))
+        with stats:
+            pass
+        shamsi_date(date(2024, 1, 1))
+
+        assert stats.as_dict() == {'timings': {}, 'counters': {}, 'workbooks': []}
+
+    def test_save_phases(self):
+        """Test saving, including the background save of iter_bytes, is timed."""
+        with instrument() as stats:
+            report = StreamingReport()
+            report.create_values([[1, 2]] * 5)
+            report.save(io.BytesIO())
+            streamed = StreamingReport()
+            streamed.create_value(['a'])
+            b''.join(streamed.iter_bytes())
+            with stats.phase('fetch'):
+                pass
+        timings = stats.as_dict()['timings']
+
+        assert timings['StreamingReport.create_values']['calls'] == 1
+        assert timings['StreamingReport.save']['calls'] == 1
+        assert timings['StreamingReport.iter_bytes']['calls'] == 1
+        assert timings['fetch']['calls'] == 1
+
+    def test_callback_and_threads(self):
+        """Test the callback sees calls made from other threads."""
+        calls = []
+        with instrument(callback=lambda name, seconds: calls.append(name)):
+            thread = threading.Thread(target=shamsi_date, args=(date(2024, 1, 1),))
+            thread.start()
+            thread.join()
+
+        assert calls == ['shamsi_date']
+
+    def test_timed_decorator(self):
+        """Test timed records user functions under their name or a given one."""
+        @timed
+        def load():
+            return 1
+
+        @timed(name='fetch rows')
+        def fetch():
+            return 2
+
+        with instrument() as stats:
+            assert load() == 1
+            assert fetch() == 2
+
+        assert set(stats.as_dict()['timings']) == {
+            'TestInstrument.test_timed_decorator.<locals>.load', 'fetch rows',
+        }
+
+    def test_nested_blocks(self):
+        """Test an inner block collects its own calls and restores the outer one."""
+        with instrument() as outer:
+            shamsi_date(date(2024, 1, 1))
+            with instrument() as inner:
+                shamsi_date(date(2024, 1, 2))
+            shamsi_date(date(2024, 1, 3))
+
+        assert outer.as_dict()['timings']['shamsi_date']['calls'] == 2
+        assert inner.as_dict()['timings']['shamsi_date']['calls'] == 1
+
+    def test_log(self, caplog):
+        """Test log emits one record with a summary and the data attached."""
+        with instrument() as stats:
+            shamsi_date(date(2024, 1, 1))
+        with caplog.at_level(logging.INFO, logger='excelstyler'):
+            stats.log()
+
+        record, = caplog.records
+        assert 'shamsi_date: 1 calls' in record.getMessage()
+        assert record.excelstyler['timings']['shamsi_date']['calls'] == 1
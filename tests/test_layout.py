@@ -0,0 +1,130 @@
+import pytest
+from openpyxl import Workbook
+from excelstyler.layout import SheetLayout, display_width, text_width
+
+
+class TestSheetLayout:
+    """Test cases for SheetLayout."""
+
+    def setup_method(self):
+        """Set up test workbook and worksheet."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+
+    def test_context_manager_finishes(self):
+        """Test leaving the context applies freeze panes and the filter."""
+        with SheetLayout(self.worksheet) as layout:
+            layout.freeze('B3')
+            layout.auto_filter(2, start_col=2)
+            self.worksheet.cell(10, 4, "x")
+
+        assert self.worksheet.freeze_panes == "B3"
+        assert self.worksheet.auto_filter.ref == "B2:D10"
+
+    def test_context_manager_skips_finish_on_error(self):
+        """Test nothing is applied when the block raises."""
+        with pytest.raises(RuntimeError):
+            with SheetLayout(self.worksheet) as layout:
+                layout.freeze('A2')
+                raise RuntimeError("boom")
+
+        assert self.worksheet.freeze_panes is None
+
+    def test_reported_extent(self):
+        """Test extents reported by streaming writers are used for the filter."""
+        layout = SheetLayout(self.worksheet)
+        layout.auto_filter(1)
+        layout.max_row = 50
+        layout.max_column = 3
+        layout.finish()
+
+        assert self.worksheet.auto_filter.ref == "A1:C50"
+
+    def test_invalid_filter_row(self):
+        """Test an invalid filter row raises ValueError."""
+        with pytest.raises(ValueError, match="row and start_col must be positive integers"):
+            SheetLayout(self.worksheet).auto_filter(0)
+
+    def test_dimensions_applied_once_on_finish(self):
+        """Test requested dimensions are only written by finish()."""
+        layout = SheetLayout(self.worksheet)
+        for height in (10, 20, 30):
+            layout.set_row_height(2, height)
+        layout.set_column_width(3, 25)
+
+        assert 2 not in self.worksheet.row_dimensions
+        assert layout.column_width(3) == 25
+        assert layout.column_width(4) == 13
+        assert 'D' not in self.worksheet.column_dimensions
+        layout.finish()
+
+        assert self.worksheet.row_dimensions[2].height == 30
+        assert self.worksheet.column_dimensions['C'].width == 25
+
+    def test_writers_record_dimensions(self):
+        """Test header, value and description writers record dimensions on the layout."""
+        from excelstyler.headers import create_header, create_header_freez
+        from excelstyler.helpers import excel_description
+        from excelstyler.values import create_value, create_values
+
+        layout = SheetLayout(self.worksheet)
+        excel_description(self.worksheet, 'A1', 'Report', height=40, layout=layout)
+        create_header(self.worksheet, ["Name", "Age"], 1, 2, height=25, width=15, layout=layout)
+        create_header_freez(self.worksheet, ["A very long header title"], 3, 3, 4, len_with=1, layout=layout)
+        create_value(self.worksheet, ["John", 25], 4, 1, height=18, layout=layout)
+        create_values(self.worksheet, [["Jane", 30]] * 3, 5, height=16, width=12, layout=layout)
+
+        assert len(self.worksheet.row_dimensions) == 0
+        layout.finish()
+
+        assert self.worksheet.row_dimensions[1].height == 40
+        assert self.worksheet.row_dimensions[2].height == 25
+        assert self.worksheet.row_dimensions[4].height == 18
+        assert self.worksheet.row_dimensions[7].height == 16
+        assert self.worksheet.column_dimensions['A'].width == 12
+        assert self.worksheet.column_dimensions['C'].width == len("A very long header title") + 3
+
+    def test_auto_width(self):
+        """Test columns are fitted to the widest value written through the layout."""
+        from excelstyler.headers import create_header
+        from excelstyler.values import create_value, create_values
+
+        layout = SheetLayout(self.worksheet, auto_width=True, min_width=4, padding=1)
+        create_header(self.worksheet, ["Name", "Amount", "Note"], 1, 1, layout=layout)
+        create_values(self.worksheet, [["Ali", 1234567, "x"], ["Zahra", 5, "y"]], 2, layout=layout)
+        create_value(self.worksheet, ["Mohammad", 0, None], 4, 1, layout=layout)
+        layout.set_column_width(1, 30)
+        layout.finish()
+
+        assert self.worksheet.column_dimensions['A'].width == 30
+        assert self.worksheet.column_dimensions['B'].width == len("1,234,567") + 1
+        assert self.worksheet.column_dimensions['C'].width == 5
+
+    def test_auto_width_limits(self):
+        """Test fitted widths are clamped to min_width and max_width."""
+        layout = SheetLayout(self.worksheet, auto_width=True, min_width=10, max_width=20)
+        layout.measure_row(1, ["a", "b" * 100])
+        layout.finish()
+
+        assert self.worksheet.column_dimensions['A'].width == 10
+        assert self.worksheet.column_dimensions['B'].width == 20
+
+
+class TestDisplayWidth:
+    """Test cases for text_width and display_width."""
+
+    def test_persian_zero_width_characters(self):
+        """Test ZWNJ and harakat take no space."""
+        assert text_width("می‌شود") == 5
+        assert text_width("سلامٌ") == 4
+
+    def test_wide_glyphs_and_lines(self):
+        """Test wide glyphs count double and the longest line wins."""
+        assert text_width("中文") == 4
+        assert text_width("ab\nabcd") == 4
+
+    def test_numbers_use_thousands_separators(self):
+        """Test numbers are measured as formatted by '#,###'."""
+        assert display_width(1234567) == 9
+        assert display_width(1234.6) == 5
+        assert display_width(None) == 0
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import excelstyler
+
+IMPORTTIME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                          'importtime.py')
+
+
+def loaded_after(statement):
+    code = f'{statement}\nimport sys\nprint(sorted(m for m in ("openpyxl", "jdatetime") if m in sys.modules))'
+    return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+class TestLazyImport:
+    """Test cases for the lazy package imports."""
+
+    def test_import_loads_no_dependencies(self):
+        """Test importing the package loads neither openpyxl nor jdatetime."""
+        assert loaded_after('import excelstyler') == '[]'
+
+    def test_date_helpers_do_not_load_openpyxl(self):
+        """Test the date and number helpers can be used without openpyxl."""
+        assert loaded_after('from excelstyler import shamsi_date') == "['jdatetime']"
+        assert loaded_after('from excelstyler.to_locale_string import to_locale_str') == '[]'
+
+    def test_names_resolve(self):
+        """Test the public names, style constants and submodules resolve on access."""
+        from excelstyler import StreamingReport, GREEN_CELL, color_dict
+        from excelstyler.streaming import StreamingReport as streaming_report
+        from excelstyler.styles import GREEN_CELL as green_cell
+
+        assert StreamingReport is streaming_report
+        assert GREEN_CELL is green_cell
+        assert color_dict['green'] is green_cell
+        assert excelstyler.registry.get_style_registry is not None
+        assert set(excelstyler.__all__) <= set(dir(excelstyler))
+
+    def test_unknown_name(self):
+        """Test an unknown attribute still raises AttributeError."""
+        with pytest.raises(AttributeError):
+            excelstyler.does_not_exist
+
+    def test_importtime_check(self):
+        """Test the import-time benchmark finds no heavy import in the light statements."""
+        completed = subprocess.run([sys.executable, IMPORTTIME, '--check', '--runs', '1'],
+                                   capture_output=True, text=True)
+
+        assert completed.returncode == 0, completed.stdout
+        assert 'import excelstyler ' in completed.stdout
@@ -0,0 +1,106 @@
+import gc
+
+import pytest
+from openpyxl import load_workbook
+
+from excelstyler.parallel import ParallelWorkbook, _remap_sheet
+
+
+def build_sheet(report, rows, color):
+    report.create_header_freez(["Name", "Amount"], color=color, border_style="thin")
+    report.create_values(rows, border_style="thin", banding=True)
+
+
+def build_collected(report, count):
+    # Collects the reports of the sheets this worker built before.
+    gc.collect()
+    report.create_header(["Name", "Amount"])
+    report.create_values([f"item {j}", j] for j in range(count))
+
+
+def build_table(report):
+    report.create_table(["Name"], [["A"]])
+    report.create_values([[1]], banding=True, conditional=True)
+
+
+def build_chart(report):
+    report.worksheet._charts.append(object())
+
+
+class TestParallelWorkbook:
+    """Test cases for ParallelWorkbook."""
+
+    def test_sheets_are_merged(self, tmp_path):
+        """Test every sheet keeps its values and styles after the merge."""
+        workbook = ParallelWorkbook(max_workers=2)
+        workbook.add_sheet("North", build_sheet, [["A", 1500], ["B", 0]], "green")
+        workbook.add_sheet("South", build_sheet, [["C", 20]], "blue")
+        path = tmp_path / "parallel.xlsx"
+        workbook.save(path)
+        result = load_workbook(path)
+
+        assert result.sheetnames == ["North", "South"]
+        north, south = result["North"], result["South"]
+        assert north.cell(1, 1).fill.start_color.rgb == "0000B050"
+        assert south.cell(1, 1).fill.start_color.rgb == "00538DD5"
+        assert north.cell(2, 2).value == 1500
+        assert north.cell(2, 2).number_format == "#,###"
+        assert north.cell(2, 1).fill.start_color.rgb == "00FAF0E7"
+        assert north.cell(3, 1).fill.fill_type is None
+        assert south.cell(2, 1).border.left.style == "thin"
+        assert north.freeze_panes == "A2"
+        assert south.auto_filter.ref == "A1:B2"
+        # Identical cells of both sheets share one style index.
+        assert north.cell(2, 1).style_id == south.cell(2, 1).style_id
+
+    def test_rendered_files_outlive_worker_reports(self, tmp_path):
+        """Test the sheet files rendered by a worker are kept when its reports are garbage collected."""
+        workbook = ParallelWorkbook(max_workers=1, backend='xml')
+        for number in range(4):
+            workbook.add_sheet(f"Sheet {number}", build_collected, 2000)
+        path = tmp_path / "collected.xlsx"
+        workbook.save(path)
+        result = load_workbook(path, read_only=True)
+
+        assert result.sheetnames == ["Sheet 0", "Sheet 1", "Sheet 2", "Sheet 3"]
+        assert [row for row in result["Sheet 0"].iter_rows(min_row=2001, values_only=True)] == [("item 1999", 1999)]
+
+    def test_tables_and_conditional_formats(self, tmp_path):
+        """Test tables get unique names and conditional formats keep their fills."""
+        workbook = ParallelWorkbook(max_workers=2)
+        workbook.add_sheet("One", build_table)
+        workbook.add_sheet("Two", build_table)
+        path = tmp_path / "tables.xlsx"
+        workbook.save(path)
+        result = load_workbook(path)
+
+        assert list(result["One"].tables) == ["Table1"]
+        assert list(result["Two"].tables) == ["Table2"]
+        rule = list(result["Two"].conditional_formatting)[0].rules[0]
+        assert rule.dxf.fill.bgColor.rgb == "00FAF0E7"
+
+    def test_duplicate_title(self):
+        """Test sheet titles must be unique."""
+        workbook = ParallelWorkbook()
+        workbook.add_sheet("Sheet", build_table)
+        with pytest.raises(ValueError):
+            workbook.add_sheet("Sheet", build_table)
+
+    def test_charts_not_supported(self, tmp_path):
+        """Test sheets with charts are rejected."""
+        workbook = ParallelWorkbook(max_workers=1)
+        workbook.add_sheet("Chart", build_chart)
+        with pytest.raises(ValueError):
+            workbook.save(tmp_path / "chart.xlsx")
+
+    def test_remap_leaves_text_alone(self, tmp_path):
+        """Test only style attributes of tags are renumbered, not cell text."""
+        path = tmp_path / "sheet.xml"
+        path.write_bytes(b'<row r="1" s="1"><c r="A1" s="1" t="inlineStr"><is><t> s="1"</t></is></c>'
+                         b'<c r="B1" s="2" t="s"><v>0</v></c></row><cfRule dxfId="0" />')
+        remapped = _remap_sheet(str(path), [0, 5, 7], [3], [4])
+
+        assert open(remapped, 'rb').read() == (
+            b'<row r="1" s="5"><c r="A1" s="5" t="inlineStr"><is><t> s="1"</t></is></c>'
+            b'<c r="B1" s="7" t="s"><v>4</v></c></row><cfRule dxfId="3" />'
+        )
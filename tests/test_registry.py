@@ -0,0 +1,64 @@
+from openpyxl import Workbook
+from excelstyler.registry import get_style_registry, apply_style
+from excelstyler.styles import GREEN_CELL, Alignment_CELL
+from excelstyler.values import create_value
+
+
+class TestStyleRegistry:
+    """Test cases for StyleRegistry."""
+
+    def setup_method(self):
+        """Set up test workbook and worksheet."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.registry = get_style_registry(self.workbook)
+
+    def test_registry_is_per_workbook(self):
+        """Test the same registry is returned for a workbook."""
+        assert get_style_registry(self.workbook) is self.registry
+        assert get_style_registry(Workbook()) is not self.registry
+
+    def test_objects_are_interned(self):
+        """Test fonts, fills and borders are built once per key."""
+        assert self.registry.font(size=10, bold=True) is self.registry.font(size=10, bold=True)
+        assert self.registry.fill("FF0000") is self.registry.fill("FF0000")
+        assert self.registry.fill("green") is GREEN_CELL
+        assert self.registry.border("thin") is self.registry.border("thin")
+        assert self.registry.border(None) is None
+
+    def test_style_is_cached(self):
+        """Test a style combination resolves to the same array."""
+        font = self.registry.font(size=10, bold=True)
+        first = self.registry.style(font=font, fill=GREEN_CELL, alignment=Alignment_CELL, number_format='#,###')
+        second = self.registry.style(font=font, fill=GREEN_CELL, alignment=Alignment_CELL, number_format='#,###')
+        assert first is second
+
+    def test_apply_style(self):
+        """Test applied styles resolve to the expected cell attributes."""
+        cell = self.worksheet.cell(1, 1, 1000)
+        font = self.registry.font(size=10, bold=True)
+        apply_style(cell, self.registry.style(font=font, fill=GREEN_CELL, number_format='#,###'))
+
+        assert cell.font.size == 10
+        assert cell.font.bold
+        assert cell.fill.start_color.index == "0000B050"
+        assert cell.number_format == '#,###'
+
+    def test_apply_style_keeps_unset_fields(self):
+        """Test fields a style leaves at default keep the cell's existing value."""
+        cell = self.worksheet.cell(1, 1, "text")
+        cell.fill = GREEN_CELL
+        apply_style(cell, self.registry.style(font=self.registry.font(size=12)))
+
+        assert cell.fill.start_color.index == "0000B050"
+        assert cell.font.size == 12
+
+    def test_create_value_reuses_styles(self):
+        """Test many rows only add a handful of distinct styles to the workbook."""
+        for row in range(1, 201):
+            create_value(self.worksheet, ["John", row, 0], row, 1, border_style="thin", m=row)
+
+        font_ids = {self.worksheet.cell(row, 1)._style.fontId for row in range(1, 201)}
+        assert len(font_ids) == 1
+        assert len(self.workbook._fills) <= 3
+        assert len(self.workbook._borders) == 2
@@ -0,0 +1,150 @@
+import io
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excelstyler.layout import SheetLayout
+from excelstyler.schema import Column, ReportSchema
+from excelstyler.streaming import StreamingReport
+from excelstyler.xmlwriter import XmlReport
+
+COLUMNS = [
+    Column('Warehouse', field='warehouse', width=24),
+    Column('Day', field='day', type='shamsi'),
+    Column('Weight', field='weight', type='int', highlight=lambda weight: weight < 0),
+    Column('Amount', field='amount', type='money', color='light_green'),
+    Column('Total', field='total', type='locale'),
+]
+ROWS = [
+    {'warehouse': 'Tehran', 'day': date(2023, 3, 21), 'weight': 10, 'amount': 1500.5, 'total': 1234567},
+    {'warehouse': 'Tabriz', 'day': None, 'weight': -2, 'amount': 0, 'total': None},
+    {'warehouse': 'Shiraz', 'day': date(2024, 3, 20), 'weight': 0, 'amount': 20, 'total': 0},
+]
+
+
+class TestReportSchema:
+    """Test cases for ReportSchema and Column."""
+
+    def setup_method(self):
+        """Set up a workbook and a schema."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.schema = ReportSchema(COLUMNS, border_style='thin', banding=True, header_color='green')
+
+    def test_header(self):
+        """Test the header is styled like create_header, with widths, freeze panes and filter."""
+        layout = SheetLayout(self.worksheet)
+        self.schema.create_header(self.worksheet, row=2, layout=layout)
+        self.schema.create_values(self.worksheet, ROWS, layout=layout)
+        layout.finish()
+
+        assert [cell.value for cell in self.worksheet[2]] == self.schema.titles
+        assert self.worksheet.cell(2, 1).fill.start_color.index == '0000B050'
+        assert self.worksheet.cell(2, 1).font.color.rgb == 'D9FFFFFF'
+        assert self.worksheet.column_dimensions['A'].width == 24
+        assert self.worksheet.freeze_panes == 'A3'
+        assert self.worksheet.auto_filter.ref == 'A2:E5'
+
+    def test_values_types_and_conversions(self):
+        """Test fields are read from dicts, converted and formatted per column type."""
+        next_row = self.schema.create_values(self.worksheet, ROWS, start_row=2)
+
+        assert next_row == 5
+        assert [cell.value for cell in self.worksheet[2]] == ['Tehran', '01-01-1402', 10, 1500.5, '1,234,567']
+        assert [cell.value for cell in self.worksheet[3]] == ['Tabriz', None, -2, 0, None]
+        assert self.worksheet.cell(4, 2).value == '01-01-1403'
+        assert self.worksheet.cell(4, 3).number_format == '#,##0'
+        assert self.worksheet.cell(4, 4).number_format == '#,##0'
+        assert self.worksheet.cell(2, 1).number_format == 'General'
+        assert self.worksheet.cell(2, 1).border.left.style == 'thin'
+        assert self.worksheet.cell(2, 1).font.bold
+
+    def test_colors_banding_and_highlight(self):
+        """Test column colors win over banding and highlight rules only mark matching cells."""
+        self.schema.create_values(self.worksheet, ROWS, start_row=2)
+
+        assert self.worksheet.cell(2, 1).fill.start_color.index == '00FAF0E7'
+        assert self.worksheet.cell(3, 1).fill.fill_type is None
+        assert self.worksheet.cell(2, 4).fill.start_color.index == '0092D050'
+        assert self.worksheet.cell(3, 3).fill.start_color.index == '00FCDFDC'
+        assert self.worksheet.cell(2, 3).fill.start_color.index == '00FAF0E7'
+        assert self.worksheet.cell(4, 3).fill.start_color.index == '00FAF0E7'
+
+    def test_sequence_and_object_rows(self):
+        """Test rows can be sequences without fields, or objects with attributes."""
+        schema = ReportSchema([Column('Name'), Column('Count', type='locale', highlight=0)], start_col=2)
+        schema.create_values(self.worksheet, [('a', 1000), ['b', 0]], start_row=1)
+        by_field = ReportSchema([Column('Name', field='name')])
+        by_field.create_values(self.worksheet, [SimpleNamespace(name='c')], start_row=3)
+
+        assert [cell.value for cell in self.worksheet[1]][1:] == ['a', '1,000']
+        assert self.worksheet.cell(2, 3).value == '0'
+        assert self.worksheet.cell(2, 3).fill.start_color.index == '00FCDFDC'
+        assert self.worksheet.cell(3, 1).value == 'c'
+
+    @pytest.mark.parametrize('report_class', [None, StreamingReport, XmlReport])
+    def test_short_rows(self, report_class):
+        """Test sequence rows shorter than the schema only fill their first columns, as create_values does."""
+        schema = ReportSchema([Column('Name'), Column('Day', type='shamsi'), Column('Weight', highlight=0)])
+        rows = [('Tehran',), ('Tabriz', date(2023, 3, 21)), ('Shiraz', None, 0)]
+        if report_class is None:
+            schema.create_values(self.worksheet, rows, start_row=1)
+            worksheet = self.worksheet
+        else:
+            report = report_class('Sales')
+            schema.create_values(report, rows)
+            buffer = io.BytesIO()
+            report.save(buffer)
+            worksheet = load_workbook(buffer)['Sales']
+
+        assert [[cell.value for cell in row] for row in worksheet.iter_rows()] == [
+            ['Tehran', None, None], ['Tabriz', '01-01-1402', None], ['Shiraz', None, 0],
+        ]
+        assert worksheet.cell(3, 3).fill.start_color.index == '00FCDFDC'
+
+    @pytest.mark.parametrize('report_class', [StreamingReport, XmlReport])
+    def test_streaming_report(self, report_class, tmp_path):
+        """Test a schema drives the header and rows of a streaming report."""
+        report = report_class('Sales')
+        self.schema.create_header(report)
+        self.schema.create_values(report, ROWS)
+        path = tmp_path / 'sales.xlsx'
+        report.save(path)
+        worksheet = load_workbook(path)['Sales']
+
+        assert worksheet.cell(1, 5).value == 'Total'
+        assert worksheet.cell(2, 2).value == '01-01-1402'
+        assert worksheet.cell(3, 3).fill.start_color.index == '00FCDFDC'
+        assert worksheet.column_dimensions['A'].width == 24
+        assert worksheet.freeze_panes == 'A2'
+        assert worksheet.auto_filter.ref == 'A1:E4'
+
+    def test_chart_by_column_names(self):
+        """Test chart ranges and titles come from the schema columns."""
+        self.schema.create_header(self.worksheet)
+        self.schema.create_values(self.worksheet, ROWS)
+        self.schema.add_chart(self.worksheet, 'bar', ['weight', 'Amount'], 'Warehouse', 2, 4, 'H2', 'Sales')
+        chart = self.worksheet._charts[0]
+
+        assert [series.val.numRef.f for series in chart.series] == ["'Sheet'!$C$2:$C$4", "'Sheet'!$D$2:$D$4"]
+        assert [series.tx.v for series in chart.series] == ['Weight', 'Amount']
+        assert chart.x_axis.title.tx.rich.p[0].r[0].t == 'Warehouse'
+        self.workbook.save(io.BytesIO())
+
+    def test_index(self):
+        """Test columns are found by title or field."""
+        assert self.schema.index('Day') == 2
+        assert self.schema.index('amount') == 4
+        with pytest.raises(ValueError, match="no column"):
+            self.schema.index('Missing')
+
+    def test_invalid_schemas(self):
+        """Test invalid types and mixed fields are rejected."""
+        with pytest.raises(ValueError, match="type must be one of"):
+            Column('Name', type='currency')
+        with pytest.raises(ValueError, match="every column or no column"):
+            ReportSchema([Column('Name', field='name'), Column('Count')])
+        with pytest.raises(ValueError, match="at least one column"):
+            ReportSchema([])
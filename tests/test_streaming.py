@@ -0,0 +1,235 @@
+import io
+import threading
+
+import pytest
+from openpyxl import load_workbook
+from excelstyler.streaming import StreamingReport
+from excelstyler.xmlwriter import XmlReport
+
+
+class TestStreamingReport:
+    """Test cases for StreamingReport."""
+
+    def setup_method(self):
+        """Set up a streaming report."""
+        self.report = StreamingReport('Report')
+
+    def _reload(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+        self.report.save(path)
+        return load_workbook(path)['Report']
+
+    def test_header_and_values(self, tmp_path):
+        """Test rows are written in order with header styling."""
+        self.report.create_header(["Name", "Amount"], color="green", border_style="thin")
+        self.report.create_value(["John", 1500])
+        self.report.create_value(["Jane", 0])
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.cell(1, 1).value == "Name"
+        assert worksheet.cell(1, 1).fill.start_color.index == "0000B050"
+        assert worksheet.cell(1, 2).border.left.style == "thin"
+        assert worksheet.cell(2, 1).value == "John"
+        assert worksheet.cell(2, 2).value == 1500
+        assert worksheet.cell(2, 2).number_format == '#,###'
+        assert worksheet.cell(3, 2).number_format == 'General'
+        assert worksheet.cell(2, 1).font.bold
+
+    def test_start_col_offset(self, tmp_path):
+        """Test values start at the requested column."""
+        self.report.create_value(["John", 25], start_col=3)
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.cell(1, 1).value is None
+        assert worksheet.cell(1, 3).value == "John"
+        assert worksheet.cell(1, 4).value == 25
+
+    def test_alternating_and_different_cell(self, tmp_path):
+        """Test m banding and different_cell highlighting match create_value."""
+        self.report.create_value(["John", 25], m=2)
+        self.report.create_value(["Jane", 30], m=3)
+        self.report.create_value(["Bob", 25], different_cell=1, different_value=25)
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.cell(1, 1).fill.start_color.index == "00FAF0E7"
+        assert worksheet.cell(2, 1).fill.fill_type is None
+        assert worksheet.cell(3, 1).fill.start_color.index == "00FCDFDC"
+        assert worksheet.cell(3, 2).fill.start_color.index == "00FCDFDC"
+
+    def test_height_and_width(self, tmp_path):
+        """Test widths given with the header and per-row heights are written."""
+        self.report.create_header(["Name", "Age"], width=15)
+        self.report.create_value(["John", 25], height=30)
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.column_dimensions['A'].width == 15
+        assert worksheet.row_dimensions[2].height == 30
+
+    def test_row_dimensions_are_not_kept(self):
+        """Test row dimensions are dropped once a row has been written."""
+        for m in range(100):
+            self.report.create_value(["John", m], height=20)
+
+        assert self.report.row == 100
+        assert len(self.report.worksheet.row_dimensions) == 0
+
+    def test_header_empty_data(self):
+        """Test header with empty data raises ValueError."""
+        with pytest.raises(ValueError, match="Data must be a non-empty list"):
+            self.report.create_header([])
+
+    def test_invalid_start_col(self):
+        """Test invalid start_col raises ValueError."""
+        with pytest.raises(ValueError, match="start_col must be a positive integer"):
+            self.report.create_value(["John"], start_col=0)
+
+    def test_create_values(self, tmp_path):
+        """Test bulk rows with banding and widths set before the first row."""
+        self.report.create_values([["John", 25], ["Jane", 30]], banding=True, width=14)
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.cell(2, 2).value == 30
+        assert worksheet.cell(1, 1).fill.fill_type is None
+        assert worksheet.cell(2, 1).fill.start_color.index == "00FAF0E7"
+        assert worksheet.column_dimensions['B'].width == 14
+
+    def test_create_header_freez(self, tmp_path):
+        """Test freeze panes and a filter sized to the data after a title row."""
+        self.report.create_header(["Report"])
+        self.report.create_header_freez(["Name", "Age"], width=18, different_cell="Age")
+        self.report.create_values([["John", 25], ["Jane", 30], ["Bob", 35]])
+        worksheet = self._reload(tmp_path)
+
+        assert worksheet.freeze_panes == "A3"
+        assert worksheet.auto_filter.ref == "A2:B5"
+        assert worksheet.column_dimensions['A'].width == 18
+        assert worksheet.cell(2, 2).fill.start_color.index == "00C00000"
+
+    def test_create_header_freez_after_data(self):
+        """Test freezing after data rows raises ValueError."""
+        self.report.create_value(["John", 25])
+        with pytest.raises(ValueError, match="Freeze panes must be set before the first data row"):
+            self.report.create_header_freez(["Name", "Age"])
+
+    def test_iter_bytes(self):
+        """Test the workbook can be streamed as chunks of bytes."""
+        self.report.create_header(["Name", "Amount"])
+        self.report.create_values([["Row %d" % i, i] for i in range(2000)])
+        chunks = list(self.report.iter_bytes(chunk_size=4096))
+
+        assert len(chunks) > 1
+        assert all(len(chunk) > 0 for chunk in chunks)
+        worksheet = load_workbook(io.BytesIO(b''.join(chunks)))['Report']
+        assert worksheet.cell(2001, 1).value == "Row 1999"
+
+    def test_iter_bytes_closed_early(self):
+        """Test closing the byte stream early stops the writer thread."""
+        self.report.create_values([["x" * 50, i] for i in range(5000)])
+        stream = self.report.iter_bytes(chunk_size=1024)
+        next(stream)
+        stream.close()
+
+        assert not any(thread.name == 'excelstyler-save' for thread in threading.enumerate())
+
+
+@pytest.mark.parametrize('report_class', [StreamingReport, XmlReport])
+class TestStreamingRollover:
+    """Test cases for StreamingReport continuing on new sheets past max_rows."""
+
+    def _build(self, report_class, rows, **kwargs):
+        report = report_class('Ledger', right_to_left=True, max_rows=10, **kwargs)
+        report.excel_description('Ledger 1402', end_col=3, height=30)
+        report.create_header_freez(['Name', 'Qty', 'Amount'], color='green', width=16)
+        report.create_values(([f'Row {i}', i, i * 1.5] for i in range(1, rows + 1)), border_style='thin',
+                             banding=True)
+        return report
+
+    def _save(self, report, tmp_path):
+        path = tmp_path / 'ledger.xlsx'
+        report.save(path)
+        return load_workbook(path)
+
+    def test_continuation_sheets(self, report_class, tmp_path):
+        """Test full sheets continue on new ones repeating the header, widths, freeze and filter."""
+        workbook = self._save(self._build(report_class, 20), tmp_path)
+
+        assert workbook.sheetnames == ['Index', 'Ledger', 'Ledger (2)', 'Ledger (3)']
+        first, second, third = workbook['Ledger'], workbook['Ledger (2)'], workbook['Ledger (3)']
+        assert first.max_row == 10
+        assert first.cell(10, 1).value == 'Row 8'
+        assert second.cell(1, 1).value == 'Ledger 1402'
+        assert second.cell(2, 1).value == 'Name'
+        assert second.cell(2, 1).fill.start_color.index == '0000B050'
+        assert second.cell(3, 1).value == 'Row 9'
+        assert third.cell(6, 1).value == 'Row 20'
+        assert third.max_row == 6
+        for worksheet in (first, second, third):
+            assert worksheet.freeze_panes == 'A3'
+            assert worksheet.column_dimensions['B'].width == 16
+            assert worksheet.row_dimensions[1].height == 30
+            assert 'A1:C1' in worksheet.merged_cells
+            assert worksheet.sheet_view.rightToLeft
+        assert first.auto_filter.ref == 'A2:C10'
+        assert third.auto_filter.ref == 'A2:C6'
+
+    def test_banding_restarts_per_sheet(self, report_class, tmp_path):
+        """Test banding follows the row index of each sheet."""
+        workbook = self._save(self._build(report_class, 12), tmp_path)
+
+        assert workbook['Ledger (2)'].cell(3, 1).fill.fill_type is None
+        assert workbook['Ledger (2)'].cell(4, 1).fill.start_color.index == '00FAF0E7'
+
+    def test_index_sheet(self, report_class, tmp_path):
+        """Test the index sheet lists the data rows of every sheet with a link to it."""
+        workbook = self._save(self._build(report_class, 20), tmp_path)
+        index = workbook['Index']
+
+        assert [[cell.value for cell in row] for row in index.iter_rows()] == [
+            ['Sheet', 'First row', 'Last row', 'Rows', 'Range'],
+            ['Ledger', 1, 8, 8, '3:10'],
+            ['Ledger (2)', 9, 16, 8, '3:10'],
+            ['Ledger (3)', 17, 20, 4, '3:6'],
+        ]
+        assert index.cell(3, 1).hyperlink.location == "'Ledger (2)'!A3"
+        assert index.sheet_view.rightToLeft
+
+    def test_no_rollover(self, report_class, tmp_path):
+        """Test a report that fits on one sheet gets no index sheet."""
+        workbook = self._save(self._build(report_class, 8), tmp_path)
+
+        assert workbook.sheetnames == ['Ledger']
+
+    def test_without_index(self, report_class, tmp_path):
+        """Test index_title=None skips the index sheet."""
+        workbook = self._save(self._build(report_class, 20, index_title=None), tmp_path)
+
+        assert workbook.sheetnames == ['Ledger', 'Ledger (2)', 'Ledger (3)']
+
+    def test_conditional_rules_per_sheet(self, report_class, tmp_path):
+        """Test conditional banding rules are added to every sheet the block spans."""
+        report = report_class('Ledger', max_rows=5)
+        report.create_header(['Name', 'Qty'])
+        report.create_values(([f'Row {i}', i] for i in range(10)), banding=True, conditional=True)
+        workbook = self._save(report, tmp_path)
+
+        ranges = [[str(rule.sqref) for rule in workbook[title].conditional_formatting]
+                  for title in ('Ledger', 'Ledger (2)', 'Ledger (3)')]
+        assert ranges == [['A2:B5'], ['A2:B5'], ['A2:B3']]
+
+    def test_invalid_max_rows(self, report_class):
+        """Test max_rows must leave room within Excel's limit and below the header."""
+        with pytest.raises(ValueError, match="max_rows must be between"):
+            report_class('Ledger', max_rows=1048577)
+        report = report_class('Ledger', max_rows=2)
+        report.create_header(['a'])
+        report.create_header(['b'])
+        with pytest.raises(ValueError, match="no room for data rows"):
+            report.create_value([1])
+        report.save(io.BytesIO())
+
+    def test_table_cannot_roll_over(self, report_class):
+        """Test a table that does not fit on the sheet is rejected."""
+        report = report_class('Ledger', max_rows=5)
+        with pytest.raises(ValueError, match="table cannot continue"):
+            report.create_table(['a'], [[i] for i in range(10)])
+        report.save(io.BytesIO())
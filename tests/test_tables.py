@@ -0,0 +1,84 @@
+import io
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excelstyler.streaming import StreamingReport
+from excelstyler.tables import add_table, create_table
+from excelstyler.export import stream_xlsx
+
+
+class TestTables:
+    """Test cases for the Excel Table helpers."""
+
+    def setup_method(self):
+        """Set up test workbook and worksheet."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+
+    def _reload(self):
+        buffer = io.BytesIO()
+        self.workbook.save(buffer)
+        return load_workbook(buffer).active
+
+    def test_create_table(self):
+        """Test a header and rows are written as a styled table."""
+        rows = [["Ali", 1500], ["Sara", 0]]
+        next_row = create_table(self.worksheet, ["Name", "Amount"], rows, start_row=3, start_col=2,
+                                style='TableStyleLight9')
+        worksheet = self._reload()
+
+        assert next_row == 6
+        table = worksheet.tables['Table1']
+        assert table.ref == 'B3:C5'
+        assert table.autoFilter.ref == 'B3:C5'
+        assert table.tableStyleInfo.name == 'TableStyleLight9'
+        assert table.tableStyleInfo.showRowStripes
+        assert [column.name for column in table.tableColumns] == ["Name", "Amount"]
+        assert worksheet.cell(4, 3).number_format == '#,###'
+        assert worksheet.cell(5, 3).number_format == 'General'
+        assert worksheet.cell(4, 2).fill.fill_type is None
+
+    def test_unique_names_and_headers(self):
+        """Test table names and header titles are made unique."""
+        create_table(self.worksheet, ["A", "a", None], [[1, 2, 3]])
+        create_table(self.worksheet, ["B"], [[1]], start_col=5)
+
+        assert sorted(self.worksheet.tables) == ['Table1', 'Table2']
+        assert self.worksheet.cell(1, 2).value == "a 2"
+        assert self.worksheet.cell(1, 3).value == "Column3"
+
+    def test_empty_table_keeps_a_data_row(self):
+        """Test a table without rows still spans one data row."""
+        next_row = create_table(self.worksheet, ["Name"], [], name='Empty')
+
+        assert next_row == 3
+        assert self.worksheet.tables['Empty'].ref == 'A1:A2'
+
+    def test_add_table_invalid(self):
+        """Test invalid arguments raise ValueError."""
+        with pytest.raises(ValueError):
+            add_table(self.worksheet, [], 1, 5)
+        with pytest.raises(ValueError):
+            add_table(self.worksheet, ["A"], 5, 4)
+
+    def test_streaming_table(self):
+        """Test tables in a write-only report."""
+        report = StreamingReport('Report')
+        report.create_table(["Name", "Amount"], [["Ali", 1500], ["Sara", 20]], style='TableStyleMedium9')
+        buffer = io.BytesIO()
+        report.save(buffer)
+        worksheet = load_workbook(buffer)['Report']
+
+        table = worksheet.tables['Table1']
+        assert table.ref == 'A1:B3'
+        assert [column.name for column in table.tableColumns] == ["Name", "Amount"]
+        assert worksheet.cell(2, 2).number_format == '#,###'
+
+    def test_stream_xlsx_table_style(self):
+        """Test stream_xlsx can write the rows as a table."""
+        chunks = stream_xlsx([["Ali", 1], ["Sara", 2]], ["Name", "Count"], table_style='TableStyleLight1')
+        worksheet = load_workbook(io.BytesIO(b''.join(chunks))).active
+
+        assert worksheet.tables['Table1'].ref == 'A1:B3'
+        assert worksheet.freeze_panes is None
@@ -0,0 +1,129 @@
+import io
+import threading
+import zipfile
+
+import pytest
+from openpyxl import load_workbook
+
+from excelstyler.streaming import StreamingReport
+from excelstyler.template import ReportTemplate
+from excelstyler.xmlwriter import XmlReport
+
+HEADERS = ['Name', 'Qty', 'Amount']
+ROWS = [[f'item {j}', j, j * 1.5] for j in range(20)]
+
+
+def build_header(report, headers):
+    report.excel_description('گزارش فروش', end_col=len(headers), size=14, color='green', height=25)
+    report.create_header_freez(headers, color='green', border_style='thin', width=18)
+
+
+def package(report):
+    buffer = io.BytesIO()
+    report.save(buffer)
+    archive = zipfile.ZipFile(buffer)
+    return {name: archive.read(name) for name in archive.namelist() if name != 'docProps/core.xml'}
+
+
+class TestReportTemplate:
+    """Test cases for ReportTemplate."""
+
+    @pytest.mark.parametrize('backend, report_class', [('openpyxl', StreamingReport), ('xml', XmlReport)])
+    def test_same_file_as_building_the_report(self, backend, report_class):
+        """Test a report made from a template saves the same file as one built from scratch."""
+        template = ReportTemplate(build_header, HEADERS, title='Sales', right_to_left=True, backend=backend)
+        expected = report_class('Sales', right_to_left=True)
+        build_header(expected, HEADERS)
+        expected.create_values(ROWS, border_style='thin', banding=True)
+        report = template.new_report()
+        report.create_values(ROWS, border_style='thin', banding=True)
+
+        assert isinstance(report, report_class)
+        assert package(report) == package(expected)
+
+    def test_skeleton_settings(self, tmp_path):
+        """Test title, header, widths, merged cells, freeze panes, filter and RTL are copied."""
+        template = ReportTemplate(build_header, HEADERS, title='Sales', right_to_left=True)
+        report = template.new_report('June')
+        report.create_values(ROWS)
+        path = tmp_path / 'june.xlsx'
+        report.save(path)
+        worksheet = load_workbook(path)['June']
+
+        assert worksheet.cell(1, 1).value == 'گزارش فروش'
+        assert worksheet.cell(2, 2).value == 'Qty'
+        assert worksheet.cell(2, 1).fill.start_color.index == '0000B050'
+        assert worksheet.cell(3, 1).value == 'item 0'
+        assert worksheet.row_dimensions[1].height == 25
+        assert worksheet.column_dimensions['C'].width == 18
+        assert 'A1:C1' in worksheet.merged_cells
+        assert worksheet.freeze_panes == 'A3'
+        assert worksheet.auto_filter.ref == 'A2:C22'
+        assert worksheet.sheet_view.rightToLeft
+
+    def test_reports_are_independent(self, tmp_path):
+        """Test styles and rows added to one report do not reach the template or other reports."""
+        template = ReportTemplate(build_header, HEADERS, title='Sales')
+        fonts = len(template.skeleton.workbook._fonts)
+        first = template.new_report()
+        first.create_values(ROWS, color='red', border_style='double')
+        first.create_value(['extra'], height=40)
+        second = template.new_report()
+        second.create_values(ROWS[:2])
+        first.save(tmp_path / 'first.xlsx')
+        second.save(tmp_path / 'second.xlsx')
+
+        assert len(template.skeleton.workbook._fonts) == fonts
+        assert template.skeleton.row == 2
+        worksheet = load_workbook(tmp_path / 'second.xlsx')['Sales']
+        assert worksheet.max_row == 4
+        assert worksheet.auto_filter.ref == 'A2:C4'
+        assert worksheet.cell(3, 1).border.left.style is None
+        assert worksheet.row_dimensions[23].height is None
+
+    def test_registry_is_warm(self):
+        """Test the header styles resolved by the template are reused by its reports."""
+        template = ReportTemplate(build_header, HEADERS)
+        report = template.new_report()
+
+        assert report.registry is not template.skeleton.registry
+        assert report.registry.workbook is report.workbook
+        assert report.registry._styles == template.skeleton.registry._styles
+        report.save(io.BytesIO())
+
+    def test_concurrent_reports(self, tmp_path):
+        """Test reports can be made from one template by several threads."""
+        template = ReportTemplate(build_header, HEADERS, title='Sales', backend='xml')
+        errors = []
+
+        def export(number):
+            try:
+                report = template.new_report()
+                report.create_values(ROWS[:number + 1])
+                report.save(tmp_path / f'{number}.xlsx')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=export, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        for number in range(8):
+            assert load_workbook(tmp_path / f'{number}.xlsx')['Sales'].max_row == number + 3
+
+    def test_data_rows_rejected(self):
+        """Test a build function that writes data rows is rejected."""
+        def build(report):
+            report.create_header(HEADERS)
+            report.create_values(ROWS)
+
+        with pytest.raises(ValueError, match="before the data rows"):
+            ReportTemplate(build)
+
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected."""
+        with pytest.raises(ValueError, match="Unknown backend"):
+            ReportTemplate(build_header, HEADERS, backend='csv')
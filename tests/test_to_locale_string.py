@@ -1,5 +1,6 @@
 import pytest
-from excelstyler.to_locale_string import to_locale_str
+from decimal import Decimal
+from excelstyler.to_locale_string import to_locale_str, to_locale_strs
 
 
 class TestToLocaleStr:
@@ -44,3 +45,40 @@ class TestToLocaleStr:
         """Test to_locale_str with list input raises ValueError."""
         with pytest.raises(ValueError, match="Cannot convert"):
             to_locale_str([1, 2, 3])
+
+
+class TestToLocaleStrs:
+    """Test cases for to_locale_strs function."""
+
+    def test_to_locale_strs_matches_to_locale_str(self):
+        """Test the default format truncates like to_locale_str."""
+        values = [1234567, 1234567.89, 0, -1234567, "123"]
+        assert to_locale_strs(values) == [to_locale_str(value) for value in values]
+
+    def test_to_locale_strs_decimals(self):
+        """Test values are rounded to the requested decimals."""
+        assert to_locale_strs([1234.567, Decimal("1234.565"), 5], decimals=2) == ["1,234.57", "1,234.56", "5.00"]
+
+    def test_to_locale_strs_separators(self):
+        """Test custom thousands separator and decimal point."""
+        assert to_locale_strs([1234567.5], decimals=1, separator='.', decimal_point=',') == ["1.234.567,5"]
+
+    def test_to_locale_strs_persian_digits(self):
+        """Test digits are translated to Persian digits."""
+        assert to_locale_strs([1234567], separator='٬', persian_digits=True) == ["۱٬۲۳۴٬۵۶۷"]
+
+    def test_to_locale_strs_missing_values(self):
+        """Test None and NaN stay None."""
+        assert to_locale_strs([None, float('nan'), 1000]) == [None, None, "1,000"]
+
+    def test_to_locale_strs_invalid_value(self):
+        """Test invalid values raise ValueError."""
+        with pytest.raises(ValueError, match="Cannot convert"):
+            to_locale_strs([1, "not_a_number"])
+
+    def test_to_locale_strs_numpy(self):
+        """Test NumPy integer and float arrays."""
+        np = pytest.importorskip("numpy")
+        assert to_locale_strs(np.array([1234567, -5], dtype='int64')) == ["1,234,567", "-5"]
+        assert to_locale_strs(np.array([1234.9, np.nan])) == ["1,234", None]
+        assert to_locale_strs(np.array([1234.5]), decimals=1, persian_digits=True) == ["۱,۲۳۴.۵"]
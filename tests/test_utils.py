@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, date
 import jdatetime
-from excelstyler.utils import shamsi_date, convert_str_to_date
+from excelstyler.utils import shamsi_date, shamsi_dates, convert_str_to_date, convert_str_to_dates
 
 
 class TestShamsiDate:
@@ -46,6 +46,56 @@ class TestShamsiDate:
             shamsi_date("invalid_date")
 
 
+class TestShamsiDates:
+    """Test cases for shamsi_dates function."""
+
+    def test_shamsi_dates_strings(self):
+        """Test converting a column to Shamsi strings."""
+        dates = [date(2023, 3, 21), datetime(2023, 3, 21, 15, 30), date(2024, 3, 20)]
+        assert shamsi_dates(dates) == ["01-01-1402", "01-01-1402", "01-01-1403"]
+
+    def test_shamsi_dates_in_value(self):
+        """Test converting a column to jdatetime objects."""
+        result = shamsi_dates([date(2023, 3, 21)], in_value=True)
+        assert result == [jdatetime.date(1402, 1, 1)]
+
+    def test_shamsi_dates_keeps_missing_values(self):
+        """Test None entries stay None."""
+        assert shamsi_dates([None, date(2023, 3, 21)]) == [None, "01-01-1402"]
+
+    def test_shamsi_dates_matches_shamsi_date(self):
+        """Test batch results match single conversions."""
+        dates = [date(2000 + n % 30, 1 + n % 12, 1 + n % 28) for n in range(500)]
+        assert shamsi_dates(dates) == [shamsi_date(d) for d in dates]
+
+    def test_shamsi_dates_invalid(self):
+        """Test invalid values raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid date format"):
+            shamsi_dates(["invalid_date"])
+
+    def test_shamsi_dates_datetime64(self):
+        """Test the vectorized datetime64 path matches jdatetime."""
+        np = pytest.importorskip("numpy")
+        values = np.arange('1990-01-01', '2030-01-01', 7, dtype='datetime64[D]')
+        expected = [shamsi_date(d.astype(date)) for d in values]
+        assert shamsi_dates(values) == expected
+        assert shamsi_dates(values, in_value=True) == [shamsi_date(d.astype(date), True) for d in values]
+
+    def test_shamsi_dates_datetime64_nat(self):
+        """Test NaT entries stay None on the datetime64 path."""
+        np = pytest.importorskip("numpy")
+        values = np.array(['2023-03-21T10:30', 'NaT'], dtype='datetime64[ns]')
+        assert shamsi_dates(values) == ["01-01-1402", None]
+
+    def test_shamsi_dates_timezone_aware(self):
+        """Test timezone-aware pandas columns raise TypeError instead of being converted to UTC days."""
+        pd = pytest.importorskip("pandas")
+        values = pd.Series(pd.to_datetime(['2023-03-21 00:00']).tz_localize('Asia/Tehran'))
+        with pytest.raises(TypeError, match="timezones"):
+            shamsi_dates(values)
+        assert shamsi_dates(values.dt.tz_localize(None)) == ["01-01-1402"]
+
+
 class TestConvertStrToDate:
     """Test cases for convert_str_to_date function."""
     
@@ -84,3 +134,33 @@ class TestConvertStrToDate:
         date_str = "   "
         result = convert_str_to_date(date_str)
         assert result is None
+
+
+class TestConvertStrToDates:
+    """Test cases for convert_str_to_dates function."""
+
+    def test_convert_column(self):
+        """Test a column in a single format is parsed."""
+        dates, invalid = convert_str_to_dates(["2023-03-21T10:30:45Z", "2023-03-22T00:00:00Z"])
+        assert dates == [date(2023, 3, 21), date(2023, 3, 22)]
+        assert invalid == 0
+
+    def test_convert_mixed_formats(self):
+        """Test values in another format fall back to the full cascade."""
+        values = ["2023-03-21T10:30:45.123Z", "2023-03-22", "2023-03-23T10:30:45Z", "2023-3-24"]
+        result = convert_str_to_dates(values)
+        assert result.dates == [date(2023, 3, 21), date(2023, 3, 22), date(2023, 3, 23), date(2023, 3, 24)]
+        assert result.invalid == 0
+
+    def test_convert_counts_invalid_values(self):
+        """Test unparseable values become None and are counted."""
+        values = ["2023-03-21", "invalid-date", "2023-02-30", "", None]
+        result = convert_str_to_dates(values)
+        assert result.dates == [date(2023, 3, 21), None, None, None, None]
+        assert result.invalid == 4
+
+    def test_convert_matches_convert_str_to_date(self):
+        """Test the sliced fast path agrees with strptime on near-miss values."""
+        values = ["2023-03-21T10:30:45Z", "2023-03-21T24:00:00Z", "2023-03-21T10:30:60Z", "2023-03-21T10:30:45",
+                  "2023-03-21T10:30:45.1234567Z", "2023-03-21T10:30:45.Z", "۱۴۰۲-01-01", " 2023-03-21 ", "2023/03/21"]
+        assert convert_str_to_dates(values).dates == [convert_str_to_date(value) for value in values]
@@ -1,7 +1,7 @@
 import pytest
 import openpyxl
 from openpyxl import Workbook
-from excelstyler.values import create_value
+from excelstyler.values import create_value, create_values
 
 
 class TestCreateValue:
@@ -80,6 +80,81 @@ class TestCreateValue:
         data = ["John", 25]
         create_value(self.worksheet, data, 1, 1, height=30, width=15)
         
-        assert self.worksheet.row_dimensions[2].height == 30  # start_col + 1
+        assert self.worksheet.row_dimensions[1].height == 30
         assert self.worksheet.column_dimensions['A'].width == 15
         assert self.worksheet.column_dimensions['B'].width == 15
+
+
+class TestCreateValues:
+    """Test cases for create_values function."""
+
+    def setup_method(self):
+        """Set up test workbook and worksheet."""
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+
+    def test_create_values_basic(self):
+        """Test a block of rows is written and the next row is returned."""
+        rows = [["John", 25], ["Jane", 30], ["Bob", 0]]
+        next_row = create_values(self.worksheet, rows, 2, 1)
+
+        assert next_row == 5
+        assert self.worksheet.cell(2, 1).value == "John"
+        assert self.worksheet.cell(3, 2).value == 30
+        assert self.worksheet.cell(3, 2).number_format == '#,###'
+        assert self.worksheet.cell(4, 2).number_format == 'General'
+        assert self.worksheet.cell(4, 1).font.bold
+
+    def test_create_values_matches_create_value(self):
+        """Test every cell gets the same style as a create_value call per row."""
+        rows = [["John", 25, "Active"], ["Jane", 30, "Away"], ["Bob", 25, "Active"], ["Ann", 7, "Away"]]
+        options = dict(border_style="thin", color="green", item_num=2, item_color="yellow",
+                       different_cell=1, different_value=25)
+        create_values(self.worksheet, rows, 1, 1, banding=True, **options)
+        expected = Workbook().active
+        for row, data in enumerate(rows, start=1):
+            create_value(expected, data, row, 1, m=row, **options)
+
+        for row in range(1, 5):
+            for col in range(1, 4):
+                cell, other = self.worksheet.cell(row, col), expected.cell(row, col)
+                assert cell.fill.start_color.index == other.fill.start_color.index
+                assert cell.number_format == other.number_format
+                assert cell.border.left.style == other.border.left.style
+
+    def test_create_values_banding(self):
+        """Test banding follows the worksheet row index."""
+        create_values(self.worksheet, [["John"], ["Jane"]], 1, 1, banding=True)
+
+        assert self.worksheet.cell(1, 1).fill.fill_type is None
+        assert self.worksheet.cell(2, 1).fill.start_color.index == "00FAF0E7"
+
+    def test_create_values_generator_and_ragged_rows(self):
+        """Test rows can come from a generator and have different lengths."""
+        rows = (["x"] * n for n in range(1, 4))
+        create_values(self.worksheet, rows, 1, 2, width=12)
+
+        assert self.worksheet.cell(3, 4).value == "x"
+        assert self.worksheet.column_dimensions['D'].width == 12
+
+    def test_none_keeps_existing_values(self):
+        """Test None values written over existing cells keep their values with both entry points."""
+        rows = [[None, 1], ["new", None]]
+        expected = Workbook().active
+        for worksheet in (self.worksheet, expected):
+            for row in (1, 2):
+                worksheet.cell(row, 1, "old")
+                worksheet.cell(row, 2, "old")
+        create_values(self.worksheet, rows, 1, 1, border_style="thin")
+        for row, data in enumerate(rows, start=1):
+            create_value(expected, data, row, 1, border_style="thin")
+
+        values = [[cell.value for cell in row] for row in self.worksheet.iter_rows()]
+        assert values == [["old", 1], ["new", "old"]]
+        assert values == [[cell.value for cell in row] for row in expected.iter_rows()]
+        assert self.worksheet.cell(1, 1).border.left.style == "thin"
+
+    def test_create_values_invalid_start(self):
+        """Test invalid start_row raises ValueError."""
+        with pytest.raises(ValueError, match="start_row and start_col must be positive integers"):
+            create_values(self.worksheet, [["John"]], 0)
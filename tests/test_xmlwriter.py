@@ -0,0 +1,148 @@
+import gc
+import io
+import tempfile
+import zipfile
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import openpyxl
+import pytest
+from openpyxl import load_workbook
+
+from excelstyler.buffered import BufferedReport
+from excelstyler.export import stream_xlsx
+from excelstyler.parallel import ParallelWorkbook
+from excelstyler.streaming import StreamingReport
+from excelstyler.xmlwriter import XmlReport
+
+
+def build_report(report):
+    report.excel_description('گزارش  فروش & <test>', end_col=4, size=14, my_color='DDEBF7', height=25)
+    report.create_header_freez(['Name', 'Qty', 'Amount', 'When'], color='green', height=30,
+                               border_style='thin', different_cell='Qty')
+    report.create_values(([f'item {j}', j, j * 1.5, datetime(2024, 1, 1, 10, 30)] for j in range(50)),
+                         border_style='thin', banding=True, different_cell=1, different_value=5, height=18)
+    report.create_value([None, 0, -0.0, date(2024, 3, 21), True, ' lead', '', '=SUM(B3:B5)', '#N/A',
+                         Decimal('1.25'), time(10, 5), float('nan')], start_col=2, border_style='medium', m=2)
+    report.create_values([[1e20, 123456789012345678, 1 / 3]], conditional=True, banding=True)
+    report.create_table(['a', 'b'], [[1, 'x'], [0, None]])
+    report.create_value([None, None])
+
+
+def build_sheet(report, rows):
+    report.create_header(['Name', 'Amount'], color='green')
+    report.create_values(rows, banding=True)
+
+
+def package(report_class):
+    report = report_class('Report', right_to_left=True)
+    build_report(report)
+    buffer = io.BytesIO()
+    report.save(buffer)
+    archive = zipfile.ZipFile(buffer)
+    return {name: archive.read(name) for name in archive.namelist() if name != 'docProps/core.xml'}
+
+
+class TestXmlReport:
+    """Test cases for XmlReport."""
+
+    @pytest.mark.skipif(openpyxl.LXML, reason="openpyxl formats the XML differently with lxml")
+    def test_same_file_as_streaming_report(self):
+        """Test every part of the package matches the StreamingReport output byte for byte."""
+        expected = package(StreamingReport)
+        actual = package(XmlReport)
+
+        assert actual.keys() == expected.keys()
+        for name in expected:
+            assert actual[name] == expected[name], name
+
+    def test_values_and_styles(self, tmp_path):
+        """Test values, formats, fills, heights and merged cells read back as written."""
+        report = XmlReport('Report', right_to_left=True)
+        build_report(report)
+        path = tmp_path / 'xml.xlsx'
+        report.save(path)
+        worksheet = load_workbook(path)['Report']
+
+        assert worksheet.cell(1, 1).value == 'گزارش  فروش & <test>'
+        assert 'A1:D1' in worksheet.merged_cells
+        assert worksheet.row_dimensions[1].height == 25
+        assert worksheet.freeze_panes == 'A3'
+        assert worksheet.cell(2, 2).value == 'Qty'
+        assert worksheet.cell(4, 2).value == 1
+        assert worksheet.cell(4, 2).number_format == '#,###'
+        assert worksheet.cell(4, 4).value == datetime(2024, 1, 1, 10, 30)
+        assert worksheet.cell(4, 4).is_date
+        assert worksheet.cell(8, 1).fill.start_color.rgb == '00FCDFDC'
+        assert worksheet.row_dimensions[4].height == 18
+        assert worksheet.cell(53, 7).value == ' lead'
+        assert worksheet.cell(53, 9).value == '=SUM(B3:B5)'
+        assert worksheet.cell(53, 10).value == '#N/A'
+        assert worksheet.cell(53, 6).value is True
+
+    def test_unsupported_value(self):
+        """Test a value openpyxl cannot write raises ValueError."""
+        report = XmlReport()
+
+        with pytest.raises(ValueError):
+            report.create_value([object()])
+        buffer = io.BytesIO()
+        report.save(buffer)
+
+        assert load_workbook(buffer).active.max_row == 1
+
+    @pytest.mark.parametrize('report_class', [XmlReport, BufferedReport])
+    def test_temporary_files_removed(self, report_class, tmp_path, monkeypatch):
+        """Test reports that are abandoned, dropped unsaved or fail to save leave no temporary files."""
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+        def leftovers():
+            gc.collect()
+            return [path.name for path in tmp_path.iterdir() if path.name.startswith('excelstyler-')]
+
+        def long_report():
+            report = report_class('Report', max_rows=2000)
+            build_sheet(report, ([str(j) * 50, j] for j in range(5000)))
+            return report
+
+        chunks = long_report().iter_bytes(1024)
+        next(chunks)
+        chunks.close()
+        assert leftovers() == []
+
+        long_report()
+        assert leftovers() == []
+
+        report = long_report()
+        with pytest.raises(OSError):
+            report.save(tmp_path / 'missing' / 'report.xlsx')
+        assert [path.name for path in tmp_path.iterdir() if path.name.startswith('excelstyler-')] == []
+
+    def test_stream_xlsx_backend(self):
+        """Test stream_xlsx writes the same rows with the xml backend."""
+        rows = [{'name': 'A', 'amount': 10}, {'name': 'B', 'amount': 20}]
+        data = b''.join(stream_xlsx(rows, headers=['Name', 'Amount'], fields=['name', 'amount'], backend='xml'))
+        worksheet = load_workbook(io.BytesIO(data)).active
+
+        assert [[cell.value for cell in row] for row in worksheet.iter_rows()] == [
+            ['Name', 'Amount'], ['A', 10], ['B', 20]]
+
+    def test_unknown_backend(self):
+        """Test an unknown backend name raises ValueError."""
+        with pytest.raises(ValueError):
+            list(stream_xlsx([], backend='csv'))
+        with pytest.raises(ValueError):
+            ParallelWorkbook(backend='csv')
+
+    def test_parallel_backend(self, tmp_path):
+        """Test ParallelWorkbook builds its sheets with XmlReport."""
+        workbook = ParallelWorkbook(max_workers=2, backend='xml')
+        workbook.add_sheet('North', build_sheet, [['A', 1500], ['B', 0]])
+        workbook.add_sheet('South', build_sheet, [['C', 20]])
+        path = tmp_path / 'parallel.xlsx'
+        workbook.save(path)
+        result = load_workbook(path)
+
+        assert result['North'].cell(2, 2).value == 1500
+        assert result['North'].cell(2, 1).fill.start_color.rgb == '00FAF0E7'
+        assert result['South'].cell(2, 1).value == 'C'